@@ -1,50 +1,160 @@
-import random
+import time
+from dataclasses import dataclass
+from decision_cache import DecisionCache, situation_key
+from equity import anytime_equity
+from preflop import preflop_equity
 
-def make_betting_decision(game, player):
+# Seconds a postflop decision may spend sampling runouts (see Game.ai_deadline).
+DECISION_DEADLINE = 0.020
+
+# Postflop equities, shared by every game in the process.
+AI_CACHE = DecisionCache()
+# Runouts behind a cached equity at which it is reused as is; thinner
+# estimates are refined with new runouts each time their spot comes up.
+SETTLED_SAMPLES = 2000
+
+@dataclass
+class DecisionReport:
+    """
+    How an AI decision was reached.
+
+    Attributes:
+        equity (float): Estimated share of the pot against the active players.
+        samples (int): Runouts behind it, including those pooled from
+            AI_CACHE; 0 when it came from the preflop table.
+        seconds (float): Time taken to reach the decision.
+        cached (bool): Whether the equity was found in AI_CACHE.
+        ranged (bool): Whether it was computed against the opponents' ranges
+            (see ranges.RangeTracker), samples then being runouts per opponent.
+    """
+    equity: float
+    samples: int = 0
+    seconds: float = 0.0
+    cached: bool = False
+    ranged: bool = False
+
+    def describe(self):
+        if self.cached:
+            return f"equity {self.equity:.0%}, cached"
+        if self.ranged:
+            return (f"equity {self.equity:.0%} against ranges, {self.samples} runouts"
+                    f" in {self.seconds * 1e3:.1f} ms")
+        if self.samples:
+            return f"equity {self.equity:.0%}, {self.samples} samples in {self.seconds * 1e3:.1f} ms"
+        return f"equity {self.equity:.0%}"
+
+def postflop_equity(hole, board, opponents, deadline):
+    """
+    Estimate equity against random hands by sampling runouts until a deadline.
+
+    Estimates are kept in AI_CACHE under the suit-canonical spot. One backed
+    by SETTLED_SAMPLES runouts costs a lookup; a thinner one is refined by
+    pooling the runouts sampled now with those it was built from.
+
+    Args:
+        hole (List[Card]): The player's hole cards.
+        board (List[Card]): Community cards dealt so far.
+        opponents (int): Active opponents.
+        deadline (float): time.perf_counter() value to finish by.
+
+    Returns:
+        Tuple[float, int, bool] or None: (equity, samples, cached), or None if
+        the deadline left no time to sample and nothing was cached.
+    """
+    key = situation_key("equity", hole, board, opponents)
+    cached = AI_CACHE.get(key)
+    if cached is not None and cached[1] >= SETTLED_SAMPLES:
+        return cached + (True,)
+    # Canonical codes are real cards, so the estimate is made on them directly.
+    _, canonical_hole, canonical_board, _ = key
+    result = anytime_equity([canonical_hole] + [()] * opponents, canonical_board, deadline)
+    if not result.iterations:
+        return None if cached is None else cached + (True,)
+    equity, samples = result.players[0].equity, result.iterations
+    if cached is not None:
+        total = samples + cached[1]
+        equity = (equity * samples + cached[0] * cached[1]) / total
+        samples = total
+    AI_CACHE.put(key, (equity, samples))
+    return equity, samples, False
+
+def make_betting_decision(game, player, deadline=None):
     """
     Enhanced AI decision making using simple rule-based logic.
-    
-    Evaluates AI hole cards by summing rank values and adding a bonus if paired,
-    then uses thresholds to decide to fold, call, check, or raise.
-    
+
+    Estimates the AI's equity against the other players still in the hand,
+    compares it with a fair share of the pot (1 / players), then uses
+    thresholds to decide to fold, call, check, or raise. Preflop the equity
+    comes from the preflop table. Postflop, if the game tracks ranges
+    (game.ranges, see ranges.RangeTracker), it is computed against what each
+    opponent's actions so far make likely, over as many runouts as the
+    deadline allows; otherwise, with a deadline, it is
+    estimated from the hole cards and the board by sampling runouts against
+    random hands until the deadline; without either the preflop table is used
+    on every street.
+
     Args:
         game: Instance providing game state and place_bet method.
         player: The AI player making a decision.
+        deadline (float or None): Seconds the decision may take.
+
+    Returns:
+        DecisionReport or None: The equity used, samples taken and time
+        spent; None when the AI had too few cards to judge.
     """
+    start = time.perf_counter()
     # Basic evaluation of hole cards.
     if len(player.hand) < 2:
         # fallback: call if not enough info
         to_call = game.current_bet - player.current_bet
         game.ui.append_log(f"{player.name} calls {to_call} (insufficient hole cards).")
         game.place_bet(player, to_call)
-        return
+        return None
 
-    card1, card2 = player.hand[0], player.hand[1]
-    strength = card1.rank.value + card2.rank.value
-    if card1.rank == card2.rank:
-        strength += 10  # Bonus for a pair.
+    num_players = len(game.get_active_players())
+    estimate = None
+    # Leave a little of the budget for acting on the estimate.
+    budget = None if deadline is None else start + deadline * 0.9
+    if game.ranges is not None and game.community_cards:
+        estimate = game.ranges.hand_equity(game, player, budget)
+        if estimate is not None:
+            estimate += (False,)
+    elif deadline is not None and game.community_cards:
+        estimate = postflop_equity(player.hand, game.community_cards, num_players - 1, budget)
+    if estimate is None:
+        report = DecisionReport(preflop_equity(player.hand[0], player.hand[1], num_players))
+    else:
+        report = DecisionReport(*estimate[:2], cached=estimate[2], ranged=game.ranges is not None)
+    equity = report.equity
+    # Strength relative to an even share: 1.0 is average for this many players.
+    strength = equity * num_players
+    strong = strength >= 1.5
+    weak = strength < 1.0
 
     to_call = game.current_bet - player.current_bet
+    report.seconds = time.perf_counter() - start
+    detail = report.describe()
 
     # When no call is needed.
     if to_call <= 0:
-        if strength >= 24 and player.chips > 10:
+        if strong and player.chips > 10:
             bet_amount = min(player.chips, int(player.chips * 0.25))
-            game.ui.append_log(f"{player.name} bets {bet_amount} (strong hand).")
+            game.ui.append_log(f"{player.name} bets {bet_amount} (strong hand: {detail}).")
             game.place_bet(player, bet_amount)
         else:
-            game.ui.append_log(f"{player.name} checks.")
-        return
+            game.ui.append_log(f"{player.name} checks ({detail}).")
+        return report
 
     # If the call amount is risky for a weak hand.
-    if to_call > player.chips * 0.3 and strength < 20:
+    if to_call > player.chips * 0.3 and weak:
         player.folded = True
-        game.ui.append_log(f"{player.name} folds (weak hand, high call: strength {strength}).")
-    elif strength >= 24 and player.chips > to_call + 10:
+        game.ui.append_log(f"{player.name} folds (weak hand, high call: {detail}).")
+    elif strong and player.chips > to_call + 10:
         raise_amount = 10  # Fixed raise amount.
         total_bet = to_call + raise_amount
-        game.ui.append_log(f"{player.name} raises from {player.current_bet} to {player.current_bet + total_bet} (strength {strength}).")
+        game.ui.append_log(f"{player.name} raises from {player.current_bet} to {player.current_bet + total_bet} ({detail}).")
         game.place_bet(player, total_bet)
     else:
-        game.ui.append_log(f"{player.name} calls {to_call} (moderate hand: strength {strength}).")
+        game.ui.append_log(f"{player.name} calls {to_call} (moderate hand: {detail}).")
         game.place_bet(player, to_call)
+    return report
@@ -0,0 +1,107 @@
+"""
+This module evaluates many Texas Hold'em hands at once with NumPy.
+
+Hands are rows of card codes (see card.card_to_int) in an integer array of
+shape (N, 5), (N, 6) or (N, 7). Rank histograms, suit counts and straight
+masks are computed as array operations over every row together, and the
+resulting strengths are identical to hand_evaluator.hand_strength_codes(),
+so batch and scalar results can be compared or mixed freely.
+"""
+
+import numpy as np
+from card import HandRank
+from hand_evaluator import CATEGORY_SHIFT, lookup_tables, STRAIGHTS
+
+# Rank value of each histogram column.
+RANK_VALUES = np.arange(2, 15, dtype=np.int32)
+RANK_BITS = np.int32(1) << RANK_VALUES
+
+_FLUSH_TABLE = []
+
+def _flush_table():
+    """Return the scalar evaluator's flush table as a cached int32 array."""
+    if not _FLUSH_TABLE:
+        _FLUSH_TABLE.append(np.asarray(lookup_tables()[3], dtype=np.int32))
+    return _FLUSH_TABLE[0]
+
+def _pack(category, *ranks):
+    """Pack a category and up to five rank arrays like hand_evaluator._pack()."""
+    strength = np.int32(category.value << CATEGORY_SHIFT)
+    for shift, rank in zip((16, 12, 8, 4, 0), ranks):
+        strength = strength | (rank << shift)
+    return strength
+
+def _top_rank(present, *exclude):
+    """Highest rank present in each row after removing the excluded ranks (0 if none)."""
+    for ranks in exclude:
+        present = present & (RANK_VALUES[None, :] != ranks[:, None])
+    reversed_present = present[:, ::-1]
+    return np.where(reversed_present.any(axis=1), 14 - reversed_present.argmax(axis=1), 0)
+
+def batch_strength(codes):
+    """
+    Score every row of card codes.
+
+    Args:
+        codes (array-like): Integer array of shape (N, k) with 5 <= k <= 7.
+
+    Returns:
+        numpy.ndarray: int64 array of N packed strengths, equal to
+        hand_strength_codes() applied to each row.
+    """
+    codes = np.asarray(codes, dtype=np.int32)
+    if codes.ndim != 2 or not 5 <= codes.shape[1] <= 7:
+        raise ValueError("Expected an array of shape (N, 5), (N, 6) or (N, 7).")
+    flush_table = _flush_table()
+
+    n = len(codes)
+    ranks = (codes >> 2) + 2
+    suits = codes & 3
+    card_bits = np.int32(1) << ranks
+    rows = np.arange(n, dtype=np.int32)[:, None]
+
+    # Flushes: one suited rank mask per suit, scored by the scalar flush table.
+    # Cards are distinct, so summing their bits equals OR-ing them.
+    suit_masks = np.bincount((rows * 4 + suits).ravel(), weights=card_bits.ravel(),
+                             minlength=n * 4).astype(np.int32).reshape(n, 4)
+    flush_strength = flush_table[suit_masks].max(axis=1)
+
+    # Rank histogram and the bit mask of ranks present.
+    counts = np.bincount((rows * 13 + ranks - 2).ravel(), minlength=n * 13).astype(np.int32).reshape(n, 13)
+    present = counts > 0
+    rank_mask = present @ RANK_BITS
+
+    straight_high = np.zeros(n, dtype=np.int32)
+    for straight, high in STRAIGHTS:
+        hit = (straight_high == 0) & ((rank_mask & straight) == straight)
+        straight_high = np.where(hit, high, straight_high)
+
+    # Ranks ordered by (count, rank) descending, with 0 for absent ranks.
+    keys = -np.sort(-(counts * 16 + RANK_VALUES), axis=1)
+    ordered = np.where(keys >= 16, keys & 15, 0)
+    first, second, third, fourth, fifth = (ordered[:, i] for i in range(5))
+
+    quads = (counts == 4).any(axis=1)
+    trips = (counts == 3).sum(axis=1)
+    pairs = (counts == 2).sum(axis=1)
+
+    conditions = [
+        flush_strength > 0,
+        quads,
+        (trips >= 1) & ((trips >= 2) | (pairs >= 1)),
+        straight_high > 0,
+        trips >= 1,
+        pairs >= 2,
+        pairs == 1,
+    ]
+    choices = [
+        flush_strength,
+        _pack(HandRank.FOUR_OF_A_KIND, first, _top_rank(present, first)),
+        _pack(HandRank.FULL_HOUSE, first, second),
+        _pack(HandRank.STRAIGHT, straight_high),
+        _pack(HandRank.THREE_OF_A_KIND, first, second, third),
+        _pack(HandRank.TWO_PAIR, first, second, _top_rank(present, first, second)),
+        _pack(HandRank.PAIR, first, second, third, fourth),
+    ]
+    high_card = _pack(HandRank.HIGH_CARD, first, second, third, fourth, fifth)
+    return np.select(conditions, choices, default=high_card).astype(np.int64)
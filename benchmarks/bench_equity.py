@@ -0,0 +1,54 @@
+"""
+Benchmark exact enumeration against Monte Carlo sampling on late streets.
+
+For each spot the exact equity is computed once, then Monte Carlo sampling is
+run until its standard error reaches the target. Both wall times are reported
+together with the sampled estimate's actual error.
+
+Usage:
+    python benchmarks/bench_equity.py [--target-stderr 0.002]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from card import Card, Rank, Suit
+from equity import equity, exact_equity
+from hand_evaluator import lookup_tables
+
+HERO = [Card(Rank.ACE, Suit.SPADES), Card(Rank.QUEEN, Suit.SPADES)]
+VILLAIN = [Card(Rank.NINE, Suit.HEARTS), Card(Rank.NINE, Suit.DIAMONDS)]
+FLOP = [Card(Rank.NINE, Suit.SPADES), Card(Rank.FOUR, Suit.SPADES), Card(Rank.KING, Suit.CLUBS)]
+TURN = FLOP + [Card(Rank.TWO, Suit.HEARTS)]
+
+SPOTS = [
+    ("flop, heads-up", [HERO, VILLAIN], FLOP),
+    ("turn, heads-up", [HERO, VILLAIN], TURN),
+    ("turn, vs random hand", [HERO, []], TURN),
+]
+
+def run(target_stderr):
+    lookup_tables()  # Keep one-time table construction out of the timings.
+    print(f"{'spot':<24}{'exact s':>10}{'sampled s':>11}{'samples':>10}{'error':>9}{'speedup':>9}")
+    for name, holes, board in SPOTS:
+        start = time.perf_counter()
+        exact = exact_equity(holes, board).result().players[0].equity
+        exact_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sampled = equity(holes, board, iterations=10_000_000, seed=1,
+                         target_stderr=target_stderr)
+        sampled_time = time.perf_counter() - start
+        error = abs(sampled.players[0].equity - exact)
+        print(f"{name:<24}{exact_time:>10.4f}{sampled_time:>11.4f}{sampled.iterations:>10}"
+              f"{error:>9.4f}{sampled_time / exact_time:>8.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target-stderr", type=float, default=0.002,
+                        help="standard error the sampler must reach")
+    run(parser.parse_args().target_stderr)
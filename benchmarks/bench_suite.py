@@ -0,0 +1,240 @@
+"""
+Benchmark the hand evaluator, showdown, engine, AI and card rendering.
+
+Each benchmark reports the best CPU time per operation over several repeats.
+Results are written as JSON together with machine metadata and compared
+against a stored baseline; the run fails if any benchmark is slower than its
+baseline by more than the threshold.
+
+Usage:
+    python benchmarks/bench_suite.py [--output results.json]
+        [--baseline benchmarks/baseline.json] [--threshold 0.25]
+        [--save-baseline] [--quick] [--only PREFIX]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+
+from card import CARDS
+from game import Game
+from hand_evaluator import evaluate_hand, lookup_tables
+from player import Player
+from ai import make_betting_decision
+from card_slots import CardSlots
+from simulation import build_game, play_hands
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+def best_time(func, number, repeat=5):
+    """Return the best seconds per call of func over repeat runs of number calls."""
+    # CPU time rather than wall time, so other load on the machine skews results less.
+    timer = timeit.Timer(func, timer=time.process_time)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def bench_evaluate_hand(size, scale):
+    rng = random.Random(size)
+    hands = [rng.sample(CARDS, size) for _ in range(1000)]
+    def run():
+        for hand in hands:
+            evaluate_hand(hand)
+    return best_time(run, max(1, scale)) / len(hands)
+
+def bench_find_winners(num_players, scale):
+    rng = random.Random(num_players)
+    games = []
+    for _ in range(100):
+        cards = rng.sample(CARDS, 2 * num_players + 5)
+        game = Game()
+        game.players = [Player(f"P{i}", cards[2 * i:2 * i + 2], 1000, True)
+                        for i in range(num_players)]
+        game.community_cards = cards[-5:]
+        games.append(game)
+    def run():
+        for game in games:
+            game.find_winners()
+    return best_time(run, max(1, scale)) / len(games)
+
+def bench_play_round(scale):
+    game = build_game(seed=1)
+    hands = 200 * scale
+    return best_time(lambda: play_hands(game, hands, 1000), 1, repeat=3) / hands
+
+def bench_betting_decision(scale):
+    rng = random.Random(3)
+    game = Game()
+    player = game.players[1]
+    hands = [rng.sample(CARDS, 2) for _ in range(1000)]
+    def run():
+        for hand in hands:
+            player.hand = hand
+            player.chips = 1000
+            player.current_bet = 0
+            player.folded = False
+            game.current_bet = 20
+            make_betting_decision(game, player)
+    return best_time(run, max(1, scale)) / len(hands)
+
+class _MockCanvas:
+    """Accepts the canvas calls CardSlots makes without drawing anything."""
+
+    def __getitem__(self, option):
+        return 120
+
+    def _create(self, *args, **kwargs):
+        return 1
+
+    create_image = create_rectangle = create_text = _create
+
+    def itemconfigure(self, item, **options):
+        pass
+
+    def move(self, item, dx, dy):
+        pass
+
+    def delete(self, *items):
+        pass
+
+class _MockUI:
+    """Just enough of GameUI for _display_cards, with cached images as tokens."""
+    IMAGE_SIZE = (120, 180)
+
+    def load_card_image(self, card):
+        return card.code
+
+def bench_display_cards(scale):
+    try:
+        from ui import GameUI
+    except ImportError:
+        return None
+    rng = random.Random(4)
+    boards = [rng.sample(CARDS, 5) for _ in range(200)]
+    ui = _MockUI()
+    slots = CardSlots(_MockCanvas())
+    def run():
+        for board in boards:
+            for street in (3, 4, 5):
+                GameUI._display_cards(ui, slots, board[:street], 10, 30)
+    return best_time(run, max(1, scale)) / (3 * len(boards))
+
+def benchmarks():
+    """Return (name, function) pairs; each function takes a scale factor."""
+    suite = [(f"evaluate_hand_{size}", lambda scale, size=size: bench_evaluate_hand(size, scale))
+             for size in (5, 6, 7)]
+    suite += [(f"find_winners_{n}", lambda scale, n=n: bench_find_winners(n, scale))
+              for n in range(2, 11)]
+    suite += [
+        ("play_round", bench_play_round),
+        ("make_betting_decision", bench_betting_decision),
+        ("display_cards", bench_display_cards),
+    ]
+    return suite
+
+def machine_metadata():
+    """Describe the machine and checkout the results came from."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def run_suite(scale=1, only=None):
+    """
+    Run every benchmark.
+
+    Args:
+        scale (int): Multiplier for the work done per timing run.
+        only (str or None): Run only benchmarks whose name starts with this.
+
+    Returns:
+        dict: {"metadata": {...}, "results": {name: seconds per operation}};
+        benchmarks that cannot run here (e.g. no Tk) are left out.
+    """
+    lookup_tables()  # Keep one-time table construction out of the timings.
+    results = {}
+    for name, bench in benchmarks():
+        if only and not name.startswith(only):
+            continue
+        seconds = bench(scale)
+        if seconds is not None:
+            results[name] = seconds
+    return {"metadata": machine_metadata(), "results": results}
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Find benchmarks that got slower than the baseline allows.
+
+    Args:
+        results (dict): Output of run_suite().
+        baseline (dict): A stored run_suite() output.
+        threshold (float): Allowed slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        List[Tuple[str, float]]: (name, slowdown ratio) of each regression.
+    """
+    regressions = []
+    for name, seconds in results["results"].items():
+        reference = baseline["results"].get(name)
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append((name, seconds / reference))
+    return regressions
+
+def print_table(results, baseline=None):
+    print(f"{'benchmark':<24}{'per op':>12}{'ops/sec':>14}{'vs baseline':>13}")
+    for name, seconds in results["results"].items():
+        reference = baseline["results"].get(name) if baseline else None
+        change = f"{seconds / reference:>12.2f}x" if reference else f"{'-':>13}"
+        print(f"{name:<24}{seconds * 1e6:>10.2f}us{1 / seconds:>14.0f}{change}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default=None, help="write the results as JSON here")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a benchmark counts as a regression")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--quick", action="store_true", help="less work per timing run")
+    parser.add_argument("--only", default=None, help="run benchmarks with this name prefix")
+    args = parser.parse_args()
+
+    results = run_suite(scale=1 if args.quick else 5, only=args.only)
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    print_table(results, baseline)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+    elif baseline is not None:
+        if baseline["metadata"].get("machine") != results["metadata"]["machine"]:
+            print("Warning: the baseline was recorded on a different machine.")
+        regressions = compare(results, baseline, args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x slower than baseline")
+        sys.exit(1 if regressions else 0)
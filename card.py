@@ -1,9 +1,10 @@
 """
-This module defines the Card class and associated enums for suits, ranks, and hand rankings.
+This module defines the Card class and associated enums for suits, ranks, and hand rankings,
+along with the compact 0..51 integer encoding of cards.
 """
 
+from array import array
 from enum import Enum, auto
-from dataclasses import dataclass
 
 class Suit(Enum):
     """Enumeration for the four suits in a standard deck."""
@@ -28,17 +29,37 @@ class Rank(Enum):
     KING = 13
     ACE = 14
 
-@dataclass
 class Card:
     """
     Represents a playing card.
     
+    Cards are immutable singletons: Card(rank, suit) returns one of the 52
+    interned instances in CARDS, so identity comparison and hashing are
+    cheap. Each card also carries a canonical integer code in 0..51 laid
+    out as ``(rank.value - 2) * 4 + suit_index`` for compact storage.
+    
     Attributes:
         rank (Rank): The rank of the card.
         suit (Suit): The suit of the card.
+        code (int): Canonical integer encoding of the card.
     """
-    rank: Rank
-    suit: Suit
+    __slots__ = ("rank", "suit", "code")
+    
+    def __new__(cls, rank, suit):
+        return _INTERNED[(rank, suit)]
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Card is immutable; cannot set {name!r}")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"Card is immutable; cannot delete {name!r}")
+    
+    def __reduce__(self):
+        # Pickle as the integer code so unpickling returns the interned card.
+        return (int_to_card, (self.code,))
+    
+    def __repr__(self):
+        return f"Card(rank={self.rank}, suit={self.suit})"
     
     def __str__(self):
         """
@@ -52,6 +73,66 @@ class Card:
         }.get(self.rank.value, str(self.rank.value))
         return f"{rank_str}{self.suit.value}"
 
+def _intern_cards():
+    """Create the 52 Card singletons ordered by their integer code."""
+    cards = []
+    for rank in Rank:
+        for suit_index, suit in enumerate(Suit):
+            card = object.__new__(Card)
+            object.__setattr__(card, "rank", rank)
+            object.__setattr__(card, "suit", suit)
+            object.__setattr__(card, "code", (rank.value - 2) * 4 + suit_index)
+            cards.append(card)
+    return tuple(cards)
+
+# All 52 cards indexed by code, plus the (rank, suit) lookup used by Card().
+CARDS = _intern_cards()
+_INTERNED = {(card.rank, card.suit): card for card in CARDS}
+
+def card_to_int(card):
+    """Return the canonical 0..51 code of a card."""
+    return card.code
+
+def card_code(card):
+    """Accept either a Card or an integer card code and return the code."""
+    return card if isinstance(card, int) else card.code
+
+def int_to_card(code):
+    """Return the interned card for a 0..51 code."""
+    return CARDS[code]
+
+def code_rank(code):
+    """Return the rank value (2..14) encoded in a card code."""
+    return (code >> 2) + 2
+
+def code_suit(code):
+    """Return the suit index (0..3, in Suit order) encoded in a card code."""
+    return code & 3
+
+def encode_cards(cards):
+    """
+    Pack cards into a compact byte buffer of card codes.
+    
+    Args:
+        cards (Iterable[Card]): Cards to encode.
+    
+    Returns:
+        array: An array('B') holding one code per card.
+    """
+    return array("B", [card.code for card in cards])
+
+def decode_cards(codes):
+    """
+    Convert a sequence of card codes back to Card objects.
+    
+    Args:
+        codes (Iterable[int]): Card codes, e.g. an array('B') from encode_cards().
+    
+    Returns:
+        List[Card]: The interned cards.
+    """
+    return [CARDS[code] for code in codes]
+
 class HandRank(Enum):
     """
     Enumerates hand rankings in increasing order of strength.
@@ -0,0 +1,136 @@
+"""
+This module caches decoded card images for the Tkinter UI.
+
+Each of the 52 card faces and the card back is read from disk and resized
+at most once per size; Tk PhotoImage objects are then built from the decoded
+images on first use and reused for every later redraw. Decoding can run in a
+background thread at startup so the first deal does not wait on disk.
+"""
+
+import os
+import threading
+from PIL import Image
+from card import CARDS
+
+DEFAULT_ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "cards")
+ASSET_DIR_ENV = "POKER_ASSET_DIR"
+
+# Cache key used for the card back image.
+CARD_BACK = "card_back"
+
+def image_filename(key):
+    """Return the asset file name for a card code or CARD_BACK."""
+    if key == CARD_BACK:
+        return "card_back.png"
+    card = CARDS[key]
+    return f"{card.rank.name.lower()}_of_{card.suit.name.lower()}.png"
+
+class CardImageCache:
+    """
+    Two-level cache of card images keyed by (card, size).
+
+    Attributes:
+        asset_dir (str): Directory holding the card PNG files.
+        size (Tuple[int, int]): Default (width, height) of cached images.
+        hits (int): Lookups served from an existing PhotoImage.
+        misses (int): Lookups that had to build a PhotoImage.
+        disk_loads (int): Image files opened and decoded.
+    """
+
+    def __init__(self, asset_dir=None, size=(120, 180), photo_factory=None):
+        """
+        Args:
+            asset_dir (str or None): Card image directory; defaults to the
+                POKER_ASSET_DIR environment variable, then assets/cards.
+            size (Tuple[int, int]): Default image size.
+            photo_factory (Callable or None): Converts a PIL image to a Tk
+                image; defaults to ImageTk.PhotoImage.
+        """
+        self.asset_dir = asset_dir or os.environ.get(ASSET_DIR_ENV) or DEFAULT_ASSET_DIR
+        self.size = size
+        if photo_factory is None:
+            from PIL import ImageTk
+            photo_factory = ImageTk.PhotoImage
+        self.photo_factory = photo_factory
+        self.hits = 0
+        self.misses = 0
+        self.disk_loads = 0
+        self._decoded = {}  # (key, size) -> PIL image, or None if unreadable.
+        self._photos = {}  # (key, size) -> PhotoImage, or None if unreadable.
+        self._loading = {}  # (key, size) -> Event set once its decode finishes.
+        self._lock = threading.Lock()
+
+    def _decode(self, key, size):
+        """
+        Return the resized PIL image for a key, reading it from disk once.
+
+        If another thread is already decoding the same key, wait for its
+        result instead of decoding (and counting) the file a second time.
+        """
+        with self._lock:
+            if (key, size) in self._decoded:
+                return self._decoded[(key, size)]
+            loading = self._loading.get((key, size))
+            if loading is None:
+                self._loading[(key, size)] = threading.Event()
+        if loading is not None:
+            loading.wait()
+            return self._decoded[(key, size)]
+        image = None
+        try:
+            with Image.open(os.path.join(self.asset_dir, image_filename(key))) as source:
+                image = source.resize(size)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self.disk_loads += 1
+                self._decoded[(key, size)] = image
+                self._loading.pop((key, size)).set()
+        return image
+
+    def preload(self, background=False, size=None):
+        """
+        Decode all 53 images at the given size.
+
+        Args:
+            background (bool): Decode in a daemon thread and return immediately.
+            size (Tuple[int, int] or None): Size to decode at; defaults to self.size.
+
+        Returns:
+            threading.Thread or None: The loader thread when background is True.
+        """
+        size = size or self.size
+        keys = list(range(len(CARDS))) + [CARD_BACK]
+
+        def load_all():
+            for key in keys:
+                self._decode(key, size)
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="card-image-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def get(self, card, size=None):
+        """
+        Return the PhotoImage for a card (or the card back when card is None).
+
+        Must be called from the Tk thread. Returns None if the image file is
+        missing so callers can fall back to drawing the card.
+        """
+        key = (CARD_BACK if card is None else card.code, size or self.size)
+        if key in self._photos:
+            self.hits += 1
+            return self._photos[key]
+        self.misses += 1
+        image = self._decode(*key)
+        photo = self.photo_factory(image) if image is not None else None
+        self._photos[key] = photo
+        return photo
+
+    def stats(self):
+        """Return the hit, miss and disk-load counters as a dict."""
+        return {"hits": self.hits, "misses": self.misses, "disk_loads": self.disk_loads}
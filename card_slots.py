@@ -0,0 +1,96 @@
+"""
+This module keeps the card canvases' items alive between redraws.
+
+It only calls item methods on the canvas it is given, so it has no Tkinter
+dependency of its own and can be driven by any canvas-like object.
+"""
+
+class CardSlots:
+    """
+    Persistent canvas items for keyed slots on one canvas.
+    
+    A slot is a card image ("image"), a drawn fallback card ("card") or a text
+    item ("text"). place() creates a slot's items the first time and later
+    only moves them or swaps their image/text when that actually changed;
+    retain() deletes the slots that are no longer shown.
+    """
+    
+    def __init__(self, canvas):
+        """
+        Args:
+            canvas: The canvas (or canvas-like object) the items live on.
+        """
+        self.canvas = canvas
+        self.slots = {}  # key -> [kind, x, y, value, item ids]
+        self.changes = 0  # Canvas operations issued (create, move, reconfigure, delete).
+    
+    def place(self, key, kind, x, y, value, **options):
+        """
+        Show a slot at a position, reusing its canvas items if it exists.
+        
+        A slot of another kind under the same key is deleted and recreated.
+        
+        Args:
+            key (Hashable): Identifies the slot across redraws.
+            kind (str): "image", "card" or "text".
+            x (float): Left (image, card) or anchor (text) x coordinate.
+            y (float): Top (image, card) or anchor (text) y coordinate.
+            value: The PhotoImage for an "image" slot, the card label for a
+                "card" slot or the string for a "text" slot; compared with
+                != to decide whether the item needs reconfiguring.
+            **options: Used only when the items are created: "card" slots
+                need size=(width, height); "text" slots pass them on to
+                create_text (e.g. anchor, font, fill).
+        """
+        slot = self.slots.get(key)
+        if slot is not None and slot[0] != kind:
+            self._delete(key)
+            slot = None
+        if slot is None:
+            self.slots[key] = [kind, x, y, value, self._create(kind, x, y, value, options)]
+            self.changes += 1
+            return
+        _, old_x, old_y, old_value, items = slot
+        if old_value != value:
+            option = "image" if kind == "image" else "text"
+            self.canvas.itemconfigure(items[-1], **{option: value})
+            slot[3] = value
+            self.changes += 1
+        if (old_x, old_y) != (x, y):
+            for item in items:
+                self.canvas.move(item, x - old_x, y - old_y)
+            slot[1], slot[2] = x, y
+            self.changes += 1
+    
+    def retain(self, keys):
+        """
+        Delete every slot whose key is not among the given keys.
+        
+        Args:
+            keys (Container): Keys of the slots still shown.
+        """
+        for key in [k for k in self.slots if k not in keys]:
+            self._delete(key)
+    
+    def _create(self, kind, x, y, value, options):
+        """
+        Create the canvas items of a new slot (see place()).
+        
+        Returns:
+            tuple: The item ids; the last one is the item whose image or text
+            place() reconfigures.
+        """
+        canvas = self.canvas
+        if kind == "image":
+            return (canvas.create_image(x, y, anchor="nw", image=value),)
+        if kind == "card":
+            # Draw a white rectangle card with black border and show card text.
+            width, height = options["size"]
+            return (canvas.create_rectangle(x, y, x + width, y + height, fill="white", outline="black"),
+                    canvas.create_text(x + width/2, y + height/2, text=value, font=("Helvetica", 14), fill="black"))
+        return (canvas.create_text(x, y, text=value, **options),)
+    
+    def _delete(self, key):
+        """Delete a slot and its canvas items."""
+        self.canvas.delete(*self.slots.pop(key)[4])
+        self.changes += 1
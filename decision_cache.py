@@ -0,0 +1,241 @@
+"""
+This module caches expensive AI sub-results (equities, hand classes, action
+plans) so recurring situations are computed once per process.
+
+Situations are keyed canonically. Suits are relabelled by what they hold, so
+the 24 suit permutations of a spot share one entry; hole cards and the board
+are sorted, as their order does not matter; pot odds are bucketed. Callers
+add whatever else the result depends on, e.g. the number of opponents or the
+position.
+
+DecisionCache is a size-aware LRU: entries are charged their approximate
+size in bytes and the least recently used are evicted past max_bytes. Entries
+can expire after a TTL, and changing the cache's version (when strategy
+parameters change) drops everything computed under the old one. One cache is
+safe to share between the tables of a process.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from card import card_code
+
+DEFAULT_MAX_BYTES = 8 << 20
+POT_ODDS_BUCKETS = 10
+# Bytes charged per entry on top of its key and value: the OrderedDict node
+# and the (value, size, expiry) record.
+ENTRY_OVERHEAD = 120
+
+def canonical_cards(hole, board=()):
+    """
+    Relabel suits so that suit-isomorphic spots get the same card codes.
+
+    Suits are ordered by the ranks they hold in the hole, then on the board;
+    suits holding the same ranks in both are interchangeable, so any order
+    between them gives the same result.
+
+    Args:
+        hole (Iterable[Card or int]): Hole cards.
+        board (Iterable[Card or int]): Community cards.
+
+    Returns:
+        Tuple[Tuple[int, ...], Tuple[int, ...]]: Sorted canonical codes of the
+        hole cards and of the board.
+    """
+    hole = [card_code(card) for card in hole]
+    board = [card_code(card) for card in board]
+    signature = [([], []) for _ in range(4)]
+    for part, codes in enumerate((hole, board)):
+        for code in codes:
+            signature[code & 3][part].append(code >> 2)
+    for held in signature:
+        held[0].sort(reverse=True)
+        held[1].sort(reverse=True)
+    order = sorted(range(4), key=signature.__getitem__, reverse=True)
+    relabel = [0] * 4
+    for new, suit in enumerate(order):
+        relabel[suit] = new
+    return (tuple(sorted(code & ~3 | relabel[code & 3] for code in hole)),
+            tuple(sorted(code & ~3 | relabel[code & 3] for code in board)))
+
+def pot_odds_bucket(to_call, pot, buckets=POT_ODDS_BUCKETS):
+    """Return the price of a call, to_call / (pot + to_call), as a bucket 0..buckets-1."""
+    if to_call <= 0:
+        return 0
+    return min(buckets - 1, to_call * buckets // (pot + to_call))
+
+def situation_key(kind, hole, board=(), *context):
+    """
+    Build a cache key for a sub-result of one situation.
+
+    Args:
+        kind (str): What is cached, e.g. "equity", so results of different
+            kinds never collide.
+        hole (Iterable[Card or int]): The player's hole cards.
+        board (Iterable[Card or int]): Community cards.
+        *context: Anything else the result depends on, such as the number of
+            opponents, a pot_odds_bucket() or the position.
+
+    Returns:
+        tuple: A hashable key.
+    """
+    return (kind, *canonical_cards(hole, board), *context)
+
+def entry_size(key, value):
+    """Approximate bytes held by a cache entry (shallow sizes plus overhead)."""
+    return sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD
+
+class DecisionCache:
+    """
+    Thread-safe, size-bounded LRU cache with optional expiry and versioning.
+
+    Attributes:
+        max_bytes (int): Size budget; least recently used entries are evicted
+            beyond it.
+        ttl (float or None): Seconds an entry stays valid; None never expires.
+        version (object): Version the current entries were computed under.
+        size (int): Bytes currently charged to entries.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that found nothing valid.
+        evictions (int): Entries dropped to stay within max_bytes.
+        expirations (int): Entries dropped because their TTL had passed.
+        invalidations (int): Entries dropped by a version change or clear().
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=None, version=0, clock=time.monotonic):
+        """
+        Args:
+            max_bytes (int): Size budget in bytes.
+            ttl (float or None): Lifetime of an entry in seconds.
+            version (object): Initial version, e.g. a tuple of strategy parameters.
+            clock (Callable[[], float]): Time source for expiry.
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = version
+        self.clock = clock
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # key -> (value, size, expiry or None)
+        self._computing = {}  # key -> Event set once its value is stored
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key):
+        """Return (found, value) and update the counters; the lock must be held."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, size, expiry = entry
+            if expiry is None or self.clock() < expiry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+            self.size -= size
+            self.expirations += 1
+        self.misses += 1
+        return False, None
+
+    def _store(self, key, value, size):
+        """Insert an entry and evict down to max_bytes; the lock must be held."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        if size > self.max_bytes:
+            return
+        expiry = None if self.ttl is None else self.clock() + self.ttl
+        self._entries[key] = (value, size, expiry)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default."""
+        with self._lock:
+            found, value = self._lookup(key)
+        return value if found else default
+
+    def put(self, key, value, size=None):
+        """
+        Cache a value.
+
+        Args:
+            key (Hashable): Cache key, e.g. from situation_key().
+            value (object): The result to keep.
+            size (int or None): Bytes to charge; defaults to entry_size().
+        """
+        size = entry_size(key, value) if size is None else size
+        with self._lock:
+            self._store(key, value, size)
+
+    def get_or_compute(self, key, compute, size=None):
+        """
+        Return the cached value for key, computing and caching it on a miss.
+
+        If another thread is already computing the same key, wait for its
+        result instead of computing it again.
+
+        Args:
+            key (Hashable): Cache key.
+            compute (Callable[[], object]): Produces the value on a miss.
+            size (int or None): Bytes to charge; defaults to entry_size().
+        """
+        while True:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                computing = self._computing.get(key)
+                if computing is None:
+                    computing = self._computing[key] = threading.Event()
+                    break
+            # Another thread is computing it; its result is then a hit, or
+            # if it failed this thread takes over.
+            computing.wait()
+        try:
+            value = compute()
+            with self._lock:
+                self._store(key, value, entry_size(key, value) if size is None else size)
+            return value
+        finally:
+            with self._lock:
+                self._computing.pop(key).set()
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.size = 0
+
+    def set_version(self, version):
+        """Switch to a new version, dropping entries computed under another one."""
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self.size = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """Return the counters, entry count, bytes used and hit rate as a dict."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                    "evictions": self.evictions, "expirations": self.expirations,
+                    "invalidations": self.invalidations, "entries": len(self._entries),
+                    "bytes": self.size}
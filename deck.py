@@ -0,0 +1,66 @@
+"""
+This module provides the reusable deck a Game deals from.
+
+The deck holds the 52 interned cards for its whole life. Shuffling only
+rewinds a cursor; each deal then swaps a uniformly chosen card from the
+undealt part into the cursor position (one step of a Fisher-Yates shuffle),
+so a hand that deals 20 cards does 20 random draws instead of shuffling 52,
+and no cards or lists are allocated per hand.
+"""
+
+import random
+from card import CARDS
+
+class Deck:
+    """
+    A 52-card deck dealt from a cursor with a lazy Fisher-Yates shuffle.
+
+    Attributes:
+        cards (List[Card]): The 52 cards; cards[:position] have been dealt.
+        position (int): Number of cards dealt since the last shuffle.
+        rng: Random source with a random() method, e.g. random.Random.
+    """
+
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng (random.Random or None): Random source; defaults to the global
+                random module. Pass a seeded instance for reproducible deals.
+        """
+        self.cards = list(CARDS)
+        self.position = 0
+        self.rng = rng if rng is not None else random
+
+    def shuffle(self):
+        """Return every card to the deck; the shuffling happens as cards are dealt."""
+        self.position = 0
+
+    def deal(self):
+        """
+        Deal the next card.
+
+        Returns:
+            Card: A card drawn uniformly from those not yet dealt.
+
+        Raises:
+            IndexError: If all 52 cards have been dealt.
+        """
+        cards = self.cards
+        i = self.position
+        if i >= 52:
+            raise IndexError("deal from an empty deck")
+        j = i + int(self.rng.random() * (52 - i))
+        cards[i], cards[j] = cards[j], cards[i]
+        self.position = i + 1
+        return cards[i]
+
+    def burn(self):
+        """Discard one card face down."""
+        self.deal()
+
+    def __len__(self):
+        return 52 - self.position
+
+    def __iter__(self):
+        """Iterate over the cards not yet dealt (in no meaningful order)."""
+        return iter(self.cards[self.position:])
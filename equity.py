@@ -0,0 +1,432 @@
+"""
+This module computes Texas Hold'em equities, either by Monte Carlo sampling
+or by exact enumeration of the cards still to come.
+
+The remaining board cards (and the hole cards of any player whose hand is
+unknown) come from the undealt stub and are scored with the lookup tables
+from hand_evaluator. Results are accumulated as integer counts in an
+EquityTally so that separate runs can be merged exactly.
+"""
+
+import math
+import random
+from time import perf_counter
+from itertools import combinations
+from dataclasses import dataclass, field
+from typing import List
+from card import card_code
+from hand_evaluator import lookup_tables
+
+# Two-sided 95% normal quantile used for confidence intervals.
+Z_95 = 1.96
+# Target length of one anytime_equity() batch, in seconds.
+ANYTIME_BATCH_SECONDS = 0.001
+
+@dataclass
+class PlayerEquity:
+    """
+    Equity estimate for one player.
+
+    Attributes:
+        win (float): Fraction of runouts won outright.
+        tie (float): Fraction of runouts split with other players.
+        loss (float): Fraction of runouts lost.
+        equity (float): Expected share of the pot (wins plus split shares).
+        stderr (float): Standard error of the equity estimate.
+        ci_low (float): Lower bound of the 95% confidence interval.
+        ci_high (float): Upper bound of the 95% confidence interval.
+    """
+    win: float
+    tie: float
+    loss: float
+    equity: float
+    stderr: float
+    ci_low: float
+    ci_high: float
+
+@dataclass
+class EquityResult:
+    """
+    Outcome of an equity calculation.
+
+    Attributes:
+        players (List[PlayerEquity]): Per-player estimates in input order.
+        iterations (int): Number of runouts evaluated.
+    """
+    players: List[PlayerEquity]
+    iterations: int
+
+@dataclass
+class EquityTally:
+    """
+    Integer outcome counts for a set of players.
+
+    Pot shares are stored in units of 1/share_unit, where share_unit is
+    divisible by every possible number of tied players, so tallies from
+    different runs merge without rounding.
+
+    Attributes:
+        num_players (int): Number of players being tallied.
+        trials (int): Runouts recorded so far.
+        wins, ties, losses (List[int]): Per-player outcome counts.
+        shares (List[int]): Per-player sum of pot shares.
+        share_squares (List[int]): Per-player sum of squared pot shares.
+    """
+    num_players: int
+    trials: int = 0
+    wins: List[int] = field(default_factory=list)
+    ties: List[int] = field(default_factory=list)
+    losses: List[int] = field(default_factory=list)
+    shares: List[int] = field(default_factory=list)
+    share_squares: List[int] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.share_unit = math.lcm(*range(1, self.num_players + 1))
+        for counts in (self.wins, self.ties, self.losses, self.shares, self.share_squares):
+            if not counts:
+                counts.extend([0] * self.num_players)
+
+    def record(self, strengths, weight=1):
+        """
+        Record one showdown.
+
+        Args:
+            strengths (List[int]): Hand strength per player.
+            weight (int): Number of identical runouts this showdown stands for.
+        """
+        best = max(strengths)
+        tied = strengths.count(best)
+        share = self.share_unit // tied
+        self.trials += weight
+        for i, strength in enumerate(strengths):
+            if strength == best:
+                if tied == 1:
+                    self.wins[i] += weight
+                else:
+                    self.ties[i] += weight
+                self.shares[i] += share * weight
+                self.share_squares[i] += share * share * weight
+            else:
+                self.losses[i] += weight
+
+    def merge(self, other):
+        """Add the counts of another tally over the same players into this one."""
+        if other.num_players != self.num_players:
+            raise ValueError("Cannot merge tallies for different numbers of players.")
+        self.trials += other.trials
+        for mine, theirs in ((self.wins, other.wins), (self.ties, other.ties),
+                             (self.losses, other.losses), (self.shares, other.shares),
+                             (self.share_squares, other.share_squares)):
+            for i, value in enumerate(theirs):
+                mine[i] += value
+
+    def stderr(self, i):
+        """Return the standard error of player i's equity estimate."""
+        n = self.trials
+        if n < 2:
+            return float("inf")
+        unit = self.share_unit
+        mean = self.shares[i] / (n * unit)
+        variance = self.share_squares[i] / (n * unit * unit) - mean * mean
+        return math.sqrt(max(variance, 0.0) / (n - 1))
+
+    def result(self):
+        """Convert the counts into an EquityResult."""
+        n = max(self.trials, 1)
+        players = []
+        for i in range(self.num_players):
+            equity_share = self.shares[i] / (n * self.share_unit)
+            error = self.stderr(i) if self.trials > 1 else 0.0
+            players.append(PlayerEquity(
+                win=self.wins[i] / n,
+                tie=self.ties[i] / n,
+                loss=self.losses[i] / n,
+                equity=equity_share,
+                stderr=error,
+                ci_low=max(0.0, equity_share - Z_95 * error),
+                ci_high=min(1.0, equity_share + Z_95 * error),
+            ))
+        return EquityResult(players, self.trials)
+
+def prepare_spot(hole_cards_per_player, board=(), dead_cards=()):
+    """
+    Validate a spot and convert it to card codes.
+
+    A player's hole cards may be empty (or None) to mean an unknown hand that
+    is dealt at random from the stub.
+
+    Args:
+        hole_cards_per_player (List[List[Card]]): Hole cards for each player.
+        board (List[Card]): Community cards already dealt (0 to 5).
+        dead_cards (List[Card]): Cards known to be out of play.
+
+    Returns:
+        tuple: (holes, board, stub) where holes is a list of code tuples (empty
+        for unknown hands), board is a tuple of codes and stub lists the codes
+        still available to be dealt.
+    """
+    if len(hole_cards_per_player) < 2:
+        raise ValueError("Equity needs at least two players.")
+    holes = [tuple(card_code(c) for c in (hand or ())) for hand in hole_cards_per_player]
+    for hand in holes:
+        if len(hand) not in (0, 2):
+            raise ValueError("Each player needs exactly two hole cards or none.")
+    board = tuple(card_code(c) for c in board)
+    if len(board) > 5:
+        raise ValueError("The board cannot hold more than five cards.")
+    known = [c for hand in holes for c in hand] + list(board) + [card_code(c) for c in dead_cards]
+    if len(set(known)) != len(known):
+        raise ValueError("The same card appears more than once.")
+    known = set(known)
+    stub = [code for code in range(52) if code not in known]
+    if len(stub) < 5 - len(board) + 2 * sum(1 for hand in holes if not hand):
+        raise ValueError("Not enough cards left to complete the hand.")
+    return holes, board, stub
+
+def sample_equity(tally, holes, board, stub, iterations, rng):
+    """
+    Run Monte Carlo runouts and record them in a tally.
+
+    The stub list is shuffled in place with a partial Fisher-Yates pass that
+    only moves as many cards as each runout needs, and all per-runout state
+    lives in preallocated lists.
+
+    Args:
+        tally (EquityTally): Tally that receives the outcomes.
+        holes (List[Tuple[int]]): Hole card codes per player (empty if unknown).
+        board (Tuple[int]): Board card codes.
+        stub (List[int]): Undealt card codes; reordered in place.
+        iterations (int): Number of runouts to sample.
+        rng (random.Random): Source of randomness.
+    """
+    primes, bits, product_table, flush_table = lookup_tables()
+    num_players = len(holes)
+    board_draw = 5 - len(board)
+    unknown = [i for i, hand in enumerate(holes) if not hand]
+    draw = board_draw + 2 * len(unknown)
+    stub_size = len(stub)
+    random_float = rng.random
+
+    board_product = 1
+    board_masks = [0, 0, 0, 0]
+    for code in board:
+        board_product *= primes[code]
+        board_masks[code & 3] |= bits[code]
+    hole_products = [0] * num_players
+    hole_masks = [[0, 0, 0, 0] for _ in range(num_players)]
+    for i, hand in enumerate(holes):
+        hole_products[i] = primes[hand[0]] * primes[hand[1]] if hand else 1
+        for code in hand:
+            hole_masks[i][code & 3] |= bits[code]
+
+    masks = [0, 0, 0, 0]
+    strengths = [0] * num_players
+    players = range(num_players)
+    suits = range(4)
+    for _ in range(iterations):
+        for j in range(draw):
+            k = j + int(random_float() * (stub_size - j))
+            stub[j], stub[k] = stub[k], stub[j]
+        product = board_product
+        masks[:] = board_masks
+        for j in range(board_draw):
+            code = stub[j]
+            product *= primes[code]
+            masks[code & 3] |= bits[code]
+        j = board_draw
+        for i in unknown:
+            first, second = stub[j], stub[j + 1]
+            j += 2
+            hole_products[i] = primes[first] * primes[second]
+            player_masks = hole_masks[i]
+            player_masks[0] = player_masks[1] = player_masks[2] = player_masks[3] = 0
+            player_masks[first & 3] |= bits[first]
+            player_masks[second & 3] |= bits[second]
+        for i in players:
+            player_masks = hole_masks[i]
+            strength = 0
+            for suit in suits:
+                strength = flush_table[masks[suit] | player_masks[suit]]
+                if strength:
+                    break
+            strengths[i] = strength or product_table[product * hole_products[i]]
+        tally.record(strengths)
+
+def equity(hole_cards_per_player, board=(), dead_cards=(), iterations=10000, seed=None,
+           target_stderr=None, batch_size=1000):
+    """
+    Estimate each player's equity by sampling the remaining runouts.
+
+    Sampling proceeds in batches; when target_stderr is given it stops early
+    as soon as every player's equity standard error is at or below it. The
+    same seed and arguments always reproduce the same result.
+
+    Args:
+        hole_cards_per_player (List[List[Card]]): Hole cards for each player;
+            an empty list stands for an unknown hand dealt at random.
+        board (List[Card]): Community cards already dealt (0 to 5).
+        dead_cards (List[Card]): Cards known to be out of play.
+        iterations (int): Maximum number of runouts to sample.
+        seed (int or None): Seed for the random number generator.
+        target_stderr (float or None): Stop once all standard errors reach this.
+        batch_size (int): Runouts sampled between stopping checks.
+
+    Returns:
+        EquityResult: Win/tie/loss fractions and equity intervals per player.
+    """
+    holes, board, stub = prepare_spot(hole_cards_per_player, board, dead_cards)
+    rng = random.Random(seed)
+    tally = EquityTally(len(holes))
+    remaining = iterations
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        sample_equity(tally, holes, board, stub, batch, rng)
+        remaining -= batch
+        if target_stderr is not None and \
+                all(tally.stderr(i) <= target_stderr for i in range(tally.num_players)):
+            break
+    return tally.result()
+
+def anytime_equity(hole_cards_per_player, board, deadline, dead_cards=(), rng=None,
+                   first_batch=16, clock=perf_counter):
+    """
+    Sample runouts until a deadline, then return the estimate so far.
+
+    The first small batch measures what a runout costs; later batches are
+    sized to take about ANYTIME_BATCH_SECONDS and are cut short so the last
+    one ends by the deadline, whatever the number of players or the speed of
+    the machine. Only the first batch can overrun a deadline that is already
+    close.
+
+    Args:
+        hole_cards_per_player (List[List[Card]]): Hole cards for each player;
+            an empty list stands for an unknown hand dealt at random.
+        board (List[Card]): Community cards already dealt (0 to 5).
+        deadline (float): clock() value to finish by.
+        dead_cards (List[Card]): Cards known to be out of play.
+        rng (random.Random or None): Source of randomness; defaults to the
+            random module.
+        first_batch (int): Runouts sampled to time the first batch.
+        clock (Callable[[], float]): Time source, time.perf_counter by default.
+
+    Returns:
+        EquityResult: The estimate; iterations is the number of runouts
+        sampled, 0 if the deadline had already passed.
+    """
+    holes, board, stub = prepare_spot(hole_cards_per_player, board, dead_cards)
+    rng = rng or random
+    tally = EquityTally(len(holes))
+    lookup_tables()
+    runout_seconds = None
+    while True:
+        start = clock()
+        remaining = deadline - start
+        if runout_seconds is None:
+            batch = first_batch if remaining > 0 else 0
+        else:
+            batch = min(max(1, int(ANYTIME_BATCH_SECONDS / runout_seconds)),
+                        int(remaining / runout_seconds))
+        if batch <= 0:
+            break
+        sample_equity(tally, holes, board, stub, batch, rng)
+        runout_seconds = (clock() - start) / batch
+    return tally.result()
+
+def enumerate_equity(tally, holes, board, stub):
+    """
+    Record every possible completion of the board (and of unknown hands).
+
+    Boards are built depth-first so each partial board's prime product and
+    suit masks are computed once and extended in place, and every complete
+    board is scored once per known hand no matter how many opponent holdings
+    are enumerated against it.
+
+    Args:
+        tally (EquityTally): Tally that receives the outcomes.
+        holes (List[Tuple[int]]): Hole card codes per player (empty if unknown).
+        board (Tuple[int]): Board card codes.
+        stub (List[int]): Undealt card codes.
+    """
+    primes, bits, product_table, flush_table = lookup_tables()
+    num_players = len(holes)
+    unknown = [i for i, hand in enumerate(holes) if not hand]
+    known = [i for i, hand in enumerate(holes) if hand]
+    hole_parts = []
+    for hand in holes:
+        product, masks = 1, [0, 0, 0, 0]
+        for code in hand:
+            product *= primes[code]
+            masks[code & 3] |= bits[code]
+        hole_parts.append((product, masks))
+    strengths = [0] * num_players
+
+    def score(product, masks, hole_product, hole_masks):
+        for suit in range(4):
+            strength = flush_table[masks[suit] | hole_masks[suit]]
+            if strength:
+                return strength
+        return product_table[product * hole_product]
+
+    def deal_unknown(product, masks, available, depth):
+        # Give the next unknown player every two-card holding left in available.
+        if depth == len(unknown):
+            tally.record(strengths)
+            return
+        player = unknown[depth]
+        for first, second in combinations(available, 2):
+            hole_masks = [0, 0, 0, 0]
+            hole_masks[first & 3] |= bits[first]
+            hole_masks[second & 3] |= bits[second]
+            strengths[player] = score(product, masks, primes[first] * primes[second], hole_masks)
+            rest = [c for c in available if c != first and c != second] \
+                if depth + 1 < len(unknown) else available
+            deal_unknown(product, masks, rest, depth + 1)
+
+    def extend(start, to_deal, product, masks, used):
+        if to_deal == 0:
+            for i in known:
+                hole_product, hole_masks = hole_parts[i]
+                strengths[i] = score(product, masks, hole_product, hole_masks)
+            if unknown:
+                available = [c for c in stub if c not in used]
+                deal_unknown(product, masks, available, 0)
+            else:
+                tally.record(strengths)
+            return
+        for index in range(start, len(stub) - to_deal + 1):
+            code = stub[index]
+            suit = code & 3
+            saved = masks[suit]
+            masks[suit] = saved | bits[code]
+            used.append(code)
+            extend(index + 1, to_deal - 1, product * primes[code], masks, used)
+            used.pop()
+            masks[suit] = saved
+
+    board_product, board_masks = 1, [0, 0, 0, 0]
+    for code in board:
+        board_product *= primes[code]
+        board_masks[code & 3] |= bits[code]
+    extend(0, 5 - len(board), board_product, board_masks, [])
+
+def exact_equity(hole_cards_per_player, board=(), dead_cards=()):
+    """
+    Compute exact outcome counts over every way the hand can finish.
+
+    Players with empty hole cards are enumerated over every holding that
+    does not collide with the known cards or each other. This is intended
+    for late streets; with three or more board cards to come prefer equity().
+
+    Args:
+        hole_cards_per_player (List[List[Card]]): Hole cards for each player;
+            an empty list stands for an opponent whose holdings are enumerated.
+        board (List[Card]): Community cards already dealt (0 to 5).
+        dead_cards (List[Card]): Cards known to be out of play.
+
+    Returns:
+        EquityTally: Exact win/tie/loss counts; call result() for fractions.
+    """
+    holes, board, stub = prepare_spot(hole_cards_per_player, board, dead_cards)
+    tally = EquityTally(len(holes))
+    enumerate_equity(tally, holes, board, stub)
+    return tally
@@ -0,0 +1,64 @@
+"""
+This module defines the event sinks a Game reports to when it runs without
+the Tkinter interface.
+
+A sink exposes the same display and logging methods the game calls on
+GameUI (or the UIBridge in front of it), so the engine can drive either one without knowing which it has.
+"""
+
+from collections import deque
+
+class NullSink:
+    """Discards every event; used for headless games and bulk simulation."""
+
+    # No human can be prompted through a sink (see Game.play_game).
+    interactive = False
+
+    def append_log(self, message):
+        pass
+
+    def announce(self, message):
+        pass
+
+    def display_player_hand(self, cards):
+        pass
+
+    def display_ai_hands(self, ai_cards, reveal_all=False):
+        pass
+
+    def display_community_cards(self, cards):
+        pass
+
+    def flush(self):
+        pass
+
+    def show_message(self, title, message):
+        pass
+
+    def prompt_action(self, prompt, options):
+        raise RuntimeError("A headless game cannot prompt a human player; give the seat a "
+                           "strategy or play through ui_bridge.run_game().")
+
+    def prompt_amount(self, prompt, min_value, max_value):
+        self.prompt_action(prompt, [])
+
+class BufferedSink(NullSink):
+    """
+    Keeps log and announcement messages in memory instead of printing them.
+    
+    Attributes:
+        messages (deque): The most recent messages, oldest first.
+    """
+
+    def __init__(self, maxlen=None):
+        """
+        Args:
+            maxlen (int or None): Maximum messages to keep; None keeps all.
+        """
+        self.messages = deque(maxlen=maxlen)
+
+    def append_log(self, message):
+        self.messages.append(message)
+
+    def announce(self, message):
+        self.messages.append(message)
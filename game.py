@@ -5,11 +5,13 @@ It manages deck creation, dealing cards, betting rounds, and determining winners
 
 import random
 from typing import List
-from card import Card, Suit, Rank, HandRank
+from deck import Deck
 from player import Player
-from ui import GameUI  # New import
-from hand_evaluator import evaluate_hand  # New import
+from hand_evaluator import hand_strength, hand_category, lookup_tables
 from ai import make_betting_decision  # New import
+from events import NullSink
+from pots import build_side_pots, award_side_pots
+from history import HandRecord, FOLD, CHECK, BET, STREET_OF_BOARD
 
 class Game:
     # Define game states.
@@ -19,15 +21,37 @@ class Game:
     RIVER = "RIVER"
     SHOWDOWN = "SHOWDOWN"
     
-    def __init__(self, player_name="Player", starting_chips=1000):
+    def __init__(self, player_name="Player", starting_chips=1000, ui=None, strategies=None, rng=None,
+                 recorder=None, ai_deadline=None):
         """
         Initialize game state including deck, players, blinds, and pot.
         
         Args:
             player_name (str): Name of the human player.
             starting_chips (int): Initial chip count for each player.
+            ui: Object receiving display and log events (a GameUI, a UIBridge or an
+                events sink). Defaults to a NullSink, i.e. a headless game.
+            strategies (List[Callable] or None): Optional decision callback per
+                seat, called as strategy(game, player) in place of the default.
+            rng (random.Random or None): Random source for shuffling; defaults
+                to the global random module.
+            recorder (HistoryWriter or None): Receives a HandRecord for every
+                round played (see history.py).
+            ai_deadline (float or None): Seconds each default AI decision may
+                take; with it the AI estimates postflop equity from the board
+                (see ai.make_betting_decision), without it only the preflop
+                table is used.
         """
-        self.deck = []  # List of Card objects.
+        self.ui = ui if ui is not None else NullSink()
+        self.rng = rng if rng is not None else random
+        self.recorder = recorder
+        self.ai_deadline = ai_deadline
+        if ai_deadline is not None:
+            lookup_tables()  # Built now, so the first AI decision keeps to its deadline.
+        self.actions = []  # Actions of the current hand, kept only when recording.
+        self.profiler = None  # Set by profiling.GameProfiler.attach().
+        self.ranges = None  # Set by ranges.RangeTracker.attach().
+        self.deck = Deck(self.rng)  # Reused every hand.
         self.community_cards = []  # Cards shared among players.
         self.players = [
             Player(player_name, [], starting_chips, False),
@@ -40,41 +64,55 @@ class Game:
         self.small_blind = 5
         self.big_blind = 10
         self.dealer_idx = 0
+        for player, strategy in zip(self.players, strategies or []):
+            player.strategy = strategy
         
     def create_deck(self):
-        """Generate a standard deck and shuffle it."""
-        self.deck = []
-        for suit in Suit:
-            for rank in Rank:
-                self.deck.append(Card(rank, suit))
-        random.shuffle(self.deck)
+        """Gather all 52 cards back into the deck and shuffle it for a new hand."""
+        self.deck.shuffle()
     
     def deal_cards(self):
         """
         Deal two cards to each active player and clear community cards.
         """
         for player in self.players:
-            player.hand = []  # Reset hands.
-        self.community_cards = []
+            player.hand.clear()  # Reset hands, reusing their lists.
+        self.community_cards.clear()
         for _ in range(2):
             for player in self.players:
                 if not player.folded:
-                    player.hand.append(self.deck.pop())
+                    player.hand.append(self.deck.deal())
     
     def deal_flop(self):
         """
         Deal the flop (three community cards) after discarding one card.
         """
-        self.deck.pop()  # Burn card.
+        self.deck.burn()
         for _ in range(3):
-            self.community_cards.append(self.deck.pop())
+            self.community_cards.append(self.deck.deal())
             
     def deal_turn_or_river(self):
         """
         Deal one more community card (turn or river) after discarding one card.
         """
-        self.deck.pop()  # Burn card.
-        self.community_cards.append(self.deck.pop())
+        self.deck.burn()
+        self.community_cards.append(self.deck.deal())
+    
+    def remove_player(self, index):
+        """
+        Remove the player in a seat, keeping the button on the same player.
+        
+        Args:
+            index (int): Seat of the player to remove.
+        
+        Returns:
+            Player: The removed player.
+        """
+        player = self.players.pop(index)
+        if index < self.dealer_idx:
+            self.dealer_idx -= 1
+        self.dealer_idx = self.dealer_idx % len(self.players) if self.players else 0
+        return player
     
     def get_active_players(self):
         """Return a list of players who have not folded."""
@@ -90,16 +128,67 @@ class Game:
         
         while True:
             for player in self.get_active_players():
-                if not player.folded:
-                    if player.is_ai:
-                        make_betting_decision(self, player)  # Use AI helper
-                    else:
-                        self.human_betting_decision(player)
-            # After a full cycle, check if bets are equal.
+                # All-in players have nothing left to act with.
+                if not player.folded and player.chips > 0:
+                    self.decide(player)
+            # After a full cycle, check if bets are equal (or players are all-in).
             active_players = self.get_active_players()
-            if all(p.current_bet == self.current_bet for p in active_players):
+            if all(p.current_bet == self.current_bet or p.chips == 0 for p in active_players):
                 break
     
+    def decide(self, player):
+        """
+        Ask a player's decision maker to act: the seat's strategy callback if
+        one is set, otherwise the AI helper or the human prompt.
+        
+        Args:
+            player (Player): The player to act.
+        """
+        chips = player.chips
+        if player.strategy is not None:
+            player.strategy(self, player)
+        elif player.is_ai:
+            make_betting_decision(self, player, self.ai_deadline)  # Use AI helper
+        else:
+            self.human_betting_decision(player)
+        if self.recorder is not None:
+            self.record_action(player, chips - player.chips)
+
+    def record_action(self, player, amount):
+        """
+        Note the outcome of a decision for the hand history.
+
+        Args:
+            player (Player): The player who just acted.
+            amount (int): Chips the decision put into the pot.
+        """
+        kind = FOLD if player.folded else BET if amount > 0 else CHECK
+        # Plain tuples keep this cheap; they compare equal to history.Action.
+        self.actions.append((self.seat_of[id(player)], STREET_OF_BOARD[len(self.community_cards)],
+                             kind, amount))
+
+    def hand_record(self, stacks):
+        """
+        Build the history record of the hand just played.
+
+        Args:
+            stacks (List[int]): Chips per seat before the blinds were posted.
+
+        Returns:
+            HandRecord: The hand, with the actions collected by record_action().
+        """
+        return HandRecord(
+            names=[p.name for p in self.players],
+            stacks=stacks,
+            dealer=self.dealer_idx,
+            small_blind=self.small_blind,
+            big_blind=self.big_blind,
+            hole_cards=[tuple(card.code for card in p.hand) for p in self.players],
+            board=tuple(card.code for card in self.community_cards),
+            actions=self.actions,
+            final_stacks=[p.chips for p in self.players],
+        )
+    
     def human_betting_decision(self, player):
         """
         Prompt the human player for their betting choice using the UI.
@@ -158,6 +247,7 @@ class Game:
         amount = min(amount, player.chips)
         player.chips -= amount
         player.current_bet += amount
+        player.total_bet += amount
         self.pot += amount
         if player.current_bet > self.current_bet:
             self.current_bet = player.current_bet
@@ -167,28 +257,19 @@ class Game:
             else:
                 self.ui.append_log(f"{player.name} raises to {player.current_bet}.")
     
-    def compare_hands(self, hand1, hand2):
+    def hand_strengths(self, players):
         """
-        Compare two hand evaluation tuples element-by-element.
+        Score each player's best hand with the community cards.
+        
+        Args:
+            players (List[Player]): Players to evaluate.
+        
         Returns:
-            1 if hand1 is stronger, -1 if hand2 is stronger, 0 if tied.
-        """
-        max_len = max(len(hand1), len(hand2))
-        h1 = list(hand1) + [0] * (max_len - len(hand1))
-        h2 = list(hand2) + [0] * (max_len - len(hand2))
-        for a, b in zip(h1, h2):
-            # If elements are HandRank, compare their .value.
-            if hasattr(a, 'value') and hasattr(b, 'value'):
-                if a.value > b.value:
-                    return 1
-                elif a.value < b.value:
-                    return -1
-            else:
-                if a > b:
-                    return 1
-                elif a < b:
-                    return -1
-        return 0
+            List[Tuple[Player, int]]: Each player with an integer strength key;
+            larger keys are better hands and equal keys tie.
+        """
+        board = self.community_cards
+        return [(player, hand_strength(player.hand + board)) for player in players]
 
     def find_winners(self):
         """
@@ -201,49 +282,41 @@ class Game:
         if len(active_players) == 1:
             return active_players
         
-        board_eval = evaluate_hand(self.community_cards)
-        player_hands = []
-        for player in active_players:
-            hand_eval = evaluate_hand(player.hand + self.community_cards)
-            # If a player hasn't improved on the board, use the board's evaluation.
-            if self.compare_hands(hand_eval, board_eval) < 0:
-                hand_eval = board_eval
-            player_hands.append((player, hand_eval))
-        
-        # Determine best hand using component-wise comparison.
-        best_hand = player_hands[0][1]
-        for _, hand_eval in player_hands[1:]:
-            if self.compare_hands(hand_eval, best_hand) == 1:
-                best_hand = hand_eval
-        
-        # Collect all players whose hand compares as tied with best_hand.
-        winners = [p for p, hand_eval in player_hands if self.compare_hands(hand_eval, best_hand) == 0]
-        return winners
+        # Strength keys are totally ordered integers, so the best is a max().
+        player_hands = self.hand_strengths(active_players)
+        best = max(strength for _, strength in player_hands)
+        return [p for p, strength in player_hands if strength == best]
 
     def show_all_hands(self):
         """
         Display all active players' hands along with their evaluated hand rank.
         """
-        print("\nFinal hands:")
-        for player in self.get_active_players():
+        self.ui.announce("\nFinal hands:")
+        for player, strength in self.hand_strengths(self.get_active_players()):
             hand_str = ' '.join(str(card) for card in player.hand)
-            hand_rank = evaluate_hand(player.hand + self.community_cards)
-            print(f"{player.name}: {hand_str} - {hand_rank[0].name}")
+            self.ui.announce(f"{player.name}: {hand_str} - {hand_category(strength).name}")
     
-    def distribute_pot(self, winners):
+    def distribute_pot(self):
         """
-        Distribute the pot among winners, handling any remainders.
+        Distribute the pot through side pots built from each player's
+        contribution this hand, so all-in players only win what was matched.
         
-        Args:
-            winners (List[Player]): List of winning players.
-        """
-        split_amount = self.pot // len(winners)
-        remainder = self.pot % len(winners)
-        for player in winners:
-            player.chips += split_amount
-            print(f"{player.name} wins {split_amount} chips!")
-        if remainder > 0:
-            winners[0].chips += remainder
+        Every contender is evaluated once and the hands are ranked with a
+        single sort; each side pot then goes to its best eligible hand(s),
+        with any remainder to the first winner in seat order.
+        """
+        pots = build_side_pots([p.total_bet for p in self.players],
+                               [p.folded for p in self.players])
+        live = [i for i, p in enumerate(self.players) if not p.folded]
+        if len(live) == 1:
+            strengths = {live[0]: 0}
+        else:
+            hands = self.hand_strengths([self.players[i] for i in live])
+            strengths = {seat: strength for seat, (_, strength) in zip(live, hands)}
+        for seat, amount in award_side_pots(pots, strengths).items():
+            player = self.players[seat]
+            player.chips += amount
+            self.ui.announce(f"{player.name} wins {amount} chips!")
     
     def post_blinds(self):
         """
@@ -261,6 +334,7 @@ class Game:
         """
         for player in self.players:
             player.current_bet = 0
+            player.total_bet = 0
             player.folded = False
         self.current_bet = 0
         self.pot = 0
@@ -271,11 +345,15 @@ class Game:
         Execute a full round using a state machine for phases:
         PRE_FLOP, FLOP, TURN, RIVER, and SHOWDOWN.
         """
-        print("\n" + "=" * 50)
-        print(f"ROUND START - Dealer: {self.players[self.dealer_idx].name}")
-        print("=" * 50)
+        self.ui.announce("\n" + "=" * 50)
+        self.ui.announce(f"ROUND START - Dealer: {self.players[self.dealer_idx].name}")
+        self.ui.announce("=" * 50)
         self.create_deck()
         self.reset_round()
+        if self.recorder is not None:
+            stacks = [p.chips for p in self.players]
+            self.actions = []
+            self.seat_of = {id(p): seat for seat, p in enumerate(self.players)}
         self.post_blinds()
         self.deal_cards()
         
@@ -285,85 +363,101 @@ class Game:
             self.ui.display_player_hand(human.hand)
         ai_hands = [(p.name, p.hand, p.folded) for p in self.players if p.is_ai]
         self.ui.display_ai_hands(ai_hands)
+        self.ui.flush()
         
         state = self.PRE_FLOP
+        profiler = self.profiler
         
         while state != "END":
-            if state == self.PRE_FLOP:
-                print("\nPre-flop betting:")
-                self.betting_round()
-                state = self.FLOP if len(self.get_active_players()) > 1 else self.SHOWDOWN
+            if profiler is not None:
+                profiler.begin(state)
+            try:
+                if state == self.PRE_FLOP:
+                    self.ui.announce("\nPre-flop betting:")
+                    self.betting_round()
+                    state = self.FLOP if len(self.get_active_players()) > 1 else self.SHOWDOWN
             
-            elif state == self.FLOP:
-                self.deal_flop()
-                print(f"\nFlop: {' '.join(str(card) for card in self.community_cards)}")
-                # Update community cards display.
-                self.ui.display_community_cards(self.community_cards)
-                self.current_bet = 0
-                for player in self.players:
-                    player.current_bet = 0
-                print("\nFlop betting:")
-                self.betting_round()
-                state = self.TURN if len(self.get_active_players()) > 1 else self.SHOWDOWN
+                elif state == self.FLOP:
+                    self.deal_flop()
+                    self.ui.announce(f"\nFlop: {' '.join(str(card) for card in self.community_cards)}")
+                    # Update community cards display.
+                    self.ui.display_community_cards(self.community_cards)
+                    self.ui.flush()
+                    self.current_bet = 0
+                    for player in self.players:
+                        player.current_bet = 0
+                    self.ui.announce("\nFlop betting:")
+                    self.betting_round()
+                    state = self.TURN if len(self.get_active_players()) > 1 else self.SHOWDOWN
             
-            elif state == self.TURN:
-                self.deal_turn_or_river()
-                print(f"\nTurn: {' '.join(str(card) for card in self.community_cards)}")
-                # Update community cards display.
-                self.ui.display_community_cards(self.community_cards)
-                self.current_bet = 0
-                for player in self.players:
-                    player.current_bet = 0
-                print("\nTurn betting:")
-                self.betting_round()
-                state = self.RIVER if len(self.get_active_players()) > 1 else self.SHOWDOWN
+                elif state == self.TURN:
+                    self.deal_turn_or_river()
+                    self.ui.announce(f"\nTurn: {' '.join(str(card) for card in self.community_cards)}")
+                    # Update community cards display.
+                    self.ui.display_community_cards(self.community_cards)
+                    self.ui.flush()
+                    self.current_bet = 0
+                    for player in self.players:
+                        player.current_bet = 0
+                    self.ui.announce("\nTurn betting:")
+                    self.betting_round()
+                    state = self.RIVER if len(self.get_active_players()) > 1 else self.SHOWDOWN
             
-            elif state == self.RIVER:
-                self.deal_turn_or_river()
-                print(f"\nRiver: {' '.join(str(card) for card in self.community_cards)}")
-                # Update community cards display.
-                self.ui.display_community_cards(self.community_cards)
-                self.current_bet = 0
-                for player in self.players:
-                    player.current_bet = 0
-                print("\nRiver betting:")
-                self.betting_round()
-                state = self.SHOWDOWN
+                elif state == self.RIVER:
+                    self.deal_turn_or_river()
+                    self.ui.announce(f"\nRiver: {' '.join(str(card) for card in self.community_cards)}")
+                    # Update community cards display.
+                    self.ui.display_community_cards(self.community_cards)
+                    self.ui.flush()
+                    self.current_bet = 0
+                    for player in self.players:
+                        player.current_bet = 0
+                    self.ui.announce("\nRiver betting:")
+                    self.betting_round()
+                    state = self.SHOWDOWN
             
-            elif state == self.SHOWDOWN:
-                # Reveal all AI cards at showdown.
-                ai_hands = [(p.name, p.hand, p.folded) for p in self.players if p.is_ai]
-                self.ui.display_ai_hands(ai_hands, reveal_all=True)
-                active_players = self.get_active_players()
-                if len(active_players) > 1:
-                    self.show_all_hands()
-                    winners = self.find_winners()
-                    self.distribute_pot(winners)
-                else:
-                    self.distribute_pot(active_players)
-                state = "END"
+                elif state == self.SHOWDOWN:
+                    # Reveal all AI cards at showdown.
+                    ai_hands = [(p.name, p.hand, p.folded) for p in self.players if p.is_ai]
+                    self.ui.display_ai_hands(ai_hands, reveal_all=True)
+                    self.ui.flush()
+                    if len(self.get_active_players()) > 1:
+                        self.show_all_hands()
+                    self.distribute_pot()
+                    state = "END"
+            finally:
+                if profiler is not None:
+                    profiler.end()
         
-        print("\nCurrent chip counts:")
+        if self.recorder is not None:
+            self.recorder.record(self.hand_record(stacks))
+        self.ui.announce("\nCurrent chip counts:")
         for player in self.players:
-            print(f"{player.name}: {player.chips}")
+            self.ui.announce(f"{player.name}: {player.chips}")
     
     def play_game(self):
         """
         Main game loop that continues rounds until a termination condition is met.
-        Uses a UI for user prompts and displays results via message boxes.
+        Uses the UI for user prompts and displays results via message boxes.
+
+        The UI must provide prompt_action, prompt_amount and show_message; with
+        Tkinter this loop runs on a worker thread (see ui_bridge.run_game) so
+        it never blocks the Tk event loop.
+
+        Raises:
+            RuntimeError: If the game is headless, i.e. there is no UI to prompt.
         """
-        from tkinter import messagebox
-        if not hasattr(self, "ui"):
-            import tkinter as tk
-            self.ui = GameUI(tk._default_root)
-        print("Welcome to Simple Texas Hold'em!")
+        if not getattr(self.ui, "interactive", True):
+            raise RuntimeError("play_game() needs an interactive UI; use ui_bridge.run_game() "
+                               "or simulation.play_hands() for headless games.")
+        self.ui.announce("Welcome to Simple Texas Hold'em!")
         # Main loop - allow 'Play Again' when user wins the table.
         while True:
             # Remove players with 0 chips.
             self.players = [p for p in self.players if p.chips > 0]
             # Check if the human is the only remaining player.
             if len(self.players) == 1 and not self.players[0].is_ai:
-                messagebox.showinfo("Congratulations", 
+                self.ui.show_message("Congratulations", 
                     f"Congratulations {self.players[0].name}, you won the table!")
                 play_again = self.ui.prompt_action("Do you want to play again?", ["yes", "no"])
                 if play_again == "yes":
@@ -380,10 +474,10 @@ class Game:
                 else:
                     break
             elif not any(not p.is_ai for p in self.players):
-                messagebox.showinfo("Game Over", "Game over! All human players are out.")
+                self.ui.show_message("Game Over", "Game over! All human players are out.")
                 break
             self.play_round()
             cont = self.ui.prompt_action("Continue to next round?", ["yes", "no"])
             if cont != "yes":
                 break
-        messagebox.showinfo("Thanks", "Thanks for playing!")
\ No newline at end of file
+        self.ui.show_message("Thanks", "Thanks for playing!")
\ No newline at end of file
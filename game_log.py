@@ -0,0 +1,94 @@
+"""
+This module holds the model behind the game log panel.
+
+Messages are timestamped and queued until the UI drains them in one batch.
+The log counts the lines shown in the panel and tells the UI how many of the
+oldest to drop, so the panel never holds more than max_lines; the full
+history can be streamed to a file instead so long sessions use constant memory.
+"""
+
+import time
+import weakref
+
+def _close_spill(spill, pending):
+    # Runs at close(), garbage collection or interpreter exit, whichever is first.
+    if not spill.closed:
+        spill.write("".join(pending))
+        spill.close()
+    pending.clear()
+
+class GameLog:
+    """
+    Bounded, batched log of game messages.
+
+    Attributes:
+        max_lines (int): Number of lines kept in the panel.
+        shown (int): Lines currently in the panel.
+    """
+
+    def __init__(self, max_lines=200, spill_path=None):
+        """
+        Args:
+            max_lines (int): Visible line cap.
+            spill_path (str or None): File that receives every line ever logged.
+        """
+        self.max_lines = max_lines
+        self.shown = 0
+        self._pending = []
+        self._stamp_second = None
+        self._stamp = ""
+        self._spill = None
+        if spill_path:
+            self._spill = open(spill_path, "a", encoding="utf-8")
+            self._finalizer = weakref.finalize(self, _close_spill, self._spill, self._pending)
+
+    def _timestamp(self):
+        # Format the clock at most once per second rather than once per message.
+        now = int(time.time())
+        if now != self._stamp_second:
+            self._stamp_second = now
+            self._stamp = time.strftime("[%H:%M:%S] ", time.localtime(now))
+        return self._stamp
+
+    def append(self, message):
+        """
+        Queue a message.
+
+        Returns:
+            bool: True if this is the first message of a new batch, i.e. the
+            caller should schedule a drain.
+        """
+        self._pending.append(self._timestamp() + message + "\n")
+        return len(self._pending) == 1
+
+    def drain(self):
+        """
+        Take every queued line as one string and write it to the spill file.
+
+        Returns:
+            str: The queued lines joined together ("" if nothing is queued).
+        """
+        if not self._pending:
+            return ""
+        text = "".join(self._pending)
+        self.shown += len(self._pending)
+        self._pending.clear()
+        if self._spill is not None and not self._spill.closed:
+            self._spill.write(text)
+        return text
+
+    def take_overflow(self):
+        """
+        Return how many of the oldest panel lines to delete after a drain.
+
+        Returns:
+            int: Lines beyond max_lines, which the caller is expected to remove.
+        """
+        excess = max(self.shown - self.max_lines, 0)
+        self.shown -= excess
+        return excess
+
+    def close(self):
+        """Write any queued lines to the spill file and close it."""
+        if self._spill is not None:
+            self._finalizer()
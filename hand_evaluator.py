@@ -1,11 +1,34 @@
 """
 This module provides functions to evaluate Texas Hold'em poker hands.
-It determines combinations (e.g. flush, straight, full house) and returns
-tuples that include hand type and tie-breaking information.
+
+Hands are scored through precomputed lookup tables: every rank multiset of
+one to seven cards is keyed by the product of its rank primes, and every
+suited rank bit mask is keyed directly for flushes. A lookup yields a single
+integer strength (larger is better) laid out as ``category << 20`` followed by
+up to five 4-bit tie-breaking ranks. evaluate_hand() decodes that integer back
+into the tuples describing hand type and tie-breaking information.
 """
 
-from collections import Counter
-from card import HandRank
+from itertools import combinations
+from card import HandRank, code_rank
+
+# One prime per rank value (index 2..14) so a multiset of ranks has a unique product.
+RANK_PRIMES = (0, 0, 2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Per card code: the rank prime and the rank bit used in suit masks.
+_CODE_PRIMES = tuple(RANK_PRIMES[code_rank(code)] for code in range(52))
+_CODE_BITS = tuple(1 << code_rank(code) for code in range(52))
+
+CATEGORY_SHIFT = 20
+MAX_CARDS = 7
+
+# (rank bit mask, high card) of the ten straights, best first; the wheel (A-2-3-4-5) is last.
+STRAIGHTS = tuple((0b11111 << (high - 4), high) for high in range(14, 5, -1)) + \
+    ((1 << 14 | 0b1111 << 2, 5),)
+
+# Lazily built lookup tables: prime product -> strength, and suited rank mask -> strength.
+_PRODUCT_TABLE = {}
+_FLUSH_TABLE = []
 
 def is_straight(ranks):
     """
@@ -19,17 +42,11 @@ def is_straight(ranks):
         straight exists, and the second element is the highest rank in the 
         straight. Special case for A-2-3-4-5 is handled.
     """
-    unique_ranks = sorted(set(ranks))
-    if len(unique_ranks) < 5:
-        return False, None
-    for i in range(len(unique_ranks) - 4):
-        window = unique_ranks[i:i+5]
-        if window == list(range(window[0], window[0] + 5)):
-            return True, window[-1]
-    # Handle special A-2-3-4-5 straight.
-    if set([14, 2, 3, 4, 5]).issubset(ranks):
-        return True, 5
-    return False, None
+    mask = 0
+    for rank in ranks:
+        mask |= 1 << rank
+    high = _straight_high(mask)
+    return (True, high) if high else (False, None)
 
 def is_flush(cards):
     """
@@ -50,6 +67,179 @@ def is_flush(cards):
             return True, suit, sorted(values, reverse=True)
     return False, None, []
 
+def _straight_high(mask):
+    """Return the high card of the best straight in a rank bit mask, or 0."""
+    for straight, high in STRAIGHTS:
+        if mask & straight == straight:
+            return high
+    return 0
+
+def _pack(category, ranks):
+    """Pack a HandRank and up to five tie-breaking ranks into one integer."""
+    strength = category.value
+    for rank in (list(ranks) + [0] * 5)[:5]:
+        strength = (strength << 4) | rank
+    return strength
+
+def _score_groups(groups):
+    """
+    Score a rank multiset with no flush available.
+    
+    Args:
+        groups (List[Tuple[int, int]]): (rank, count) pairs sorted high-to-low by rank.
+    
+    Returns:
+        int: The packed strength of the best hand the ranks make.
+    """
+    ordered = sorted(groups, key=lambda x: (x[1], x[0]), reverse=True)
+    top_rank, top_count = ordered[0]
+    distinct = [r for r, _ in groups]
+    
+    def kickers(*exclude):
+        return [r for r in distinct if r not in exclude]
+    
+    if top_count == 4:
+        return _pack(HandRank.FOUR_OF_A_KIND, [top_rank] + kickers(top_rank)[:1])
+    if top_count == 3:
+        pair = next((r for r, c in ordered[1:] if c >= 2), None)
+        if pair is not None:
+            return _pack(HandRank.FULL_HOUSE, [top_rank, pair])
+    mask = 0
+    for rank in distinct:
+        mask |= 1 << rank
+    high = _straight_high(mask)
+    if high:
+        return _pack(HandRank.STRAIGHT, [high])
+    if top_count == 3:
+        return _pack(HandRank.THREE_OF_A_KIND, [top_rank] + kickers(top_rank)[:2])
+    if top_count == 2 and len(ordered) > 1 and ordered[1][1] == 2:
+        high_pair, low_pair = top_rank, ordered[1][0]
+        return _pack(HandRank.TWO_PAIR,
+                     [high_pair, low_pair] + kickers(high_pair, low_pair)[:1])
+    if top_count == 2:
+        return _pack(HandRank.PAIR, [top_rank] + kickers(top_rank)[:3])
+    return _pack(HandRank.HIGH_CARD, distinct[:5])
+
+def _score_flush(mask):
+    """Score the suited rank bit mask of a flush (five or more bits set)."""
+    high = _straight_high(mask)
+    if high == 14:
+        return _pack(HandRank.ROYAL_FLUSH, [high])
+    if high:
+        return _pack(HandRank.STRAIGHT_FLUSH, [high])
+    ranks = [r for r in range(14, 1, -1) if mask & (1 << r)]
+    return _pack(HandRank.FLUSH, ranks[:5])
+
+def _build_tables():
+    """
+    Populate the lookup tables on first use.
+    
+    The product table holds every rank multiset of one to seven cards (at most
+    four of each rank); the flush table is indexed by a suited rank bit mask
+    and holds 0 for masks with fewer than five ranks.
+    """
+    def walk(rank, remaining, product, groups):
+        if rank < 2 or remaining == 0:
+            if groups:
+                _PRODUCT_TABLE[product] = _score_groups(groups)
+            return
+        for count in range(min(4, remaining), -1, -1):
+            held = groups + [(rank, count)] if count else groups
+            walk(rank - 1, remaining - count, product * RANK_PRIMES[rank] ** count, held)
+    walk(14, MAX_CARDS, 1, [])
+    
+    flush_table = [0] * (1 << 15)
+    for size in range(5, 14):
+        for ranks in combinations(range(2, 15), size):
+            mask = 0
+            for rank in ranks:
+                mask |= 1 << rank
+            flush_table[mask] = _score_flush(mask)
+    _FLUSH_TABLE[:] = flush_table
+
+def lookup_tables():
+    """
+    Return the raw tables behind hand_strength_codes() for inlined hot loops.
+    
+    Returns:
+        tuple: (code_primes, code_bits, product_table, flush_table) where the
+        first two are indexed by card code, product_table maps a prime product
+        to a strength and flush_table maps a suited rank mask to a strength
+        (0 when the mask holds fewer than five ranks).
+    """
+    if not _FLUSH_TABLE:
+        _build_tables()
+    return _CODE_PRIMES, _CODE_BITS, _PRODUCT_TABLE, _FLUSH_TABLE
+
+def hand_strength(cards):
+    """
+    Score the best hand from one to seven cards as a single integer.
+    
+    Strengths are totally ordered: a larger value is a better hand and equal
+    values are tied hands. The category is recovered with
+    ``HandRank(strength >> CATEGORY_SHIFT)``.
+    
+    Args:
+        cards (List[Card]): List containing community and hole cards.
+    
+    Returns:
+        int: The packed hand strength.
+    """
+    return hand_strength_codes([card.code for card in cards])
+
+def hand_strength_codes(codes):
+    """
+    Score the best hand from one to seven card codes as a single integer.
+    
+    Args:
+        codes (Iterable[int]): Card codes (see card.card_to_int), e.g. an array('B').
+    
+    Returns:
+        int: The packed hand strength, as for hand_strength().
+    """
+    if not _FLUSH_TABLE:
+        _build_tables()
+    product = 1
+    suit_masks = [0, 0, 0, 0]
+    for code in codes:
+        product *= _CODE_PRIMES[code]
+        suit_masks[code & 3] |= _CODE_BITS[code]
+    # With seven or fewer cards a flush always outranks the best non-flush hand.
+    for mask in suit_masks:
+        strength = _FLUSH_TABLE[mask]
+        if strength:
+            return strength
+    return _PRODUCT_TABLE[product]
+
+def hand_category(strength):
+    """Return the HandRank encoded in a packed strength."""
+    return HandRank(strength >> CATEGORY_SHIFT)
+
+def strength_to_tuple(strength):
+    """
+    Decode a packed strength into the tuple returned by evaluate_hand().
+    
+    Args:
+        strength (int): A value produced by hand_strength().
+    
+    Returns:
+        tuple: A tuple representing the evaluated hand.
+    """
+    category = hand_category(strength)
+    ranks = [(strength >> shift) & 0xF for shift in (16, 12, 8, 4, 0)]
+    ranks = [r for r in ranks if r]
+    if category in (HandRank.ROYAL_FLUSH, HandRank.STRAIGHT_FLUSH, HandRank.STRAIGHT):
+        return (category, ranks[0])
+    if category in (HandRank.FOUR_OF_A_KIND, HandRank.FULL_HOUSE):
+        return (category,) + tuple(ranks)
+    if category == HandRank.THREE_OF_A_KIND:
+        return (category, ranks[0], ranks[1:])
+    if category == HandRank.TWO_PAIR:
+        return (category, (ranks[0], ranks[1])) + tuple(ranks[2:])
+    if category == HandRank.PAIR:
+        return (category, ranks[0], ranks[1:])
+    return (category, ranks)
+
 def evaluate_hand(cards):
     """
     Evaluate the best hand from a list of cards.
@@ -59,12 +249,14 @@ def evaluate_hand(cards):
       - Straight Flush / Royal Flush: (HandRank, highest_card)
       - Four of a Kind: (HandRank, quad_rank, kicker)
       - Full House: (HandRank, triple_rank, pair_rank)
-      - Flush: (HandRank, sorted_flush_cards)
+      - Flush: (HandRank, five_highest_flush_cards)
       - Straight: (HandRank, highest_card)
       - Three of a Kind: (HandRank, triple_rank, [kicker1, kicker2])
       - Two Pair: (HandRank, (high_pair, low_pair), kicker)
       - One Pair: (HandRank, pair_rank, [kicker1, kicker2, kicker3])
       - High Card: (HandRank, [five_highest_cards])
+    
+    Use hand_strength() directly where only ordering matters.
       
     Args:
         cards (List[Card]): List containing community and hole cards.
@@ -72,71 +264,4 @@ def evaluate_hand(cards):
     Returns:
         tuple: A tuple representing the evaluated hand.
     """
-    rank_list = [card.rank.value for card in cards]
-    rank_counts = Counter(rank_list)
-    counts = list(rank_counts.items())
-    counts.sort(key=lambda x: (x[1], x[0]), reverse=True)
-    
-    # Check for flush in the entire list of cards.
-    flush_found, flush_suit, flush_values = is_flush(cards)
-    
-    # Check for straight using all available card rank values.
-    has_straight, highest_straight = is_straight(rank_list)
-    
-    # Check for straight flush.
-    if flush_found:
-        flush_cards = [card for card in cards if card.suit == flush_suit]
-        flush_ranks = [card.rank.value for card in flush_cards]
-        has_sf, highest_sf = is_straight(flush_ranks)
-        if has_sf:
-            # Royal flush: Straight flush ending with Ace.
-            if highest_sf == 14:
-                return (HandRank.ROYAL_FLUSH, highest_sf)
-            return (HandRank.STRAIGHT_FLUSH, highest_sf)
-    
-    # Four of a Kind.
-    if counts[0][1] == 4:
-        quad = counts[0][0]
-        kicker = max([r for r in rank_list if r != quad])
-        return (HandRank.FOUR_OF_A_KIND, quad, kicker)
-    
-    # Full House: three-of-a-kind combined with a pair.
-    if counts[0][1] == 3:
-        triple = counts[0][0]
-        pair = None
-        for rank, cnt in counts[1:]:
-            if cnt >= 2:
-                pair = rank
-                break
-        if pair is not None:
-            return (HandRank.FULL_HOUSE, triple, pair)
-    
-    # Flush.
-    if flush_found:
-        return (HandRank.FLUSH, flush_values)
-    
-    # Straight.
-    if has_straight:
-        return (HandRank.STRAIGHT, highest_straight)
-    
-    # Three of a Kind.
-    if counts[0][1] == 3:
-        triple = counts[0][0]
-        kickers = sorted([r for r in rank_list if r != triple], reverse=True)[:2]
-        return (HandRank.THREE_OF_A_KIND, triple, kickers)
-    
-    # Two Pair.
-    if counts[0][1] == 2 and len(counts) > 1 and counts[1][1] == 2:
-        high_pair, low_pair = counts[0][0], counts[1][0]
-        kicker = max([r for r in rank_list if r not in (high_pair, low_pair)])
-        return (HandRank.TWO_PAIR, (high_pair, low_pair), kicker)
-    
-    # One Pair.
-    if counts[0][1] == 2:
-        pair = counts[0][0]
-        kickers = sorted([r for r in rank_list if r != pair], reverse=True)[:3]
-        return (HandRank.PAIR, pair, kickers)
-    
-    # High Card.
-    high_cards = sorted(rank_list, reverse=True)[:5]
-    return (HandRank.HIGH_CARD, high_cards)
+    return strength_to_tuple(hand_strength(cards))
@@ -0,0 +1,369 @@
+"""
+This module records played hands to a compact, append-only binary file and
+streams them back.
+
+File layout: magic b"PKHH", uint16 version, then any number of blocks. A
+block is a codec byte (0 raw, 1 zlib), a varint hand count, a varint payload
+length and the payload: that many hand records back to back. Hands never span
+blocks, so a reader holds one block in memory at a time and can skip whole
+blocks by their header alone; appending to an existing file just adds blocks.
+
+A hand record is, in order (all integers are unsigned LEB128 varints unless
+noted): seat count; dealer seat; small and big blind; per seat the name
+(length-prefixed UTF-8), starting stack and two hole-card bytes; the board as
+a count byte plus card bytes; the actions; then each seat's final stack.
+Cards are their card codes (see card.card_to_int), 0xFF for no card. Each
+action is one byte, seat << 4 | street << 2 | kind, followed by a varint
+amount for bets.
+"""
+
+import struct
+import zlib
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, NamedTuple, Tuple
+
+HISTORY_VERSION = 1
+HISTORY_MAGIC = b"PKHH"
+_HEADER = struct.Struct("<4sH")
+
+RAW, ZLIB = 0, 1
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+# Byte written for a missing hole card.
+NO_CARD = 0xFF
+
+# Action kinds; a bet covers blinds-free calls, bets and raises alike.
+FOLD, CHECK, BET = 0, 1, 2
+ACTION_NAMES = ("fold", "check", "bet")
+
+# Street of an action, from the number of board cards when it was taken.
+STREET_NAMES = ("preflop", "flop", "turn", "river")
+STREET_OF_BOARD = {0: 0, 3: 1, 4: 2, 5: 3}
+
+class Action(NamedTuple):
+    """
+    One betting decision (a tuple, as hands hold dozens of them).
+
+    Attributes:
+        seat (int): Index of the acting player in Game.players.
+        street (int): 0 preflop, 1 flop, 2 turn, 3 river.
+        kind (int): FOLD, CHECK or BET.
+        amount (int): Chips put in by a BET, 0 otherwise.
+    """
+    seat: int
+    street: int
+    kind: int
+    amount: int = 0
+
+@dataclass
+class HandRecord:
+    """
+    Everything needed to follow or replay one hand.
+
+    Attributes:
+        names (List[str]): Player names by seat.
+        stacks (List[int]): Chips per seat before the blinds.
+        dealer (int): Dealer seat for this hand.
+        small_blind (int): Small blind amount.
+        big_blind (int): Big blind amount.
+        hole_cards (List[Tuple[int, ...]]): Hole card codes per seat.
+        board (Tuple[int, ...]): Community card codes dealt.
+        actions (List[Action]): Decisions in the order they were taken; Game
+            records them as plain (seat, street, kind, amount) tuples.
+        final_stacks (List[int]): Chips per seat after the pot was awarded.
+    """
+    names: List[str]
+    stacks: List[int]
+    dealer: int
+    small_blind: int
+    big_blind: int
+    hole_cards: List[Tuple[int, ...]]
+    board: Tuple[int, ...]
+    actions: List[Action] = field(default_factory=list)
+    final_stacks: List[int] = field(default_factory=list)
+
+def _put_varint(out, value):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _get_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def encode_hand(out, hand):
+    """Append the binary form of a HandRecord to a bytearray."""
+    put = _put_varint
+    put(out, len(hand.names))
+    put(out, hand.dealer)
+    put(out, hand.small_blind)
+    put(out, hand.big_blind)
+    for name, stack, cards in zip(hand.names, hand.stacks, hand.hole_cards):
+        encoded = name.encode("utf-8")
+        put(out, len(encoded))
+        out += encoded
+        put(out, stack)
+        out.append(cards[0] if len(cards) > 0 else NO_CARD)
+        out.append(cards[1] if len(cards) > 1 else NO_CARD)
+    out.append(len(hand.board))
+    out += bytes(hand.board)
+    put(out, len(hand.actions))
+    for seat, street, kind, amount in hand.actions:
+        out.append(seat << 4 | street << 2 | kind)
+        if kind == BET:
+            put(out, amount)
+    for stack in hand.final_stacks:
+        put(out, stack)
+
+def decode_hand(data, pos=0):
+    """
+    Decode one hand record.
+
+    Returns:
+        Tuple[HandRecord, int]: The hand and the position just after it.
+    """
+    get = _get_varint
+    seats, pos = get(data, pos)
+    dealer, pos = get(data, pos)
+    small_blind, pos = get(data, pos)
+    big_blind, pos = get(data, pos)
+    names, stacks, hole_cards = [], [], []
+    for _ in range(seats):
+        length, pos = get(data, pos)
+        names.append(bytes(data[pos:pos + length]).decode("utf-8"))
+        pos += length
+        stack, pos = get(data, pos)
+        stacks.append(stack)
+        hole_cards.append(tuple(code for code in data[pos:pos + 2] if code != NO_CARD))
+        pos += 2
+    count = data[pos]
+    board = tuple(data[pos + 1:pos + 1 + count])
+    pos += 1 + count
+    num_actions, pos = get(data, pos)
+    actions = []
+    for _ in range(num_actions):
+        byte = data[pos]
+        pos += 1
+        kind = byte & 3
+        amount = 0
+        if kind == BET:
+            amount, pos = get(data, pos)
+        actions.append(Action(byte >> 4, byte >> 2 & 3, kind, amount))
+    final_stacks = []
+    for _ in range(seats):
+        stack, pos = get(data, pos)
+        final_stacks.append(stack)
+    hand = HandRecord(names, stacks, dealer, small_blind, big_blind,
+                      hole_cards, board, actions, final_stacks)
+    return hand, pos
+
+class HistoryWriter:
+    """
+    Buffered, append-only writer of hand records.
+
+    Hands are encoded into an in-memory block and written (optionally
+    zlib-compressed) once the block reaches block_size bytes, so recording
+    costs one small encode per hand and a file write every few hundred hands.
+    Use it as a context manager or call close() to write the last block.
+
+    Attributes:
+        path (str): File being appended to.
+        compress (bool): Whether blocks are zlib-compressed.
+        hands (int): Hands recorded by this writer.
+    """
+
+    def __init__(self, path, compress=False, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Args:
+            path (str): History file; created if missing, appended to otherwise.
+            compress (bool): Compress each block with zlib.
+            block_size (int): Uncompressed bytes buffered before a block is written.
+        """
+        self.path = path
+        self.compress = compress
+        self.block_size = block_size
+        self.hands = 0
+        self._block = bytearray()
+        self._block_hands = 0
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(HISTORY_MAGIC, HISTORY_VERSION))
+        else:
+            try:
+                read_header(path)
+            except ValueError:
+                self._file.close()
+                raise
+
+    def record(self, hand):
+        """Buffer one HandRecord, writing a block when the buffer is full."""
+        encode_hand(self._block, hand)
+        self._block_hands += 1
+        self.hands += 1
+        if len(self._block) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered hands as one block."""
+        if not self._block_hands:
+            return
+        payload = bytes(self._block)
+        codec = RAW
+        if self.compress:
+            payload = zlib.compress(payload)
+            codec = ZLIB
+        header = bytearray([codec])
+        _put_varint(header, self._block_hands)
+        _put_varint(header, len(payload))
+        self._file.write(header)
+        self._file.write(payload)
+        self._block.clear()
+        self._block_hands = 0
+
+    def close(self):
+        """Write any buffered hands and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def read_header(path):
+    """
+    Check a history file's header.
+
+    Raises:
+        ValueError: If the file is not a version HISTORY_VERSION hand history.
+    """
+    with open(path, "rb") as handle:
+        header = handle.read(_HEADER.size)
+    magic, version = _HEADER.unpack(header) if len(header) == _HEADER.size else (b"", 0)
+    if magic != HISTORY_MAGIC or version != HISTORY_VERSION:
+        raise ValueError(f"{path} is not a version {HISTORY_VERSION} hand history.")
+
+def _read_varint(handle):
+    result = shift = 0
+    while True:
+        byte = handle.read(1)
+        if not byte:
+            raise EOFError
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+def iter_blocks(handle):
+    """
+    Walk the blocks of an open history file positioned after its header.
+
+    Yields:
+        Tuple[int, int, int, int]: (offset, codec, hand count, payload length)
+        of each block, with the file positioned at the start of its payload.
+        A caller that does not read the payload is moved past it.
+    """
+    while True:
+        offset = handle.tell()
+        codec = handle.read(1)
+        if not codec:
+            return
+        count = _read_varint(handle)
+        length = _read_varint(handle)
+        payload_start = handle.tell()
+        yield offset, codec[0], count, length
+        handle.seek(payload_start + length)
+
+def decode_block(codec, payload):
+    """Return the raw hand records of a block payload."""
+    return zlib.decompress(payload) if codec == ZLIB else payload
+
+def read_history(path):
+    """
+    Stream every hand from a history file.
+
+    Only one block is held in memory at a time, so files with millions of
+    hands can be scanned in constant memory.
+
+    Yields:
+        HandRecord: Each hand in the order it was recorded.
+    """
+    read_header(path)
+    with open(path, "rb") as handle:
+        handle.seek(_HEADER.size)
+        for _, codec, count, length in iter_blocks(handle):
+            data = decode_block(codec, handle.read(length))
+            pos = 0
+            for _ in range(count):
+                hand, pos = decode_hand(data, pos)
+                yield hand
+
+class HistoryIndex:
+    """
+    Block offsets of a history file, for jumping straight to hand N.
+
+    Building the index reads only block headers and seeks past every payload,
+    so it is fast even for very large files. Reading hand N then decodes a
+    single block.
+
+    Attributes:
+        path (str): The indexed file.
+        hands (int): Number of hands in the file.
+    """
+
+    def __init__(self, path):
+        read_header(path)
+        self.path = path
+        self._first_hands = []  # Number of the first hand in each block.
+        self._blocks = []  # (payload offset, codec, hand count, payload length)
+        self.hands = 0
+        with open(path, "rb") as handle:
+            handle.seek(_HEADER.size)
+            for _, codec, count, length in iter_blocks(handle):
+                self._first_hands.append(self.hands)
+                self._blocks.append((handle.tell(), codec, count, length))
+                self.hands += count
+
+    def __len__(self):
+        return self.hands
+
+    def __getitem__(self, number):
+        """Return hand number (0-based) as a HandRecord."""
+        if not 0 <= number < self.hands:
+            raise IndexError(f"hand {number} is not in {self.path}")
+        return next(self.read(number, number + 1))
+
+    def read(self, start=0, stop=None):
+        """
+        Stream hands start..stop-1 without decoding the blocks before start.
+
+        Yields:
+            HandRecord: Each hand in the range, in order.
+        """
+        stop = self.hands if stop is None else min(stop, self.hands)
+        if start >= stop:
+            return
+        block = bisect_right(self._first_hands, start) - 1
+        number = self._first_hands[block]
+        with open(self.path, "rb") as handle:
+            for offset, codec, count, length in self._blocks[block:]:
+                handle.seek(offset)
+                data = decode_block(codec, handle.read(length))
+                pos = 0
+                for _ in range(count):
+                    hand, pos = decode_hand(data, pos)
+                    if number >= start:
+                        yield hand
+                    number += 1
+                    if number >= stop:
+                        return
@@ -1,6 +1,6 @@
 """
 Main entry point for the Poker Game application.
-Initializes the UI and starts the game loop.
+Initializes the UI and starts the game loop on a worker thread.
 """
 
 try:
@@ -10,7 +10,9 @@ except ModuleNotFoundError:
     print("Error: tkinter module not found. Install Tcl/Tk support (e.g., by installing Python from python.org or 'brew install tcl-tk').")
     exit(1)
 
+from ai import DECISION_DEADLINE
 from game import Game
+from ui_bridge import run_game
 
 if __name__ == "__main__":
     # Initialize Tkinter and show a dialog for player's name.
@@ -19,7 +21,8 @@ if __name__ == "__main__":
     player_name = simpledialog.askstring("Player Name", "Enter your name:")
     if not player_name:
         player_name = "Player"
-    # Instantiate and start the game.
-    game = Game(player_name=player_name)
-    game.play_game()
-    root.mainloop()  # Keeps the Tkinter window open
\ No newline at end of file
+    # Play on a worker thread; the Tk event loop below stays free to redraw,
+    # animate and answer prompts until the game ends and closes the window.
+    game = Game(player_name=player_name, ai_deadline=DECISION_DEADLINE)
+    run_game(game, root)
+    root.mainloop()
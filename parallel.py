@@ -0,0 +1,142 @@
+"""
+This module runs CPU-bound equity and simulation jobs across a process pool.
+
+Work is cut into fixed-size shards before it reaches the pool, and every
+shard draws from its own random stream derived from (seed, shard index).
+Shards are merged in index order, so a given seed produces the same merged
+result whether it runs on one worker or many. Card data crosses the process
+boundary as bytes of card codes rather than pickled Card objects.
+"""
+
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from equity import EquityTally, prepare_spot, sample_equity
+from hand_evaluator import lookup_tables
+
+DEFAULT_SHARD_SIZE = 10000
+
+# Byte used in place of hole cards for a player whose hand is unknown.
+UNKNOWN_CARD = 0xFF
+
+def shard_seed(seed, index):
+    """
+    Derive the seed of one shard's random stream.
+
+    Args:
+        seed (int): The job's base seed.
+        index (int): Position of the shard within the job.
+
+    Returns:
+        int: A 64-bit seed independent of the number of workers.
+    """
+    digest = hashlib.sha256(f"{seed}:{index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+def shard_sizes(total, shard_size):
+    """Split total iterations into shards of shard_size (the last may be short)."""
+    return [min(shard_size, total - start) for start in range(0, total, shard_size)]
+
+def run_shards(worker, jobs, workers=None, stop=None):
+    """
+    Run shard jobs and yield their results in job order.
+
+    Args:
+        worker (Callable): Top-level (picklable) function applied to each job.
+        jobs (List): Job arguments, one per shard.
+        workers (int or None): Process count; 1 runs in-process, None uses all CPUs.
+        stop (Callable or None): Called with each result in order; returning True
+            stops the run and discards shards still in flight.
+
+    Yields:
+        The result of each shard, in the order of jobs.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            result = worker(job)
+            yield result
+            if stop and stop(result):
+                return
+        return
+    # Build the lookup tables before forking so workers inherit them; spawned
+    # workers build their own through the initializer.
+    lookup_tables()
+    with ProcessPoolExecutor(max_workers=workers, initializer=lookup_tables) as pool:
+        wave = workers * 2
+        for start in range(0, len(jobs), wave):
+            for result in pool.map(worker, jobs[start:start + wave]):
+                yield result
+                if stop and stop(result):
+                    return
+
+def encode_spot(holes, board, stub):
+    """Pack code tuples from prepare_spot() into bytes for a worker."""
+    hole_bytes = bytes(code for hand in holes for code in (hand or (UNKNOWN_CARD, UNKNOWN_CARD)))
+    return hole_bytes, bytes(board), bytes(stub)
+
+def decode_spot(hole_bytes, board_bytes, stub_bytes):
+    """Unpack the bytes produced by encode_spot()."""
+    holes = []
+    for i in range(0, len(hole_bytes), 2):
+        hand = tuple(hole_bytes[i:i + 2])
+        holes.append(() if hand[0] == UNKNOWN_CARD else hand)
+    return holes, tuple(board_bytes), list(stub_bytes)
+
+def equity_shard(job):
+    """
+    Sample one shard of an equity job.
+
+    Args:
+        job (tuple): (hole_bytes, board_bytes, stub_bytes, iterations, seed).
+
+    Returns:
+        EquityTally: Counts for this shard alone.
+    """
+    hole_bytes, board_bytes, stub_bytes, iterations, seed = job
+    holes, board, stub = decode_spot(hole_bytes, board_bytes, stub_bytes)
+    tally = EquityTally(len(holes))
+    sample_equity(tally, holes, board, stub, iterations, random.Random(seed))
+    return tally
+
+def parallel_equity(hole_cards_per_player, board=(), dead_cards=(), iterations=100000,
+                    seed=None, workers=None, shard_size=DEFAULT_SHARD_SIZE,
+                    target_stderr=None):
+    """
+    Estimate equities like equity.equity(), sharded across processes.
+
+    The result depends only on the arguments and seed, never on the number
+    of workers. With target_stderr, shards are merged in order and the run
+    stops after the first shard at which every standard error is low enough.
+
+    Args:
+        hole_cards_per_player (List[List[Card]]): Hole cards for each player;
+            an empty list stands for an unknown hand dealt at random.
+        board (List[Card]): Community cards already dealt (0 to 5).
+        dead_cards (List[Card]): Cards known to be out of play.
+        iterations (int): Maximum number of runouts to sample.
+        seed (int or None): Base seed; None picks one at random.
+        workers (int or None): Process count; None uses every CPU.
+        shard_size (int): Runouts per shard.
+        target_stderr (float or None): Stop once all standard errors reach this.
+
+    Returns:
+        EquityResult: Win/tie/loss fractions and equity intervals per player.
+    """
+    holes, board, stub = prepare_spot(hole_cards_per_player, board, dead_cards)
+    if seed is None:
+        seed = random.getrandbits(64)
+    hole_bytes, board_bytes, stub_bytes = encode_spot(holes, board, stub)
+    jobs = [(hole_bytes, board_bytes, stub_bytes, size, shard_seed(seed, index))
+            for index, size in enumerate(shard_sizes(iterations, shard_size))]
+    merged = EquityTally(len(holes))
+
+    def reached_target(tally):
+        merged.merge(tally)
+        return target_stderr is not None and \
+            all(merged.stderr(i) <= target_stderr for i in range(merged.num_players))
+
+    for _ in run_shards(equity_shard, jobs, workers, stop=reached_target):
+        pass
+    return merged.result()
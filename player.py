@@ -3,8 +3,8 @@ This module defines the Player class which holds player-related information,
 including name, hand, chip count, and status flags.
 """
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
 from card import Card
 
 @dataclass
@@ -19,6 +19,9 @@ class Player:
         is_ai (bool): Flag indicating if player is an AI.
         folded (bool): Flag indicating if player has folded.
         current_bet (int): Amount currently bet in the round.
+        total_bet (int): Amount put into the pot over the whole hand.
+        strategy (Callable or None): Optional decision callback, called as
+            strategy(game, player), that replaces the default AI or human prompt.
     """
     name: str
     hand: List[Card]
@@ -26,6 +29,8 @@ class Player:
     is_ai: bool
     folded: bool = False
     current_bet: int = 0
+    total_bet: int = 0
+    strategy: Optional[Callable] = field(default=None, repr=False, compare=False)
     
     def __str__(self):
         return f"{self.name} ({self.chips} chips)"
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+This module splits a hand's pot into side pots by player contribution and
+awards each one to the best eligible hand.
+
+Pots are layered at every distinct amount put in by a player still in the
+hand, so an all-in player can only win what each opponent matched. Seats are
+identified by their index in Game.players.
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+@dataclass
+class SidePot:
+    """
+    One layer of the pot.
+
+    Attributes:
+        amount (int): Chips in this layer.
+        eligible (List[int]): Seats still in the hand that contributed to this
+            layer in full, in seat order.
+    """
+    amount: int
+    eligible: List[int]
+
+def build_side_pots(contributions, folded):
+    """
+    Layer the chips put in this hand into a main pot and side pots.
+
+    Chips from folded players count towards the layers they reached, and any
+    folded chips above the largest live contribution join the last layer.
+
+    Args:
+        contributions (List[int]): Chips each seat put in this hand.
+        folded (List[bool]): Whether each seat has folded.
+
+    Returns:
+        List[SidePot]: The main pot first, then each side pot.
+    """
+    live = [i for i, is_folded in enumerate(folded) if not is_folded]
+    levels = sorted({contributions[i] for i in live if contributions[i] > 0})
+    pots = []
+    previous = 0
+    for level in levels:
+        amount = sum(min(c, level) - min(c, previous) for c in contributions)
+        eligible = [i for i in live if contributions[i] >= level]
+        pots.append(SidePot(amount, eligible))
+        previous = level
+    leftover = sum(contributions) - sum(pot.amount for pot in pots)
+    if not pots:
+        pots.append(SidePot(leftover, live))
+    elif leftover:
+        pots[-1].amount += leftover
+    return pots
+
+def award_side_pots(pots, strengths):
+    """
+    Resolve every pot from a single ranking of hand strengths.
+
+    Contenders are sorted once by strength; each pot goes to the leading
+    eligible seats in that order. Odd chips from a split go to the first
+    winner in seat order.
+
+    Args:
+        pots (List[SidePot]): Pots from build_side_pots().
+        strengths (Dict[int, int]): Hand strength per contending seat.
+
+    Returns:
+        Dict[int, int]: Chips won per seat.
+    """
+    ranked = sorted(strengths, key=strengths.get, reverse=True)
+    payouts = {}
+    for pot in pots:
+        eligible = set(pot.eligible)
+        winners = []
+        for seat in ranked:
+            if seat not in eligible:
+                continue
+            if winners and strengths[seat] != strengths[winners[0]]:
+                break
+            winners.append(seat)
+        winners.sort()
+        share, remainder = divmod(pot.amount, len(winners))
+        for seat in winners:
+            payouts[seat] = payouts.get(seat, 0) + share
+        payouts[winners[0]] += remainder
+    return payouts
@@ -0,0 +1,154 @@
+"""
+This module provides preflop equities for the 169 canonical starting hands.
+
+Starting hands are indexed on the usual 13x13 grid: pairs on the diagonal,
+suited hands above it and offsuit hands below, so a hand's class is found
+in O(1) from its two ranks and whether they share a suit. Equities against
+1 to 8 random opponents are precomputed by running this module as a script
+and stored in a small versioned binary file that is loaded on first use.
+
+File layout (little-endian): magic b"PFEQ", uint16 version, uint16 number of
+player counts, one uint16 per player count, then for each of the 169 classes
+one uint16 equity per player count in units of 1/65535.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from card import Card, Rank, Suit
+
+TABLE_VERSION = 1
+TABLE_MAGIC = b"PFEQ"
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_equity.bin")
+PLAYER_COUNTS = tuple(range(2, 10))
+NUM_CLASSES = 169
+EQUITY_SCALE = 65535
+
+RANK_CHARS = "23456789TJQKA"
+
+# Loaded table: player count -> column offset, and the flat equity array.
+_COLUMNS = {}
+_EQUITIES = array("H")
+
+def hand_class(card1, card2):
+    """
+    Return the 0..168 class index of two hole cards.
+
+    Row and column are counted from the ace down; suited hands put the higher
+    rank in the row, offsuit hands put it in the column.
+    """
+    high, low = card1.rank.value, card2.rank.value
+    if high < low:
+        high, low = low, high
+    if card1.suit == card2.suit:
+        return (14 - high) * 13 + (14 - low)
+    return (14 - low) * 13 + (14 - high)
+
+def hand_class_name(index):
+    """Return the conventional name of a class, e.g. "AKs", "T9o" or "77"."""
+    row, col = divmod(index, 13)
+    if row == col:
+        return RANK_CHARS[12 - row] * 2
+    if row < col:
+        return RANK_CHARS[12 - row] + RANK_CHARS[12 - col] + "s"
+    return RANK_CHARS[12 - col] + RANK_CHARS[12 - row] + "o"
+
+def class_representative(index):
+    """Return one concrete pair of hole cards belonging to a class."""
+    row, col = divmod(index, 13)
+    high, low = Rank(14 - min(row, col)), Rank(14 - max(row, col))
+    second_suit = Suit.HEARTS if row < col else Suit.DIAMONDS
+    return [Card(high, Suit.HEARTS), Card(low, second_suit)]
+
+def load_table(path=TABLE_PATH):
+    """
+    Read an equity table file into memory.
+
+    Raises:
+        ValueError: If the file is not an equity table of TABLE_VERSION.
+    """
+    with open(path, "rb") as handle:
+        data = handle.read()
+    magic, version, num_counts = struct.unpack_from("<4sHH", data)
+    if magic != TABLE_MAGIC or version != TABLE_VERSION:
+        raise ValueError(f"{path} is not a version {TABLE_VERSION} preflop equity table; "
+                         "regenerate it with 'python preflop.py'.")
+    offset = struct.calcsize("<4sHH")
+    counts = struct.unpack_from(f"<{num_counts}H", data, offset)
+    offset += 2 * num_counts
+    equities = array("H")
+    equities.frombytes(data[offset:offset + 2 * NUM_CLASSES * num_counts])
+    if sys.byteorder == "big":
+        equities.byteswap()
+    _COLUMNS.clear()
+    _COLUMNS.update((count, column) for column, count in enumerate(counts))
+    _EQUITIES[:] = equities
+
+def preflop_equity(card1, card2, num_players=2):
+    """
+    Look up the equity of two hole cards against random opponents.
+
+    The table is loaded from TABLE_PATH on the first call. Player counts
+    beyond the table are clamped to the nearest one available.
+
+    Args:
+        card1 (Card): First hole card.
+        card2 (Card): Second hole card.
+        num_players (int): Players in the hand, including this one.
+
+    Returns:
+        float: Expected share of the pot at showdown (0..1).
+    """
+    if not _EQUITIES:
+        load_table()
+    num_players = min(max(num_players, min(_COLUMNS)), max(_COLUMNS))
+    index = hand_class(card1, card2) * len(_COLUMNS) + _COLUMNS[num_players]
+    return _EQUITIES[index] / EQUITY_SCALE
+
+def generate_table(iterations, seed=0, workers=None, player_counts=PLAYER_COUNTS):
+    """
+    Compute the equity of every class against random opponents.
+
+    Args:
+        iterations (int): Runouts sampled per class and player count.
+        seed (int): Base seed; each cell derives its own from it.
+        workers (int or None): Process count passed to parallel_equity().
+        player_counts (Iterable[int]): Table sizes to compute.
+
+    Returns:
+        array: Equities in units of 1/EQUITY_SCALE, class-major.
+    """
+    # Only the offline generator needs the sampler; loading the table does not.
+    from parallel import parallel_equity
+    equities = array("H")
+    for index in range(NUM_CLASSES):
+        hole_cards = class_representative(index)
+        for count in player_counts:
+            result = parallel_equity([hole_cards] + [[]] * (count - 1), iterations=iterations,
+                                     seed=seed * 1000 + index * 16 + count, workers=workers)
+            equities.append(round(result.players[0].equity * EQUITY_SCALE))
+    return equities
+
+def write_table(equities, path=TABLE_PATH, player_counts=PLAYER_COUNTS):
+    """Write equities from generate_table() in the versioned file format."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    body = array("H", equities)
+    if sys.byteorder == "big":
+        body.byteswap()
+    with open(path, "wb") as handle:
+        handle.write(struct.pack("<4sHH", TABLE_MAGIC, TABLE_VERSION, len(player_counts)))
+        handle.write(struct.pack(f"<{len(player_counts)}H", *player_counts))
+        handle.write(body.tobytes())
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the preflop equity table.")
+    parser.add_argument("--iterations", type=int, default=20000,
+                        help="runouts per starting hand and player count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=TABLE_PATH)
+    args = parser.parse_args()
+    write_table(generate_table(args.iterations, args.seed, args.workers), args.output)
+    print(f"Wrote {args.output}")
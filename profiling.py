@@ -0,0 +1,169 @@
+"""
+This module provides opt-in timing instrumentation for a Game.
+
+GameProfiler.attach() wraps the game's dealing, betting, decision,
+evaluation and UI methods on that one instance, and play_round() marks each
+phase (PRE_FLOP, FLOP, TURN, RIVER, SHOWDOWN) when a profiler is attached.
+A game without a profiler runs the plain methods and pays one None check per
+phase, so instrumentation costs nothing measurable unless it is switched on.
+
+Timings nest: a betting round contains the decisions made in it, and each
+span's self time excludes its children. Results can be printed as a table,
+saved as Chrome trace-event JSON (chrome://tracing, Perfetto) or saved in the
+cProfile/pstats format for pstats, snakeviz and similar tools.
+"""
+
+import json
+import marshal
+import os
+from time import perf_counter_ns
+
+# Game methods timed per component.
+COMPONENTS = {
+    "create_deck": "deal",
+    "deal_cards": "deal",
+    "deal_flop": "deal",
+    "deal_turn_or_river": "deal",
+    "betting_round": "betting_round",
+    "decide": "decision",
+    "hand_strengths": "evaluate",
+}
+PHASES = ("PRE_FLOP", "FLOP", "TURN", "RIVER", "SHOWDOWN")
+UI_METHODS = ("display_player_hand", "display_ai_hands", "display_community_cards",
+              "flush", "announce", "append_log")
+
+class _TimedUI:
+    """Forwards to a game's UI, timing the display and log calls."""
+
+    def __init__(self, ui, profiler):
+        self.wrapped = ui
+        for name in UI_METHODS:
+            if hasattr(ui, name):
+                setattr(self, name, profiler.wrap(getattr(ui, name), "ui_update"))
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped, name)
+
+class GameProfiler:
+    """
+    Collects nested wall-time spans for games it is attached to.
+
+    Attributes:
+        stats (Dict[str, list]): Span name -> [calls, total ns, self ns].
+        events (List[tuple]): (name, start ns, duration ns) of the first
+            max_events spans, for trace export.
+    """
+
+    def __init__(self, max_events=1_000_000):
+        """
+        Args:
+            max_events (int): Spans kept individually for the trace export;
+                later spans still count towards stats.
+        """
+        self.max_events = max_events
+        self.stats = {}
+        self.callers = {}  # (caller name, name) -> [calls, total ns, self ns]
+        self.events = []
+        self._stack = []  # [name, start ns, child ns] per open span
+        self._origin = perf_counter_ns()
+
+    def begin(self, name):
+        """Open a span; spans opened before it is closed become its children."""
+        self._stack.append([name, perf_counter_ns(), 0])
+
+    def end(self):
+        """Close the most recently opened span."""
+        now = perf_counter_ns()
+        name, start, child = self._stack.pop()
+        duration = now - start
+        own = duration - child
+        caller = None
+        if self._stack:
+            parent = self._stack[-1]
+            parent[2] += duration
+            caller = parent[0]
+        for table, key in ((self.stats, name), (self.callers, (caller, name))):
+            entry = table.get(key)
+            if entry is None:
+                table[key] = [1, duration, own]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+                entry[2] += own
+        if len(self.events) < self.max_events:
+            self.events.append((name, start, duration))
+
+    def wrap(self, func, name):
+        """Return func timed as a span called name."""
+        begin, end = self.begin, self.end
+        def timed(*args, **kwargs):
+            begin(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end()
+        return timed
+
+    def attach(self, game):
+        """
+        Instrument one game: its rounds, phases, components and UI calls.
+
+        Returns:
+            GameProfiler: self, for chaining.
+        """
+        game.profiler = self
+        game.play_round = self.wrap(game.play_round, "round")
+        for method, component in COMPONENTS.items():
+            setattr(game, method, self.wrap(getattr(game, method), component))
+        game.ui = _TimedUI(game.ui, self)
+        return self
+
+    def detach(self, game):
+        """Remove the instrumentation added by attach()."""
+        game.profiler = None
+        for method in ("play_round", *COMPONENTS):
+            game.__dict__.pop(method, None)
+        if isinstance(game.ui, _TimedUI):
+            game.ui = game.ui.wrapped
+
+    def summary(self):
+        """
+        Format the collected stats as a table, slowest total first.
+
+        Returns:
+            str: One row per span name with calls, total, self and mean time.
+        """
+        rows = [f"{'span':<18}{'calls':>10}{'total ms':>12}{'self ms':>12}{'mean us':>11}"]
+        ordered = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (calls, total, own) in ordered:
+            rows.append(f"{name:<18}{calls:>10}{total / 1e6:>12.2f}{own / 1e6:>12.2f}"
+                        f"{total / calls / 1e3:>11.2f}")
+        return "\n".join(rows)
+
+    def write_chrome_trace(self, path):
+        """Save the recorded spans as Chrome trace-event JSON."""
+        pid = os.getpid()
+        events = [{"name": name, "cat": "phase" if name in PHASES else "component",
+                   "ph": "X", "pid": pid, "tid": 0,
+                   "ts": (start - self._origin) / 1e3, "dur": duration / 1e3}
+                  for name, start, duration in self.events]
+        with open(path, "w") as handle:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, handle)
+
+    def write_pstats(self, path):
+        """
+        Save the stats in the marshal format read by pstats.Stats(path).
+
+        Each span name appears as a function in the file "game"; callers are
+        the spans it was opened inside.
+        """
+        def key(name):
+            return ("game", 0, name)
+        stats = {}
+        for name, (calls, total, own) in self.stats.items():
+            callers = {key(caller): (c, c, o / 1e9, t / 1e9)
+                       for (caller, callee), (c, t, o) in self.callers.items()
+                       if callee == name and caller is not None}
+            stats[key(name)] = (calls, calls, own / 1e9, total / 1e9, callers)
+        with open(path, "wb") as handle:
+            marshal.dump(stats, handle)
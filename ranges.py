@@ -0,0 +1,451 @@
+"""
+This module models each opponent's holdings as a weighted range over the
+1326 two-card combos and computes range equities with NumPy.
+
+A Range starts uniform and is narrowed by every decision the player makes:
+each combo's weight is multiplied by how likely that combo was to take the
+action, judged from its strength percentile on the current board (preflop,
+from the preflop equity table). Bets and raises favour strong combos, the
+more so the larger they are; calls favour them less; checks lean towards
+weaker combos. Folded players drop out.
+
+Equity is computed for every combo at once. The combos of every runout
+(one on the river; enumerated or sampled board completions before it) are
+scored in one batch_strength() call. Per runout they are sorted, each hero
+combo's wins and ties against the villain range are found with a cumulative
+sum and a binary search, and the villain combos that share a card with it
+(the 101 combos holding either of its cards) are subtracted through the
+per-card CARD_COMBOS table, so card removal is exact without a 1326 x 1326
+loop.
+
+RangeTracker.attach() keeps a range per player of a Game up to date, and
+the AI then uses range equity postflop (see ai.make_betting_decision).
+"""
+
+import math
+import random
+import time
+from itertools import combinations
+import numpy as np
+from card import CARDS, card_code
+from batch_evaluator import batch_strength
+from preflop import preflop_equity
+
+NUM_COMBOS = 1326
+# Combo index -> its two card codes, lowest first.
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int32)
+# (card, card) -> combo index, -1 on the diagonal.
+COMBO_INDEX = np.full((52, 52), -1, dtype=np.int32)
+COMBO_INDEX[COMBOS[:, 0], COMBOS[:, 1]] = np.arange(NUM_COMBOS)
+COMBO_INDEX[COMBOS[:, 1], COMBOS[:, 0]] = np.arange(NUM_COMBOS)
+# Card -> the 51 combos holding it.
+CARD_COMBOS = np.array([np.sort(np.delete(COMBO_INDEX[card], card)) for card in range(52)])
+
+# Runouts a postflop equity query without a deadline averages over at most
+# before the river.
+DEFAULT_RUNOUTS = 8
+# Weight left on the least likely combos after an action, so a range never
+# rules a holding out on betting alone.
+MIN_LIKELIHOOD = 0.05
+
+_PREFLOP_PERCENTILES = []
+
+def combo_index(card1, card2):
+    """Return the combo index of two hole cards."""
+    return int(COMBO_INDEX[card_code(card1), card_code(card2)])
+
+def combo_name(index):
+    """Return a combo as text, e.g. "A♠ K♥"."""
+    first, second = COMBOS[index]
+    return f"{CARDS[second]} {CARDS[first]}"
+
+def blocked(cards):
+    """Return a bool mask of the combos that hold any of the given cards."""
+    mask = np.zeros(NUM_COMBOS, dtype=bool)
+    for card in cards:
+        mask[CARD_COMBOS[card_code(card)]] = True
+    return mask
+
+def board_strengths(boards):
+    """
+    Score every combo with each of several boards of the same size, in one
+    batch_strength() call.
+
+    Args:
+        boards (List[List[Card or int]]): Boards of three to five cards.
+
+    Returns:
+        numpy.ndarray: (len(boards), 1326) int64 strengths (see
+        hand_strength()), -1 for combos that share a card with their board.
+    """
+    codes = np.array([[card_code(card) for card in board] for board in boards], dtype=np.int32)
+    live = np.ones((len(codes), NUM_COMBOS), dtype=bool)
+    for column in codes.T:
+        for row, card in enumerate(column):
+            live[row, CARD_COMBOS[card]] = False
+    board_of, combo = np.nonzero(live)
+    rows = np.empty((len(combo), 2 + codes.shape[1]), dtype=np.int32)
+    rows[:, :2] = COMBOS[combo]
+    rows[:, 2:] = codes[board_of]
+    strengths = np.full(live.shape, -1, dtype=np.int64)
+    strengths[live] = batch_strength(rows)
+    return strengths
+
+def combo_strengths(board):
+    """Score every combo with one board; see board_strengths()."""
+    return board_strengths([board])[0]
+
+def _percentiles(scores, live):
+    """Fraction of live combos scoring at most each combo's score (0 for dead ones)."""
+    ordered = np.sort(scores[live])
+    result = np.searchsorted(ordered, scores, side="right") / len(ordered)
+    result[~live] = 0.0
+    return result
+
+def hand_percentiles(board):
+    """
+    Rank every combo by strength on a board, as a fraction in (0, 1].
+
+    Preflop the ranking is by heads-up equity from the preflop table;
+    postflop it is by the made hand with the board so far.
+
+    Returns:
+        numpy.ndarray: Percentile per combo; 1.0 is the best. Combos that
+        share a card with the board get 0.
+    """
+    if not board:
+        if not _PREFLOP_PERCENTILES:
+            equities = np.array([preflop_equity(CARDS[a], CARDS[b], 2) for a, b in COMBOS])
+            _PREFLOP_PERCENTILES.append(_percentiles(equities, np.ones(NUM_COMBOS, dtype=bool)))
+        return _PREFLOP_PERCENTILES[0]
+    strengths = combo_strengths(board)
+    return _percentiles(strengths, strengths >= 0)
+
+def action_likelihood(kind, percentiles, size=0.0):
+    """
+    Return how likely each combo was to take an action.
+
+    Args:
+        kind (str): "check", "call" or "raise" (bets count as raises).
+        percentiles (numpy.ndarray): Strength percentile per combo.
+        size (float): For raises, chips put in relative to the pot before
+            them; larger raises favour strong combos more.
+
+    Returns:
+        numpy.ndarray: Likelihood per combo, between MIN_LIKELIHOOD and 1.
+    """
+    if kind == "check":
+        likelihood = 1.0 - 0.6 * percentiles ** 2
+    elif kind == "call":
+        likelihood = 0.25 + 0.75 * percentiles
+    elif kind == "raise":
+        likelihood = percentiles ** (1.0 + 2.0 * min(size, 1.0))
+    else:
+        raise ValueError(f"Unknown action {kind!r}.")
+    return np.maximum(likelihood, MIN_LIKELIHOOD)
+
+class Range:
+    """
+    Weighted set of the hole-card combos a player may hold.
+
+    Attributes:
+        weights (numpy.ndarray): Non-negative float64 weight per combo; only
+            ratios matter.
+    """
+
+    def __init__(self, weights=None):
+        """
+        Args:
+            weights (array-like or None): Weight per combo; defaults to every
+                combo equally likely.
+        """
+        self.weights = np.ones(NUM_COMBOS) if weights is None else np.array(weights, dtype=np.float64)
+
+    @classmethod
+    def hand(cls, card1, card2):
+        """Return the range holding exactly one combo."""
+        weights = np.zeros(NUM_COMBOS)
+        weights[combo_index(card1, card2)] = 1.0
+        return cls(weights)
+
+    def copy(self):
+        return Range(self.weights)
+
+    def remove(self, cards):
+        """Drop the combos holding any of the cards, e.g. the board."""
+        self.weights[blocked(cards)] = 0.0
+
+    def narrow(self, kind, percentiles, size=0.0):
+        """Reweight the range by the likelihood of an action (see action_likelihood())."""
+        self.weights *= action_likelihood(kind, percentiles, size)
+
+    def probabilities(self, dead=()):
+        """
+        Return the chance of each combo, excluding those holding dead cards.
+
+        Raises:
+            ValueError: If no combo is left.
+        """
+        weights = self.weights.copy()
+        weights[blocked(dead)] = 0.0
+        total = weights.sum()
+        if total <= 0:
+            raise ValueError("The range holds no combos.")
+        return weights / total
+
+    def top(self, count=10, dead=()):
+        """Return the count most likely combos as (name, probability) pairs."""
+        chances = self.probabilities(dead)
+        order = np.argsort(-chances, kind="stable")[:count]
+        return [(combo_name(index), float(chances[index])) for index in order if chances[index] > 0]
+
+def _versus(strengths, villain_weights, rows):
+    """
+    Weigh hero combos against a villain range on a complete board.
+
+    Args:
+        strengths (numpy.ndarray): combo_strengths() of the board.
+        villain_weights (numpy.ndarray): Villain weight per combo; combos
+            blocked by the board must weigh 0.
+        rows (numpy.ndarray): Hero combo indices to evaluate.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: For each row, the
+        villain weight it beats, ties and does not share a card with.
+    """
+    order = np.argsort(strengths, kind="stable")
+    ordered = strengths[order]
+    cumulative = np.concatenate(([0.0], np.cumsum(villain_weights[order])))
+    hero = strengths[rows]
+    below = cumulative[np.searchsorted(ordered, hero, side="left")]
+    at_most = cumulative[np.searchsorted(ordered, hero, side="right")]
+    total = cumulative[-1]
+    # Take out villain combos sharing a card with the hero combo. The hero
+    # combo itself holds both cards, so it is taken out twice and added back.
+    own = villain_weights[rows]
+    for card in (COMBOS[rows, 0], COMBOS[rows, 1]):
+        neighbours = CARD_COMBOS[card]
+        weights = villain_weights[neighbours]
+        scores = strengths[neighbours]
+        below = below - (weights * (scores < hero[:, None])).sum(axis=1)
+        at_most = at_most - (weights * (scores <= hero[:, None])).sum(axis=1)
+        total = total - weights.sum(axis=1)
+    at_most = at_most + own
+    total = total + own
+    return below, at_most - below, total
+
+def _runouts(board, dead, max_runouts, rng):
+    """Complete a board every way, or max_runouts sampled ways if there are more."""
+    board = [card_code(card) for card in board]
+    known = set(board) | {card_code(card) for card in dead}
+    stub = [code for code in range(52) if code not in known]
+    missing = 5 - len(board)
+    if max_runouts is None or math.comb(len(stub), missing) <= max_runouts:
+        return [board + list(extra) for extra in combinations(stub, missing)]
+    return [board + rng.sample(stub, missing) for _ in range(max_runouts)]
+
+def range_vs_hand(villain, hole, board, max_runouts=DEFAULT_RUNOUTS, rng=None):
+    """
+    Equity of known hole cards against a villain range.
+
+    Args:
+        villain (Range): The opponent's range.
+        hole (List[Card]): Hero's two hole cards.
+        board (List[Card]): Community cards (three to five).
+        max_runouts (int or None): Board completions averaged over at most;
+            None enumerates all of them. The river needs none.
+        rng (random.Random or None): Source for sampled runouts.
+
+    Returns:
+        float: Hero's expected share of the pot heads-up against the range.
+    """
+    return range_vs_range(Range.hand(*hole), villain, board, max_runouts, rng, dead=hole)
+
+def range_vs_range(hero, villain, board, max_runouts=DEFAULT_RUNOUTS, rng=None, dead=()):
+    """
+    Equity of one range against another, with exact card removal.
+
+    Args:
+        hero (Range): The range whose equity is returned.
+        villain (Range): The opposing range.
+        board (List[Card]): Community cards (three to five).
+        max_runouts (int or None): As for range_vs_hand().
+        rng (random.Random or None): Source for sampled runouts.
+        dead (Iterable[Card]): Cards no runout may deal, e.g. a known hand.
+
+    Returns:
+        float: The hero range's expected share of the pot, over every pair of
+        non-conflicting holdings weighted by both ranges.
+
+    Raises:
+        ValueError: If no pair of holdings is possible.
+    """
+    strengths = board_strengths(_runouts(board, dead, max_runouts, rng or random))
+    return float(_shares(*_tally(hero, [villain], strengths))[0])
+
+def _tally(hero, villains, strengths):
+    """
+    Weigh a hero range against villain ranges over runouts.
+
+    Args:
+        hero (Range): The hero range.
+        villains (List[Range]): The villain ranges.
+        strengths (numpy.ndarray): board_strengths() of the runouts.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: Per villain, the pot share weight
+        the hero range wins and the weight of all holding pairs that can meet.
+    """
+    won = np.zeros(len(villains))
+    shared = np.zeros(len(villains))
+    for row in strengths:
+        live = row >= 0
+        rows = np.flatnonzero(live & (hero.weights > 0))
+        weights = hero.weights[rows]
+        for i, villain in enumerate(villains):
+            wins, ties, total = _versus(row, np.where(live, villain.weights, 0.0), rows)
+            won[i] += weights @ (wins + ties / 2)
+            shared[i] += weights @ total
+    return won, shared
+
+def _shares(won, shared):
+    """Return the hero range's pot share against each villain from _tally() sums."""
+    if (shared <= 0).any():
+        raise ValueError("No holdings of the two ranges can meet on this board.")
+    return won / shared
+
+class RangeTracker:
+    """
+    Keeps a Range per player of a game, narrowed by every decision.
+
+    Attributes:
+        ranges (Dict[int, Range]): id(player) -> range for the current hand.
+        max_runouts (int): Runouts hand_equity() averages over before the
+            river when it has no deadline.
+        rng (random.Random or None): Source for sampled runouts; attach()
+            defaults it to the game's, so seeded games stay reproducible.
+        clock (Callable[[], float]): Time source for hand_equity() deadlines.
+    """
+
+    def __init__(self, max_runouts=DEFAULT_RUNOUTS, rng=None, clock=time.perf_counter):
+        self.max_runouts = max_runouts
+        self.rng = rng
+        self.clock = clock
+        self.ranges = {}
+        self._percentiles = (None, None)  # (board codes, percentiles)
+
+    def attach(self, game):
+        """
+        Track a game's players: fresh ranges each deal, narrowed on each decision.
+
+        Returns:
+            RangeTracker: self, for chaining.
+        """
+        game.ranges = self
+        if self.rng is None:
+            self.rng = game.rng
+        deal_cards, decide = game.deal_cards, game.decide
+
+        def tracked_deal():
+            self.ranges = {id(p): Range() for p in game.players}
+            deal_cards()
+
+        def tracked_decide(player):
+            pot, current_bet, chips = game.pot, game.current_bet, player.chips
+            decide(player)
+            self.observe(game, player, chips - player.chips, pot, current_bet)
+
+        game.deal_cards = tracked_deal
+        game.decide = tracked_decide
+        return self
+
+    def detach(self, game):
+        """Remove the hooks added by attach()."""
+        game.ranges = None
+        for method in ("deal_cards", "decide"):
+            game.__dict__.pop(method, None)
+
+    def percentiles(self, board):
+        """Return hand_percentiles() for a board, reusing them within a street."""
+        key = tuple(card.code for card in board)
+        if self._percentiles[0] != key:
+            self._percentiles = (key, hand_percentiles(board))
+        return self._percentiles[1]
+
+    def observe(self, game, player, amount, pot, current_bet):
+        """
+        Narrow a player's range by the decision they just made.
+
+        Args:
+            game (Game): The game.
+            player (Player): The player who acted.
+            amount (int): Chips the decision put in.
+            pot (int): Pot before the decision.
+            current_bet (int): Bet to match before the decision.
+        """
+        player_range = self.ranges.get(id(player))
+        if player_range is None or player.folded:
+            return
+        percentiles = self.percentiles(game.community_cards)
+        if amount <= 0:
+            player_range.narrow("check", percentiles)
+        elif player.current_bet > current_bet:
+            player_range.narrow("raise", percentiles, amount / max(pot, 1))
+        else:
+            player_range.narrow("call", percentiles)
+
+    def hand_equity(self, game, player, deadline=None):
+        """
+        Estimate a player's postflop equity against the others' ranges.
+
+        Each active opponent's range is faced heads-up; the multiway equity is
+        the product of the heads-up shares, which ignores card removal between
+        opponents.
+
+        Without a deadline the shares average over max_runouts runouts. With
+        one, every completion of the board is taken in random order, in
+        batches sized to half the time left (the first is a single runout, to
+        time one), until the deadline or until none is left, when the result
+        is exact.
+
+        Args:
+            game (Game): The game.
+            player (Player): The player whose equity is wanted.
+            deadline (float or None): clock() value to finish by.
+
+        Returns:
+            Tuple[float, int] or None: The equity and the runouts each share
+            averaged over, or None if the deadline left no time for a runout.
+        """
+        board = game.community_cards
+        hero = Range.hand(*player.hand)
+        villains = [self.ranges.get(id(opponent)) or Range()
+                    for opponent in game.get_active_players() if opponent is not player]
+        rng = self.rng or random
+        if deadline is None:
+            runouts = _runouts(board, player.hand, self.max_runouts, rng)
+            shares = _shares(*_tally(hero, villains, board_strengths(runouts)))
+            return float(np.prod(shares)), len(runouts)
+        runouts = _runouts(board, player.hand, None, rng)
+        rng.shuffle(runouts)
+        won = np.zeros(len(villains))
+        shared = np.zeros(len(villains))
+        done = 0
+        runout_seconds = None
+        while done < len(runouts):
+            start = self.clock()
+            remaining = deadline - start
+            if runout_seconds is None:
+                batch = 1 if remaining > 0 else 0
+            else:
+                batch = min(len(runouts) - done, int(remaining / 2 / runout_seconds))
+            if batch <= 0:
+                break
+            batch_won, batch_shared = _tally(hero, villains, board_strengths(runouts[done:done + batch]))
+            won += batch_won
+            shared += batch_shared
+            done += batch
+            runout_seconds = max(self.clock() - start, 1e-9) / batch
+        if not done:
+            return None
+        return float(np.prod(_shares(won, shared))), done
@@ -0,0 +1,170 @@
+"""
+This module replays recorded hands through the real Game engine.
+
+A recorded hand carries its starting stacks, dealer, blinds, hole cards,
+board and every action, so it can be replayed on its own: the seats are
+rebuilt, the deck is stacked with the recorded cards, and each seat's
+strategy plays back its recorded actions. The engine still runs the betting
+rounds, find_winners() and distribute_pot(); the replay checks that it asks
+the same seats to act in the same order and pays out the recorded stacks.
+
+Combined with history.HistoryIndex this jumps straight to hand N of a
+session log, and with seeded_hands() a seeded session can be re-run and
+compared hand by hand against a stored log to find where it diverges.
+"""
+
+import argparse
+from collections import deque
+from card import CARDS
+from game import Game
+from history import BET, FOLD, HistoryIndex
+from player import Player
+from simulation import build_game, play_hands
+
+class ReplayMismatch(Exception):
+    """Raised when the engine does not reproduce a recorded hand."""
+
+class StackedDeck:
+    """
+    Deck that deals a fixed sequence of cards, used to replay a hand.
+
+    Burned cards are not recorded, so burning deals nothing.
+    """
+
+    def __init__(self, cards):
+        self.cards = list(cards)
+        self.position = 0
+
+    def shuffle(self):
+        self.position = 0
+
+    def deal(self):
+        if self.position >= len(self.cards):
+            raise ReplayMismatch("the engine dealt more cards than the hand recorded")
+        card = self.cards[self.position]
+        self.position += 1
+        return card
+
+    def burn(self):
+        pass
+
+    def __len__(self):
+        return len(self.cards) - self.position
+
+def _deal_order(hand):
+    """Cards in the order Game deals them: one per seat twice, then the board."""
+    order = [CARDS[cards[i]] for i in range(2) for cards in hand.hole_cards]
+    return order + [CARDS[code] for code in hand.board]
+
+def _scripted_strategy(seat, actions):
+    """Return a strategy that plays the next recorded action for one seat."""
+    def strategy(game, player):
+        if not actions or actions[0][0] != seat:
+            expected = f"seat {actions[0][0]}" if actions else "no one"
+            raise ReplayMismatch(f"the engine asked seat {seat} to act; the record has {expected}")
+        _, _, kind, amount = actions.popleft()
+        if kind == FOLD:
+            player.folded = True
+        elif kind == BET:
+            game.place_bet(player, amount)
+    return strategy
+
+def replay_hand(hand):
+    """
+    Play one recorded hand through a headless Game.
+
+    Args:
+        hand (HandRecord): The hand to replay.
+
+    Returns:
+        Game: The game after the hand, for further inspection.
+
+    Raises:
+        ReplayMismatch: If the engine's betting order, dealing or payouts
+            differ from the record.
+    """
+    actions = deque(hand.actions)
+    game = Game()
+    game.players = [Player(name, [], stack, True, strategy=_scripted_strategy(seat, actions))
+                    for seat, (name, stack) in enumerate(zip(hand.names, hand.stacks))]
+    game.small_blind = hand.small_blind
+    game.big_blind = hand.big_blind
+    # reset_round() moves the button on before the hand starts.
+    game.dealer_idx = (hand.dealer - 1) % len(game.players)
+    game.deck = StackedDeck(_deal_order(hand))
+    game.play_round()
+    if actions:
+        raise ReplayMismatch(f"the hand ended with {len(actions)} recorded actions left")
+    final_stacks = [p.chips for p in game.players]
+    if final_stacks != hand.final_stacks:
+        raise ReplayMismatch(f"final stacks {final_stacks}, recorded {hand.final_stacks}")
+    return game
+
+def verify_history(path, start=0, stop=None):
+    """
+    Replay a range of hands from a history file.
+
+    Args:
+        path (str): History file written by history.HistoryWriter.
+        start (int): First hand number to replay; earlier hands are skipped
+            by offset, not replayed.
+        stop (int or None): Hand number to stop before; None replays to the end.
+
+    Yields:
+        Tuple[int, str]: (hand number, reason) for every hand that did not
+        replay identically.
+    """
+    for number, hand in enumerate(HistoryIndex(path).read(start, stop), start):
+        try:
+            replay_hand(hand)
+        except ReplayMismatch as error:
+            yield number, str(error)
+
+class _MemoryRecorder:
+    """Recorder that keeps the hands of a seeded session in memory."""
+
+    def __init__(self):
+        self.hands = []
+
+    def record(self, hand):
+        self.hands.append(hand)
+
+def seeded_hands(seed, n_hands, strategies=None, starting_chips=1000):
+    """
+    Re-run a seeded single-table session (see simulation.simulate).
+
+    Returns:
+        List[HandRecord]: The hands the current engine and AI produce.
+    """
+    recorder = _MemoryRecorder()
+    play_hands(build_game(seed, strategies, starting_chips, recorder), n_hands, starting_chips)
+    return recorder.hands
+
+def first_divergence(expected, actual):
+    """
+    Return the number of the first hand that differs between two sessions.
+
+    Args:
+        expected (Iterable[HandRecord]): Hands from a stored log.
+        actual (Iterable[HandRecord]): Hands from a fresh run, e.g. seeded_hands().
+
+    Returns:
+        int or None: The first differing hand, or None if every hand matches
+        (hands beyond the shorter session are not compared).
+    """
+    for number, (old, new) in enumerate(zip(expected, actual)):
+        if old != new:
+            return number
+    return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay and check recorded hands.")
+    parser.add_argument("history", help="hand history file")
+    parser.add_argument("--start", type=int, default=0, help="first hand to replay")
+    parser.add_argument("--stop", type=int, default=None, help="hand to stop before")
+    args = parser.parse_args()
+    mismatches = 0
+    for number, reason in verify_history(args.history, args.start, args.stop):
+        mismatches += 1
+        print(f"hand {number}: {reason}")
+    print(f"{mismatches} mismatched hands")
@@ -0,0 +1,642 @@
+"""
+This module hosts poker tables for network clients on one asyncio event loop.
+
+Clients speak line-delimited JSON over TCP: every message is one UTF-8 JSON
+object on its own line, with a "type" field.
+
+Client to server:
+    {"type": "join", "name": "Ann"}     sit at the first table with room
+    {"type": "act", "action": "call"}   answer the pending "turn" prompt; the
+        action is fold, check, call, bet or raise, and bet/raise carry an
+        "amount": chips put in beyond the call
+    {"type": "leave"}                   stand up once the current hand is over
+
+Server to client:
+    {"type": "seated", "table": 3, "chips": 1000}
+    {"type": "deal", "table": 3, "hand": 17, "cards": ["A♠", "10♥"], "dealer": "Bob"}
+    {"type": "log", "message": "Bob raises to 40."}
+    {"type": "turn", "to_call": 30, "pot": 75, "chips": 960, "cards": [...],
+     "board": [...], "options": ["call", "raise", "fold"], "seconds": 12.5}
+    {"type": "acted", "action": "call", "amount": 30}
+    {"type": "end", "table": 3, "hand": 17, "board": [...], "stacks": [["Ann", 1030], ...]}
+    {"type": "busted"}, {"type": "left", "chips": 990}, {"type": "error", "message": "..."}
+
+Each table plays its hands through an ordinary Game on a worker thread, the
+same split ui_bridge uses for Tk: a remote seat's strategy sends the "turn"
+prompt and blocks only that table's thread until the client answers, while
+the event loop keeps serving every connection. A decision gets action_time
+seconds plus whatever is left of the seat's time bank; time used beyond
+action_time comes out of the bank, and a seat that runs out of time (or
+disconnects) checks if it can and folds otherwise. Players join and leave
+between hands, on the event loop.
+
+run_swarm() is a local load generator: it connects many bot clients that
+answer every prompt at once and reports p50/p99 action latency (from sending
+"act" to receiving "acted") and hands per second.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import List
+from card import CARDS
+from events import NullSink
+from game import Game
+from hand_evaluator import lookup_tables
+from player import Player
+from simulation import HandRate
+
+ACTION_TIME = 10.0
+TIME_BANK = 30.0
+# Longest line accepted from a client, and bytes queued for a client before
+# it is dropped as too slow to keep up.
+MAX_LINE = 4096
+MAX_BUFFER = 1 << 18
+CARD_NAMES = [str(card) for card in CARDS]
+
+def encode(message):
+    """Return a message as one protocol line."""
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+def deliver(batch):
+    """Send (connections, line) pairs with one write per connection; runs on the event loop."""
+    lines = {}
+    for connections, data in batch:
+        for connection in connections:
+            queued = lines.get(connection)
+            if queued is None:
+                lines[connection] = [data]
+            else:
+                queued.append(data)
+    for connection, queued in lines.items():
+        connection.send(b"".join(queued))
+
+def card_names(cards):
+    return [CARD_NAMES[card.code] for card in cards]
+
+class Connection:
+    """
+    One client socket and the seat it holds; used only on the event loop.
+
+    Attributes:
+        name (str or None): Name given when joining.
+        table (Table or None): Table the client sits or waits at.
+        player (Player or None): The client's seat once a hand includes it.
+        time_bank (float): Extra seconds of thinking time left.
+        leaving (bool): Whether the client stands up after this hand.
+    """
+
+    def __init__(self, writer, time_bank):
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+        self.name = None
+        self.table = None
+        self.player = None
+        self.time_bank = time_bank
+        self.leaving = False
+        self.closed = False
+        self._answer = None  # Future of the prompt being waited on
+        self._timer = None
+        self._asked = 0.0
+        self._action_time = 0.0
+
+    def send(self, data):
+        if self.closed:
+            return
+        self.writer.write(data)
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+            self.reply(None)
+
+    def prompt(self, batch, data, seconds, action_time, answer):
+        """
+        Deliver a table's pending messages, then send a "turn" prompt.
+
+        The answer future gets the client's "act" message, or None if the
+        client takes longer than seconds or disconnects.
+        """
+        if self.closed:
+            deliver(batch)
+            answer.set_result(None)
+            return
+        batch.append(((self,), data))
+        deliver(batch)
+        self._answer = answer
+        self._asked = self.loop.time()
+        self._action_time = action_time
+        self._timer = self.loop.call_later(seconds, self.reply, None)
+
+    def reply(self, message):
+        """Answer the pending prompt; an action sent with none pending is dropped."""
+        answer = self._answer
+        if answer is None:
+            return
+        self._answer = None
+        self._timer.cancel()
+        used = self.loop.time() - self._asked - self._action_time
+        self.time_bank = max(0.0, self.time_bank - max(0.0, used))
+        answer.set_result(message)
+
+class TableSink(NullSink):
+    """
+    Event sink of a table's game, which runs on a worker thread.
+
+    Messages are collected and handed to the event loop together with the
+    next prompt, or when the hand ends, so the loop is woken once per
+    decision rather than once per message.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.pending = []  # (connections, line) pairs not yet delivered
+
+    def append_log(self, message):
+        self.pending.append((self.table.connections(), encode({"type": "log", "message": message})))
+
+    def display_ai_hands(self, ai_cards, reveal_all=False):
+        # Every seat is remote, so every seat is told only its own cards.
+        if reveal_all:
+            return
+        table = self.table
+        game = table.game
+        dealer = game.players[game.dealer_idx].name
+        for player in game.players:
+            message = {"type": "deal", "table": table.number, "hand": table.hands,
+                       "cards": card_names(player.hand), "dealer": dealer}
+            self.pending.append(((table.seats[id(player)],), encode(message)))
+
+    def take(self):
+        """Return and clear the undelivered messages."""
+        batch, self.pending = self.pending, []
+        return batch
+
+def apply_action(game, player, message, to_call):
+    """
+    Play a client's action for a seat.
+
+    Args:
+        game (Game): The table's game.
+        player (Player): The seat acting.
+        message (dict): The client's "act" message.
+        to_call (int): Chips the seat needs to call.
+
+    Returns:
+        Tuple[str, int] or None: The action taken and the chips it put in, or
+        None if the action is not allowed here.
+    """
+    action = message.get("action")
+    if action == "fold":
+        player.folded = True
+        game.ui.append_log(f"{player.name} folds.")
+        return action, 0
+    if action == "check" and to_call <= 0:
+        game.ui.append_log(f"{player.name} checks.")
+        return action, 0
+    if action == "call" and to_call > 0:
+        amount = to_call
+    elif action in ("bet", "raise"):
+        extra = message.get("amount")
+        if not isinstance(extra, int) or isinstance(extra, bool) or extra < 1:
+            return None
+        amount = to_call + extra
+    else:
+        return None
+    chips = player.chips
+    game.place_bet(player, amount)
+    return action, chips - player.chips
+
+class Table:
+    """
+    One table of the server.
+
+    Attributes:
+        number (int): Table number, from 0.
+        game (Game): The game played here; every seat is a remote client.
+        seats (Dict[int, Connection]): id(Player) -> the client playing it.
+        waiting (List[Connection]): Clients seated at the next hand.
+        hands (int): Hands played at this table.
+    """
+
+    def __init__(self, server, number):
+        self.server = server
+        self.number = number
+        self.loop = server.loop
+        self.sink = TableSink(self)
+        self.game = Game(ui=self.sink, rng=random.Random(f"{server.seed}:{number}"))
+        self.game.players = []
+        self.seats = {}
+        self.waiting = []
+        self.hands = 0
+        self.wake = asyncio.Event()
+        self._connections = ()
+
+    def connections(self):
+        return self._connections
+
+    def occupancy(self):
+        return len(self.game.players) + len(self.waiting)
+
+    def strategy(self, game, player):
+        """Decision callback of every seat; runs on the table's thread."""
+        connection = self.seats[id(player)]
+        server = self.server
+        sink = self.sink
+        to_call = game.current_bet - player.current_bet
+        reply = None
+        if not server.closing:
+            # The time bank only changes on the loop, while this thread waits.
+            seconds = server.action_time + connection.time_bank
+            prompt = {"type": "turn", "to_call": max(0, to_call), "pot": game.pot,
+                      "chips": player.chips, "cards": card_names(player.hand),
+                      "board": card_names(game.community_cards),
+                      "options": ["check", "bet", "fold"] if to_call <= 0 else ["call", "raise", "fold"],
+                      "seconds": round(seconds, 3)}
+            answer = Future()
+            self.loop.call_soon_threadsafe(connection.prompt, sink.take(), encode(prompt),
+                                           seconds, server.action_time, answer)
+            try:
+                # The loop times the prompt out; this only guards a stopped loop.
+                reply = answer.result(seconds + 1)
+            except FutureTimeout:
+                pass
+        taken = apply_action(game, player, reply, to_call) if reply is not None else None
+        if taken is None:
+            if reply is not None:
+                sink.pending.append(((connection,), encode(
+                    {"type": "error", "message": f"{reply.get('action')!r} is not allowed now"})))
+            taken = apply_action(game, player, {"action": "check" if to_call <= 0 else "fold"},
+                                 to_call)
+        action, amount = taken
+        # Sent with the next prompt, which follows straight away, or at the end of the hand.
+        sink.pending.append(((connection,), encode(
+            {"type": "acted", "action": action, "amount": amount})))
+
+    def seat_waiting(self):
+        """Give waiting clients their seats; runs between hands."""
+        for connection in self.waiting:
+            if connection.closed or connection.leaving:
+                connection.table = None
+                connection.leaving = False
+                continue
+            player = Player(connection.name, [], self.server.starting_chips, True,
+                            strategy=self.strategy)
+            connection.player = player
+            self.game.players.append(player)
+            self.seats[id(player)] = connection
+        self.waiting.clear()
+        self._connections = tuple(self.seats.values())
+
+    def unseat(self, index):
+        """Remove the player in a seat (see Game.remove_player) and return their connection."""
+        connection = self.seats.pop(id(self.game.remove_player(index)))
+        connection.player = None
+        connection.table = None
+        connection.leaving = False
+        return connection
+
+    def finish_hand(self):
+        """Report the hand and remove busted and departing players."""
+        game = self.game
+        end = {"type": "end", "table": self.number, "hand": self.hands,
+               "board": card_names(game.community_cards),
+               "stacks": [[p.name, p.chips] for p in game.players]}
+        batch = self.sink.take()
+        batch.append((self._connections, encode(end)))
+        deliver(batch)
+        self.hands += 1
+        for index in range(len(game.players) - 1, -1, -1):
+            player = game.players[index]
+            connection = self.seats[id(player)]
+            if player.chips <= 0:
+                self.unseat(index).send(encode({"type": "busted"}))
+            elif connection.closed or connection.leaving:
+                self.unseat(index).send(encode({"type": "left", "chips": player.chips}))
+        self._connections = tuple(self.seats.values())
+
+    async def run(self):
+        """Play hands while at least two players are seated."""
+        server = self.server
+        while not server.closing:
+            self.seat_waiting()
+            if len(self.game.players) < 2:
+                self.wake.clear()
+                await self.wake.wait()
+                continue
+            await self.loop.run_in_executor(server.executor, self.game.play_round)
+            self.finish_hand()
+
+class TableServer:
+    """
+    Asyncio TCP server hosting up to max_tables tables.
+
+    Attributes:
+        tables (List[Table]): Tables opened so far.
+        port (int): Port listened on, once started.
+        connected (int): Clients currently connected.
+    """
+
+    def __init__(self, seats_per_table=6, starting_chips=1000, action_time=ACTION_TIME,
+                 time_bank=TIME_BANK, max_tables=1000, seed=None):
+        """
+        Args:
+            seats_per_table (int): Players per table (2 to 10).
+            starting_chips (int): Stack given to each player who sits down.
+            action_time (float): Seconds every decision gets before the time
+                bank is used.
+            time_bank (float): Extra seconds each player can spread over
+                their decisions.
+            max_tables (int): Tables the server opens at most; each playing
+                table holds one worker thread during a hand.
+            seed (int or None): Seed for the tables' shuffles.
+
+        Raises:
+            ValueError: If the seat count is out of range.
+        """
+        if not 2 <= seats_per_table <= 10:
+            raise ValueError("Tables seat between two and ten players.")
+        self.seats = seats_per_table
+        self.starting_chips = starting_chips
+        self.action_time = action_time
+        self.time_bank = time_bank
+        self.max_tables = max_tables
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.tables = []
+        self.connected = 0
+        self.closing = False
+        self.loop = None
+        self.port = None
+        self.executor = ThreadPoolExecutor(max_tables, thread_name_prefix="table")
+        self._server = None
+        self._clients = set()
+        self._tasks = []
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Start listening; port 0 picks a free port.
+
+        Returns:
+            TableServer: self, with port set.
+        """
+        self.loop = asyncio.get_running_loop()
+        # Build the evaluator tables once here rather than in every table's first showdown.
+        lookup_tables()
+        self._server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE,
+                                                  backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        """Disconnect every client, finish the hands in play and stop."""
+        self.closing = True
+        self._server.close()
+        for connection in list(self._clients):
+            connection.close()
+        for table in self.tables:
+            table.wake.set()
+        await asyncio.gather(*self._tasks)
+        await self._server.wait_closed()
+        self.executor.shutdown()
+
+    def open_table(self):
+        """Return a table with a free seat, opening one if needed, or None."""
+        for table in self.tables:
+            if table.occupancy() < self.seats:
+                return table
+        if len(self.tables) >= self.max_tables:
+            return None
+        table = Table(self, len(self.tables))
+        self.tables.append(table)
+        self._tasks.append(asyncio.create_task(table.run()))
+        return table
+
+    def join(self, connection, message):
+        if connection.table is not None:
+            connection.send(encode({"type": "error", "message": "already seated"}))
+            return
+        table = self.open_table()
+        if table is None:
+            connection.send(encode({"type": "error", "message": "every table is full"}))
+            return
+        connection.name = str(message.get("name") or f"Player {self.connected}")[:32]
+        connection.table = table
+        table.waiting.append(connection)
+        table.wake.set()
+        connection.send(encode({"type": "seated", "table": table.number,
+                                "chips": self.starting_chips}))
+
+    async def handle(self, reader, writer):
+        """Serve one client until it disconnects."""
+        connection = Connection(writer, self.time_bank)
+        self._clients.add(connection)
+        self.connected += 1
+        try:
+            while not connection.closed:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):  # Over-long line or reset.
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    message = None
+                kind = message.get("type") if isinstance(message, dict) else None
+                if kind == "act":
+                    connection.reply(message)
+                elif kind == "join":
+                    self.join(connection, message)
+                elif kind == "leave":
+                    connection.leaving = True
+                else:
+                    connection.send(encode({"type": "error", "message": "unknown message"}))
+        finally:
+            connection.close()
+            self._clients.discard(connection)
+            self.connected -= 1
+
+async def serve(host, port, **options):
+    """Run a TableServer until cancelled."""
+    server = await TableServer(**options).start(host, port)
+    print(f"listening on {host}:{server.port}", flush=True)
+    try:
+        await server._server.serve_forever()
+    finally:
+        await server.close()
+
+@dataclass
+class SwarmReport(HandRate):
+    """
+    Result of a bot-swarm load test.
+
+    Attributes:
+        bots (int): Bots that connected.
+        seconds (float): Length of the measured run.
+        hands (int): Hands finished across all tables during the run.
+        latencies (List[float]): Seconds from each "act" to its "acted".
+    """
+    bots: int
+    seconds: float
+    hands: int
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    def percentile(self, q):
+        """Return the q-th percentile action latency in seconds (nearest rank)."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+def _choose(rng, options):
+    """Pick a bot action: mostly check or call, sometimes bet, raise or fold."""
+    roll = rng.random()
+    if "check" in options:
+        return {"type": "act", "action": "check"} if roll < 0.7 else \
+            {"type": "act", "action": "bet", "amount": 10}
+    if roll < 0.75:
+        return {"type": "act", "action": "call"}
+    if roll < 0.85:
+        return {"type": "act", "action": "raise", "amount": 10}
+    return {"type": "act", "action": "fold"}
+
+async def _bot(host, port, name, rng, report, hands, connecting, connected):
+    """Play as one client until cancelled, rejoining whenever busted."""
+    async with connecting:
+        reader, writer = await asyncio.open_connection(host, port)
+    connected.release()
+    join = encode({"type": "join", "name": name})
+    writer.write(join)
+    sent = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "turn":
+                writer.write(encode(_choose(rng, message["options"])))
+                sent = time.perf_counter()
+            elif kind == "acted":
+                if sent is not None:
+                    report.latencies.append(time.perf_counter() - sent)
+                    sent = None
+            elif kind == "end":
+                hands.add((message["table"], message["hand"]))
+            elif kind == "busted":
+                writer.write(join)
+    finally:
+        writer.close()
+
+async def run_swarm(host, port, bots, duration=10.0, seed=0, max_connecting=200):
+    """
+    Load-test a running server with bot clients.
+
+    Args:
+        host (str): Server host.
+        port (int): Server port.
+        bots (int): Bot clients to connect.
+        duration (float): Seconds to measure once every bot has connected.
+        seed (int): Seed for the bots' choices.
+        max_connecting (int): Connections opened at the same time.
+
+    Returns:
+        SwarmReport: Latencies and throughput over the measured run.
+    """
+    rng = random.Random(seed)
+    report = SwarmReport(0, 0.0, 0)
+    hands = set()
+    connecting = asyncio.Semaphore(max_connecting)
+    connected = asyncio.Semaphore(0)
+    tasks = [asyncio.create_task(_bot(host, port, f"Bot {number}", random.Random(rng.random()),
+                                      report, hands, connecting, connected))
+             for number in range(bots)]
+    try:
+        for _ in range(bots):
+            await connected.acquire()
+        report.bots = bots
+        report.latencies.clear()
+        counted = len(hands)
+        began = time.perf_counter()
+        await asyncio.sleep(duration)
+        report.seconds = time.perf_counter() - began
+        report.hands = len(hands) - counted
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return report
+
+def _raise_file_limit():
+    """Allow as many open sockets as the hard limit permits."""
+    try:
+        import resource
+    except ImportError:  # Not on Windows.
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+def _swarm_main(args):
+    process = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+    else:
+        # A separate process, so bots and server do not share an interpreter.
+        process = subprocess.Popen([sys.executable, __file__, "serve", "--port", "0",
+                                    "--seats", str(args.seats)],
+                                   stdout=subprocess.PIPE, text=True)
+        host, port = process.stdout.readline().split()[-1].rsplit(":", 1)
+    try:
+        report = asyncio.run(run_swarm(host, int(port), args.bots, args.duration))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    p50, p99 = report.percentile(50), report.percentile(99)
+    print(f"{report.bots} bots, {len(report.latencies)} actions in {report.seconds:.1f}s")
+    if p50 is not None:
+        print(f"action latency p50 {p50 * 1e3:.2f} ms, p99 {p99 * 1e3:.2f} ms")
+    print(f"{report.hands} hands, {report.hands_per_second:.0f} hands/sec")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host poker tables over TCP, or load-test them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the table server")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=9000)
+    serve_parser.add_argument("--seats", type=int, default=6)
+    serve_parser.add_argument("--chips", type=int, default=1000)
+    serve_parser.add_argument("--action-time", type=float, default=ACTION_TIME)
+    serve_parser.add_argument("--time-bank", type=float, default=TIME_BANK)
+    serve_parser.add_argument("--max-tables", type=int, default=1000)
+    swarm_parser = commands.add_parser("swarm", help="load-test with local bot clients")
+    swarm_parser.add_argument("--bots", type=int, default=1000)
+    swarm_parser.add_argument("--duration", type=float, default=10.0)
+    swarm_parser.add_argument("--seats", type=int, default=6,
+                              help="seats per table of the server started for the test")
+    swarm_parser.add_argument("--connect", default=None,
+                              help="HOST:PORT of a running server instead of starting one")
+    args = parser.parse_args()
+    _raise_file_limit()
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, seats_per_table=args.seats,
+                              starting_chips=args.chips, action_time=args.action_time,
+                              time_bank=args.time_bank, max_tables=args.max_tables))
+        except KeyboardInterrupt:
+            pass
+    else:
+        _swarm_main(args)
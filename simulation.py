@@ -0,0 +1,172 @@
+"""
+This module drives headless Game instances for bulk hand simulation.
+
+Every seat, including the human one, is played by a decision callback and
+all output goes to a NullSink, so no Tkinter window or console printing is
+involved. Busted seats are rebought to the starting stack so the table stays
+full for as many hands as requested.
+"""
+
+import argparse
+import random
+import time
+from dataclasses import dataclass, field
+from typing import List
+from ai import make_betting_decision
+from game import Game
+from history import HistoryWriter
+from parallel import run_shards, shard_seed, shard_sizes
+
+class HandRate:
+    """Adds hands_per_second to a report with hands and seconds fields."""
+
+    @property
+    def hands_per_second(self):
+        return self.hands / self.seconds if self.seconds > 0 else float("inf")
+
+@dataclass
+class SimulationReport(HandRate):
+    """
+    Summary of a simulation run.
+
+    Attributes:
+        hands (int): Hands played.
+        seconds (float): Wall time of the run.
+        net_chips (List[int]): Chips won minus chips lost per seat.
+        rebuys (List[int]): Times each seat was rebought after busting.
+    """
+    hands: int
+    seconds: float
+    net_chips: List[int] = field(default_factory=list)
+    rebuys: List[int] = field(default_factory=list)
+
+    def merge(self, other):
+        """Add another report's hand and chip counts (wall time is not summed)."""
+        self.hands += other.hands
+        self.net_chips = [a + b for a, b in zip(self.net_chips, other.net_chips)]
+        self.rebuys = [a + b for a, b in zip(self.rebuys, other.rebuys)]
+
+def play_hands(game, n_hands, starting_chips):
+    """
+    Play n_hands rounds on a game, rebuying busted seats before each hand.
+
+    Args:
+        game (Game): A headless game whose seats all have strategies.
+        n_hands (int): Number of rounds to play.
+        starting_chips (int): Stack given to a seat when it is rebought.
+
+    Returns:
+        SimulationReport: Counts for these hands (seconds is left at 0).
+    """
+    seats = len(game.players)
+    net_chips = [0] * seats
+    rebuys = [0] * seats
+    for _ in range(n_hands):
+        for i, player in enumerate(game.players):
+            if player.chips <= 0:
+                player.chips = starting_chips
+                rebuys[i] += 1
+        before = [player.chips for player in game.players]
+        game.play_round()
+        for i, player in enumerate(game.players):
+            net_chips[i] += player.chips - before[i]
+    return SimulationReport(n_hands, 0.0, net_chips, rebuys)
+
+def build_game(seed, strategies=None, starting_chips=1000, recorder=None):
+    """
+    Create a headless game with a seeded shuffle and a strategy on every seat.
+
+    Seats without a strategy in strategies use the rule-based AI; recorder,
+    if given, receives every hand played (see history.HistoryWriter).
+    """
+    game = Game(starting_chips=starting_chips, rng=random.Random(seed), recorder=recorder)
+    strategies = list(strategies or [])
+    for i, player in enumerate(game.players):
+        strategy = strategies[i] if i < len(strategies) else None
+        player.strategy = strategy or make_betting_decision
+    return game
+
+def simulation_shard(job):
+    """Play one shard of a simulation; job is (n_hands, seed, strategies, starting_chips)."""
+    n_hands, seed, strategies, starting_chips = job
+    game = build_game(seed, strategies, starting_chips)
+    return play_hands(game, n_hands, starting_chips)
+
+def simulate(n_hands, seed=None, strategies=None, starting_chips=1000, workers=None,
+             shard_size=None, history=None, compress=False):
+    """
+    Play n_hands headless hands and report throughput.
+
+    Without workers the hands are played on one table in this process. With
+    workers the hands are split into shards of shard_size, each played on its
+    own table with a seed derived from (seed, shard index), so the merged
+    counts do not depend on the number of workers. Strategies must then be
+    picklable top-level functions.
+
+    Args:
+        n_hands (int): Number of hands to play.
+        seed (int or None): Seed for shuffling; None picks one at random.
+        strategies (List[Callable] or None): Decision callback per seat.
+        starting_chips (int): Starting and rebuy stack for every seat.
+        workers (int or None): Process count for sharded runs.
+        shard_size (int or None): Hands per shard; defaults to 1000.
+        history (str or None): Hand history file to append every hand to;
+            only supported for single-table runs (workers=None).
+        compress (bool): zlib-compress the hand history.
+
+    Returns:
+        SimulationReport: Hands played, wall time and per-seat chip results.
+
+    Raises:
+        ValueError: If history is combined with workers.
+    """
+    if history is not None and workers is not None:
+        raise ValueError("Hand histories are only recorded for single-table runs.")
+    if seed is None:
+        seed = random.getrandbits(64)
+    start = time.perf_counter()
+    if history is not None:
+        with HistoryWriter(history, compress) as recorder:
+            game = build_game(seed, strategies, starting_chips, recorder)
+            report = play_hands(game, n_hands, starting_chips)
+    elif workers is None:
+        report = play_hands(build_game(seed, strategies, starting_chips), n_hands, starting_chips)
+    else:
+        jobs = [(size, shard_seed(seed, index), strategies, starting_chips)
+                for index, size in enumerate(shard_sizes(n_hands, shard_size or 1000))]
+        report = None
+        for shard in run_shards(simulation_shard, jobs, workers):
+            if report is None:
+                report = shard
+            else:
+                report.merge(shard)
+    report.seconds = time.perf_counter() - start
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a headless hand simulation.")
+    parser.add_argument("hands", type=int, help="number of hands to play")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--history", default=None, help="append every hand to this file")
+    parser.add_argument("--compress", action="store_true", help="zlib-compress the history")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each phase and component on one table and print a summary")
+    parser.add_argument("--trace", default=None, help="with --profile, save a Chrome trace here")
+    args = parser.parse_args()
+    if args.profile:
+        from hand_evaluator import lookup_tables
+        from profiling import GameProfiler
+        lookup_tables()  # Keep one-time table construction out of the profile.
+        game = build_game(args.seed if args.seed is not None else 0)
+        profiler = GameProfiler().attach(game)
+        play_hands(game, args.hands, 1000)
+        print(profiler.summary())
+        if args.trace:
+            profiler.write_chrome_trace(args.trace)
+    else:
+        result = simulate(args.hands, seed=args.seed, workers=args.workers,
+                          history=args.history, compress=args.compress)
+        print(f"{result.hands} hands in {result.seconds:.2f}s "
+              f"({result.hands_per_second:.0f} hands/sec)")
+        print(f"Net chips per seat: {result.net_chips}")
@@ -2,13 +2,55 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
 
-import unittest
+import asyncio
+import json
+import pickle
+import pstats
 import random
+import struct
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from itertools import combinations
 
 from game import Game
-from card import Card, Suit, Rank, HandRank
-from hand_evaluator import evaluate_hand
-from ai import make_betting_decision
+from card import Card, Suit, Rank, HandRank, CARDS, card_to_int, int_to_card, encode_cards, decode_cards
+from deck import Deck
+from hand_evaluator import evaluate_hand, hand_strength, hand_strength_codes, strength_to_tuple
+from ai import make_betting_decision, AI_CACHE, SETTLED_SAMPLES
+from equity import equity, exact_equity, anytime_equity
+from parallel import parallel_equity, encode_spot, decode_spot
+from events import BufferedSink
+from simulation import simulate, build_game, play_hands
+from history import HistoryWriter, HistoryIndex, read_history
+from profiling import GameProfiler
+from tournament import Tournament, BlindLevel
+from server import TableServer, run_swarm
+from decision_cache import DecisionCache, canonical_cards, pot_odds_bucket, situation_key
+from replay import ReplayMismatch, replay_hand, verify_history, seeded_hands, first_divergence
+from pots import SidePot, build_side_pots, award_side_pots
+import preflop
+from card_slots import CardSlots
+from game_log import GameLog
+from ui_bridge import UIBridge, run_game
+from tests import reference_evaluator
+from benchmarks import bench_suite
+
+try:
+    from PIL import Image
+    from card_images import CardImageCache, image_filename, CARD_BACK
+except ModuleNotFoundError:
+    Image = None
+try:
+    import numpy as np
+    from batch_evaluator import batch_strength
+    from ranges import (Range, RangeTracker, COMBOS, NUM_COMBOS, combo_index, combo_strengths,
+                        hand_percentiles, range_vs_hand, range_vs_range)
+except ModuleNotFoundError:
+    np = None
 
 # ----------------- Test Deck Management -----------------
 class TestDeckManagement(unittest.TestCase):
@@ -19,6 +61,53 @@ class TestDeckManagement(unittest.TestCase):
         cards_set = {(card.rank, card.suit) for card in game.deck}
         self.assertEqual(len(cards_set), 52, "All cards must be unique")
 
+    def test_deck_is_reused_and_deals_unique_cards(self):
+        deck = Deck(random.Random(3))
+        cards = deck.cards
+        for _ in range(3):
+            deck.shuffle()
+            dealt = [deck.deal() for _ in range(52)]
+            self.assertEqual(set(dealt), set(CARDS))
+            self.assertIs(deck.cards, cards)
+        with self.assertRaises(IndexError):
+            deck.deal()
+
+    def test_seeded_games_deal_identically(self):
+        hands = []
+        for _ in range(2):
+            game = Game(rng=random.Random(11))
+            game.create_deck()
+            game.deal_cards()
+            game.deal_flop()
+            hands.append([list(p.hand) for p in game.players] + [list(game.community_cards)])
+        self.assertEqual(hands[0], hands[1])
+        self.assertEqual(len(game.deck), 52 - 8 - 4)
+
+# ----------------- Test Card Encoding -----------------
+class TestCardEncoding(unittest.TestCase):
+    def test_codes_round_trip(self):
+        self.assertEqual(len(CARDS), 52)
+        for code in range(52):
+            card = int_to_card(code)
+            self.assertEqual(card_to_int(card), code)
+            self.assertIs(Card(card.rank, card.suit), card)
+
+    def test_cards_are_frozen_and_hashable(self):
+        card = Card(Rank.ACE, Suit.SPADES)
+        with self.assertRaises(AttributeError):
+            card.rank = Rank.TWO
+        self.assertFalse(hasattr(card, "__dict__"))
+        self.assertEqual(len({Card(Rank.ACE, Suit.SPADES), card}), 1)
+        self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+    def test_buffer_evaluation_matches_cards(self):
+        cards = [Card(Rank.NINE, Suit.CLUBS), Card(Rank.NINE, Suit.HEARTS),
+                 Card(Rank.FOUR, Suit.SPADES), Card(Rank.KING, Suit.CLUBS),
+                 Card(Rank.TWO, Suit.DIAMONDS)]
+        buffer = encode_cards(cards)
+        self.assertEqual(decode_cards(buffer), cards)
+        self.assertEqual(hand_strength_codes(buffer), hand_strength(cards))
+
 # ----------------- Test Hand Evaluator -----------------
 class TestHandEvaluator(unittest.TestCase):
     def test_royal_flush(self):
@@ -150,6 +239,173 @@ class TestHandEvaluator(unittest.TestCase):
         result = evaluate_hand(cards)
         self.assertEqual(result[0], HandRank.HIGH_CARD)
 
+# ----------------- Test Lookup-Table Evaluator -----------------
+def reference_strength(cards):
+    """Best 5-card subset scored by the reference evaluator, flattened for comparison."""
+    best = None
+    for subset in combinations(cards, 5):
+        result = reference_evaluator.evaluate_hand(list(subset))
+        key = [result[0].value]
+        for part in result[1:]:
+            key.extend(part if isinstance(part, (list, tuple)) else [part])
+        best = key if best is None or key > best else best
+    return best
+
+class TestLookupEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.deck = [Card(rank, suit) for suit in Suit for rank in Rank]
+        self.rng = random.Random(2024)
+
+    def test_five_card_tuples_match_reference(self):
+        for _ in range(5000):
+            cards = self.rng.sample(self.deck, 5)
+            self.assertEqual(evaluate_hand(cards), reference_evaluator.evaluate_hand(cards))
+
+    def test_strength_order_matches_reference(self):
+        # Compare best-of-five under both evaluators over random 5/6/7-card hands.
+        for size in (5, 6, 7):
+            hands = [self.rng.sample(self.deck, size) for _ in range(1500)]
+            ours = [hand_strength(cards) for cards in hands]
+            theirs = [reference_strength(cards) for cards in hands]
+            for i in range(1, len(hands)):
+                expected = (theirs[i] > theirs[i - 1]) - (theirs[i] < theirs[i - 1])
+                actual = (ours[i] > ours[i - 1]) - (ours[i] < ours[i - 1])
+                self.assertEqual(actual, expected)
+                self.assertEqual(HandRank(ours[i] >> 20).value, theirs[i][0])
+
+    def test_strength_round_trip(self):
+        cards = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS),
+                 Card(Rank.KING, Suit.CLUBS), Card(Rank.KING, Suit.DIAMONDS),
+                 Card(Rank.QUEEN, Suit.CLUBS), Card(Rank.QUEEN, Suit.SPADES),
+                 Card(Rank.TWO, Suit.HEARTS)]
+        self.assertEqual(strength_to_tuple(hand_strength(cards)),
+                         (HandRank.TWO_PAIR, (14, 13), 12))
+
+# ----------------- Test Monte Carlo Equity -----------------
+class TestEquity(unittest.TestCase):
+    def setUp(self):
+        self.aces = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+        self.kings = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+
+    def test_seed_is_reproducible(self):
+        first = equity([self.aces, self.kings], iterations=2000, seed=7)
+        second = equity([self.aces, self.kings], iterations=2000, seed=7)
+        self.assertEqual(first, second)
+
+    def test_aces_versus_kings(self):
+        result = equity([self.aces, self.kings], iterations=20000, seed=1)
+        aces, kings = result.players
+        self.assertAlmostEqual(aces.equity, 0.82, delta=0.015)
+        self.assertAlmostEqual(aces.equity + kings.equity, 1.0)
+        self.assertAlmostEqual(aces.win + aces.tie + aces.loss, 1.0)
+        self.assertLess(aces.ci_low, aces.equity)
+        self.assertGreater(aces.ci_high, aces.equity)
+
+    def test_complete_board_is_exact(self):
+        board = [Card(Rank.TWO, Suit.CLUBS), Card(Rank.SEVEN, Suit.DIAMONDS),
+                 Card(Rank.NINE, Suit.CLUBS), Card(Rank.KING, Suit.CLUBS),
+                 Card(Rank.FOUR, Suit.DIAMONDS)]
+        result = equity([self.aces, self.kings], board, iterations=50, seed=3)
+        self.assertEqual(result.players[1].win, 1.0)
+        self.assertEqual(result.players[0].loss, 1.0)
+
+    def test_stops_at_target_stderr(self):
+        result = equity([self.aces, self.kings, []], iterations=100000, seed=5,
+                        target_stderr=0.01, batch_size=500)
+        self.assertLess(result.iterations, 100000)
+        self.assertTrue(all(p.stderr <= 0.01 for p in result.players))
+
+    def test_duplicate_cards_rejected(self):
+        with self.assertRaises(ValueError):
+            equity([self.aces, self.aces], iterations=10)
+
+# ----------------- Test Exact Enumeration -----------------
+class TestExactEquity(unittest.TestCase):
+    def setUp(self):
+        self.aces = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+        self.kings = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+        self.flop = [Card(Rank.TWO, Suit.CLUBS), Card(Rank.SEVEN, Suit.DIAMONDS),
+                     Card(Rank.NINE, Suit.CLUBS)]
+
+    def test_flop_counts_match_brute_force(self):
+        tally = exact_equity([self.aces, self.kings], self.flop)
+        stub = [c for c in CARDS if c not in self.aces + self.kings + self.flop]
+        wins = ties = losses = 0
+        for runout in combinations(stub, 2):
+            ours = hand_strength(self.aces + self.flop + list(runout))
+            theirs = hand_strength(self.kings + self.flop + list(runout))
+            wins += ours > theirs
+            ties += ours == theirs
+            losses += ours < theirs
+        self.assertEqual(tally.trials, 990)
+        self.assertEqual((tally.wins[0], tally.ties[0], tally.losses[0]), (wins, ties, losses))
+
+    def test_unknown_opponent_is_enumerated(self):
+        board = self.flop + [Card(Rank.KING, Suit.CLUBS), Card(Rank.FOUR, Suit.DIAMONDS)]
+        tally = exact_equity([self.aces, []], board)
+        self.assertEqual(tally.trials, 990)  # C(45, 2) opponent holdings.
+        self.assertEqual(tally.wins[0], tally.losses[1])
+
+    def test_agrees_with_sampling(self):
+        exact = exact_equity([self.aces, self.kings], self.flop).result()
+        sampled = equity([self.aces, self.kings], self.flop, iterations=20000, seed=11)
+        self.assertAlmostEqual(exact.players[0].equity, sampled.players[0].equity, delta=0.01)
+
+# ----------------- Test Parallel Equity -----------------
+class TestParallelEquity(unittest.TestCase):
+    def setUp(self):
+        self.aces = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+        self.kings = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+
+    def test_result_independent_of_worker_count(self):
+        args = ([self.aces, self.kings, []],)
+        serial = parallel_equity(*args, iterations=6000, seed=42, workers=1, shard_size=1000)
+        pooled = parallel_equity(*args, iterations=6000, seed=42, workers=2, shard_size=1000)
+        self.assertEqual(serial, pooled)
+        self.assertEqual(serial.iterations, 6000)
+
+    def test_early_stop_is_deterministic(self):
+        kwargs = dict(iterations=100000, seed=3, shard_size=500, target_stderr=0.01)
+        serial = parallel_equity([self.aces, self.kings], workers=1, **kwargs)
+        pooled = parallel_equity([self.aces, self.kings], workers=2, **kwargs)
+        self.assertEqual(serial, pooled)
+        self.assertLess(serial.iterations, 100000)
+
+    def test_spot_round_trips_as_bytes(self):
+        holes = [(48, 49), ()]
+        board = (0, 5, 10)
+        stub = [c for c in range(52) if c not in (48, 49, 0, 5, 10)]
+        encoded = encode_spot(holes, board, stub)
+        self.assertTrue(all(isinstance(part, bytes) for part in encoded))
+        self.assertEqual(decode_spot(*encoded), (holes, board, stub))
+
+# ----------------- Test Batch Evaluator -----------------
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestBatchEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(2024)
+
+    def deal(self, deck, rows, size):
+        order = np.argsort(self.rng.random((rows, len(deck))), axis=1)[:, :size]
+        return np.asarray(deck)[order]
+
+    def test_matches_scalar_evaluator(self):
+        for size in (5, 6, 7):
+            codes = self.deal(range(52), 20000, size)
+            expected = [hand_strength_codes(row) for row in codes.tolist()]
+            self.assertEqual(batch_strength(codes).tolist(), expected)
+
+    def test_matches_on_rare_categories(self):
+        # Two-suit and low-rank decks make flushes, straight flushes and quads common.
+        for deck in ([c for c in range(52) if c & 3 < 2], list(range(24))):
+            codes = self.deal(deck, 10000, 7)
+            expected = [hand_strength_codes(row) for row in codes.tolist()]
+            self.assertEqual(batch_strength(codes).tolist(), expected)
+
+    def test_rejects_bad_shape(self):
+        with self.assertRaises(ValueError):
+            batch_strength(np.zeros((3, 4), dtype=int))
+
 # ----------------- Test Betting Logic -----------------
 class TestBettingLogic(unittest.TestCase):
     def test_place_bet(self):
@@ -178,6 +434,81 @@ class TestBettingLogic(unittest.TestCase):
         self.assertEqual(player.current_bet, 30)
         self.assertEqual(game.pot, 20 + 10)
 
+# ----------------- Test Showdown -----------------
+class TestShowdown(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.game.community_cards = [
+            Card(Rank.TEN, Suit.HEARTS), Card(Rank.JACK, Suit.CLUBS),
+            Card(Rank.QUEEN, Suit.DIAMONDS), Card(Rank.TWO, Suit.SPADES),
+            Card(Rank.THREE, Suit.HEARTS)
+        ]
+
+    def test_single_winner(self):
+        players = self.game.players
+        players[0].hand = [Card(Rank.ACE, Suit.SPADES), Card(Rank.KING, Suit.SPADES)]  # Straight.
+        players[1].hand = [Card(Rank.QUEEN, Suit.SPADES), Card(Rank.QUEEN, Suit.CLUBS)]  # Trips.
+        players[2].hand = [Card(Rank.TEN, Suit.SPADES), Card(Rank.JACK, Suit.HEARTS)]  # Two pair.
+        players[3].hand = [Card(Rank.FOUR, Suit.CLUBS), Card(Rank.FIVE, Suit.CLUBS)]
+        self.assertEqual(self.game.find_winners(), [players[0]])
+
+    def test_split_pot_and_folded_players(self):
+        players = self.game.players
+        players[0].hand = [Card(Rank.ACE, Suit.SPADES), Card(Rank.KING, Suit.SPADES)]
+        players[1].hand = [Card(Rank.ACE, Suit.CLUBS), Card(Rank.KING, Suit.HEARTS)]
+        players[2].hand = [Card(Rank.FOUR, Suit.CLUBS), Card(Rank.FIVE, Suit.CLUBS)]
+        players[3].hand = [Card(Rank.KING, Suit.CLUBS), Card(Rank.NINE, Suit.CLUBS)]
+        players[3].folded = True
+        self.assertEqual(self.game.find_winners(), [players[0], players[1]])
+
+    def test_board_plays(self):
+        self.game.community_cards = [
+            Card(Rank.TEN, Suit.HEARTS), Card(Rank.JACK, Suit.HEARTS),
+            Card(Rank.QUEEN, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS),
+            Card(Rank.ACE, Suit.HEARTS)
+        ]
+        for i, player in enumerate(self.game.players):
+            player.hand = [Card(Rank.TWO, list(Suit)[i]), Card(Rank.THREE, list(Suit)[i])]
+        self.assertEqual(len(self.game.find_winners()), 4)
+
+# ----------------- Test Side Pots -----------------
+class TestSidePots(unittest.TestCase):
+    def test_layers_by_all_in_amount(self):
+        pots = build_side_pots([100, 50, 100, 20], [False, False, False, True])
+        self.assertEqual(pots, [SidePot(170, [0, 1, 2]), SidePot(100, [0, 2])])
+
+    def test_uncalled_excess_returns_to_bettor(self):
+        pots = build_side_pots([300, 40], [False, False])
+        self.assertEqual(award_side_pots(pots, {0: 1, 1: 5}), {1: 80, 0: 260})
+
+    def test_each_pot_goes_to_best_eligible_hand(self):
+        pots = build_side_pots([100, 50, 100, 20], [False, False, False, True])
+        payouts = award_side_pots(pots, {0: 3, 1: 9, 2: 3})
+        self.assertEqual(payouts, {1: 170, 0: 50, 2: 50})
+
+    def test_all_in_winner_only_wins_matched_chips(self):
+        game = Game()
+        game.community_cards = [
+            Card(Rank.TWO, Suit.HEARTS), Card(Rank.SEVEN, Suit.CLUBS),
+            Card(Rank.NINE, Suit.DIAMONDS), Card(Rank.JACK, Suit.SPADES),
+            Card(Rank.FOUR, Suit.HEARTS)
+        ]
+        short, big, other, folder = game.players
+        short.hand = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+        big.hand = [Card(Rank.KING, Suit.SPADES), Card(Rank.KING, Suit.HEARTS)]
+        other.hand = [Card(Rank.QUEEN, Suit.SPADES), Card(Rank.QUEEN, Suit.HEARTS)]
+        folder.hand = [Card(Rank.THREE, Suit.SPADES), Card(Rank.FIVE, Suit.HEARTS)]
+        short.chips = 50
+        game.place_bet(folder, 30)
+        folder.folded = True
+        for player in (short, big, other):
+            game.place_bet(player, 200)
+        total = sum(p.chips for p in game.players) + game.pot
+        game.distribute_pot()
+        self.assertEqual(short.chips, 50 * 3 + 30)
+        self.assertEqual(big.chips, 1000 - 200 + 150 * 2)
+        self.assertEqual(sum(p.chips for p in game.players), total)
+
 # ----------------- Test Game State Machine -----------------
 class TestStateMachine(unittest.TestCase):
     def setUp(self):
@@ -206,6 +537,914 @@ class TestStateMachine(unittest.TestCase):
         # Restore betting_round if needed.
         self.game.betting_round = original_betting
 
+# ----------------- Test Headless Engine -----------------
+class TestHeadlessEngine(unittest.TestCase):
+    def test_round_without_ui(self):
+        sink = BufferedSink()
+        calls = []
+        def always_call(game, player):
+            calls.append(player.name)
+            game.place_bet(player, game.current_bet - player.current_bet)
+        game = Game(ui=sink, strategies=[always_call] * 4, rng=random.Random(1))
+        game.play_round()
+        self.assertIn("Player", calls)
+        self.assertTrue(any("ROUND START" in message for message in sink.messages))
+        self.assertEqual(sum(p.chips for p in game.players), 4000)
+
+    def test_all_in_player_ends_betting_round(self):
+        def always_call(game, player):
+            game.place_bet(player, game.current_bet - player.current_bet)
+        game = Game(strategies=[always_call] * 4, rng=random.Random(2))
+        game.players[2].chips = 3
+        game.play_round()
+        self.assertEqual(sum(p.chips for p in game.players), 3003)
+
+    def test_simulate_is_reproducible(self):
+        first = simulate(200, seed=9)
+        second = simulate(200, seed=9)
+        self.assertEqual(first.hands, 200)
+        self.assertEqual(first.net_chips, second.net_chips)
+        self.assertEqual(sum(first.net_chips), 0)
+        self.assertGreater(first.hands_per_second, 0)
+
+# ----------------- Test Hand History -----------------
+class TeeWriter(HistoryWriter):
+    """Keeps every recorded hand in memory as well as writing it."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.recorded = []
+
+    def record(self, hand):
+        self.recorded.append(hand)
+        super().record(hand)
+
+class TestHandHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "hands.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, n_hands, seed, compress=False):
+        with TeeWriter(self.path, compress, block_size=512) as writer:
+            play_hands(build_game(seed, recorder=writer), n_hands, 1000)
+        return writer.recorded
+
+    def test_round_trip_across_blocks(self):
+        for compress in (False, True):
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            recorded = self.record(60, seed=4, compress=compress)
+            self.assertEqual(list(read_history(self.path)), recorded)
+        hand = recorded[-1]
+        self.assertEqual(len(hand.hole_cards), 4)
+        self.assertTrue(all(len(cards) == 2 for cards in hand.hole_cards))
+        self.assertEqual(sum(hand.stacks), sum(hand.final_stacks))
+
+    def test_appends_and_streams(self):
+        first = self.record(10, seed=1)
+        second = self.record(15, seed=2, compress=True)
+        reader = read_history(self.path)
+        self.assertEqual(next(reader), first[0])
+        self.assertEqual(sum(1 for _ in reader), 24)
+        self.assertEqual(list(read_history(self.path))[10:], second)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as handle:
+            handle.write(b"not a history")
+        with self.assertRaises(ValueError):
+            next(read_history(self.path))
+        with self.assertRaises(ValueError):
+            HistoryWriter(self.path)
+
+# ----------------- Test Replay -----------------
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.bin")
+        with HistoryWriter(self.path, block_size=1024) as writer:
+            play_hands(build_game(21, recorder=writer), 80, 1000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_recorded_session_replays_identically(self):
+        self.assertEqual(list(verify_history(self.path)), [])
+
+    def test_index_seeks_to_any_hand(self):
+        index = HistoryIndex(self.path)
+        hands = list(read_history(self.path))
+        self.assertEqual(len(index), 80)
+        for number in (0, 37, 79):
+            self.assertEqual(index[number], hands[number])
+        self.assertEqual(list(index.read(70)), hands[70:])
+        with self.assertRaises(IndexError):
+            index[80]
+
+    def test_tampered_hand_is_reported(self):
+        hand = HistoryIndex(self.path)[5]
+        hand.final_stacks[0] += 1
+        with self.assertRaises(ReplayMismatch):
+            replay_hand(hand)
+        hand = HistoryIndex(self.path)[5]
+        hand.actions.pop()
+        with self.assertRaises(ReplayMismatch):
+            replay_hand(hand)
+
+    def test_seeded_session_matches_its_log(self):
+        self.assertIsNone(first_divergence(read_history(self.path), seeded_hands(21, 80)))
+        self.assertEqual(first_divergence(read_history(self.path), seeded_hands(22, 80)), 0)
+
+# ----------------- Test Benchmark Suite -----------------
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_compare_flags_only_slowdowns_past_threshold(self):
+        baseline = {"results": {"a": 1.0, "b": 1.0, "c": 1.0}}
+        results = {"results": {"a": 1.2, "b": 1.5, "c": 0.5, "new": 9.0}}
+        self.assertEqual(bench_suite.compare(results, baseline, 0.25), [("b", 1.5)])
+
+    def test_results_carry_metadata(self):
+        results = bench_suite.run_suite(only="make_betting_decision")
+        self.assertEqual(list(results["results"]), ["make_betting_decision"])
+        self.assertGreater(results["results"]["make_betting_decision"], 0)
+        self.assertIn("python", results["metadata"])
+        json.dumps(results)
+
+# ----------------- Test Profiling -----------------
+class TestProfiling(unittest.TestCase):
+    def test_phases_and_components_are_timed(self):
+        game = build_game(6)
+        self.assertIsNone(game.profiler)
+        profiler = GameProfiler().attach(game)
+        play_hands(game, 5, 1000)
+        for name in ("round", "PRE_FLOP", "SHOWDOWN", "deal", "betting_round", "decision",
+                     "ui_update"):
+            self.assertIn(name, profiler.stats)
+        calls, total, own = profiler.stats["round"]
+        self.assertEqual(calls, 5)
+        self.assertLess(own, total)
+        self.assertIn("PRE_FLOP", profiler.summary())
+        profiler.detach(game)
+        play_hands(game, 2, 1000)
+        self.assertEqual(profiler.stats["round"][0], 5)
+
+    def test_failed_round_closes_its_spans(self):
+        game = build_game(4)
+        profiler = GameProfiler().attach(game)
+        def broken(game, player):
+            raise ValueError("strategy failed")
+        game.players[0].strategy = broken
+        with self.assertRaises(ValueError):
+            game.play_round()
+        self.assertEqual(profiler._stack, [])
+        self.assertEqual(profiler.stats["PRE_FLOP"][0], 1)
+
+    def test_profiled_headless_game_still_fails_fast(self):
+        game = Game()
+        GameProfiler().attach(game)
+        with self.assertRaises(RuntimeError):
+            game.play_game()
+
+    def test_exports_load(self):
+        game = build_game(6)
+        profiler = GameProfiler().attach(game)
+        play_hands(game, 3, 1000)
+        with tempfile.TemporaryDirectory() as directory:
+            trace_path = os.path.join(directory, "trace.json")
+            stats_path = os.path.join(directory, "game.prof")
+            profiler.write_chrome_trace(trace_path)
+            profiler.write_pstats(stats_path)
+            with open(trace_path) as handle:
+                events = json.load(handle)["traceEvents"]
+            self.assertEqual(sum(1 for e in events if e["name"] == "round"), 3)
+            self.assertTrue(all(e["ph"] == "X" and e["dur"] >= 0 for e in events))
+            stats = pstats.Stats(stats_path)
+            self.assertEqual(stats.stats[("game", 0, "round")][1], 3)
+
+# ----------------- Test Tournament -----------------
+class RecordingTournament(Tournament):
+    """Notes the order tables are played in and the largest table seen."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.order = []
+        self.largest = 0
+
+    def step(self, table):
+        self.order.append(table.number)
+        self.largest = max(self.largest, len(table.players))
+        return super().step(table)
+
+class TestTournament(unittest.TestCase):
+    def test_runs_to_a_single_winner(self):
+        tournament = RecordingTournament(40, seats_per_table=6, seed=3)
+        result = tournament.run()
+        self.assertEqual(len(result.finishes), 40)
+        self.assertEqual(len(set(result.finishes)), 40)
+        winner = [p for table in tournament.tables for p in table.players]
+        self.assertEqual(len(winner), 1)
+        self.assertEqual(winner[0].chips, 40 * 1000)
+        self.assertLessEqual(tournament.largest, 6)
+        self.assertEqual(RecordingTournament(40, seats_per_table=6, seed=3).run().finishes,
+                         result.finishes)
+
+    def test_tables_are_interleaved(self):
+        tournament = RecordingTournament(50, seats_per_table=10, seed=1)
+        tournament.play_round()
+        self.assertEqual(tournament.order[:5], [0, 1, 2, 3, 4])
+
+    def test_balancing_and_breaking(self):
+        tournament = Tournament(12, seats_per_table=6, seed=0)
+        first, second = tournament.tables
+        for index in range(3, -1, -1):
+            first.game.remove_player(index)
+        tournament.remaining = 8
+        tournament.rebalance()
+        self.assertEqual(sorted(len(t.players) for t in tournament.tables), [4, 4])
+        for index in range(2):
+            second.game.remove_player(0)
+        tournament.remaining = 6
+        tournament.rebalance()
+        self.assertEqual(sum(t.broken for t in tournament.tables), 1)
+        self.assertEqual(sorted(len(t.players) for t in tournament.tables), [0, 6])
+
+    def test_blinds_follow_the_schedule(self):
+        levels = [BlindLevel(5, 10), BlindLevel(50, 100)]
+        tournament = Tournament(18, seats_per_table=9, levels=levels, rounds_per_level=2, seed=2)
+        tournament.play_round()
+        self.assertEqual(tournament.level, levels[0])
+        tournament.play_round()
+        tournament.play_round()
+        self.assertEqual(tournament.level, levels[1])
+        table = next(t for t in tournament.tables if not t.broken)
+        self.assertEqual(table.game.big_blind, 100)
+
+# ----------------- Test Table Server -----------------
+class LineClient:
+    """Minimal protocol client for the table server tests; reads in the background."""
+
+    async def connect(self, port, name):
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", port)
+        self.messages = []
+        self.cursor = 0
+        self.task = asyncio.ensure_future(self.read())
+        self.send({"type": "join", "name": name})
+        return self
+
+    async def read(self):
+        async for line in self.reader:
+            self.messages.append(json.loads(line))
+
+    def send(self, message):
+        self.writer.write((json.dumps(message) + "\n").encode("utf-8"))
+
+    async def next(self, kind, timeout=5):
+        """Return the next unread message of a type."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while asyncio.get_running_loop().time() < deadline:
+            for index in range(self.cursor, len(self.messages)):
+                if self.messages[index]["type"] == kind:
+                    self.cursor = index + 1
+                    return self.messages[index]
+            await asyncio.sleep(0.005)
+        raise AssertionError(f"no {kind!r} message")
+
+class TestTableServer(unittest.TestCase):
+    def run_server(self, scenario, **options):
+        async def main():
+            server = await TableServer(seed=1, **options).start()
+            try:
+                return await scenario(server)
+            finally:
+                await server.close()
+        return asyncio.run(main())
+
+    def test_bot_swarm_plays_hands(self):
+        async def scenario(server):
+            return await run_swarm("127.0.0.1", server.port, 8, duration=0.5)
+        report = self.run_server(scenario, seats_per_table=4)
+        self.assertEqual(report.bots, 8)
+        self.assertGreater(report.hands, 0)
+        self.assertTrue(report.latencies)
+        self.assertLessEqual(report.percentile(50), report.percentile(99))
+
+    def test_players_are_seated_and_dealt(self):
+        async def scenario(server):
+            ann = await LineClient().connect(server.port, "Ann")
+            bob = await LineClient().connect(server.port, "Bob")
+            return server, await ann.next("seated"), await ann.next("deal"), await bob.next("deal")
+        server, seated, ann_deal, bob_deal = self.run_server(scenario, seats_per_table=2)
+        self.assertEqual(seated["table"], 0)
+        self.assertEqual(len(ann_deal["cards"]), 2)
+        self.assertFalse(set(ann_deal["cards"]) & set(bob_deal["cards"]))
+        self.assertEqual(len(server.tables), 1)
+
+    def test_time_bank_runs_down_then_defaults(self):
+        async def scenario(server):
+            ann = await LineClient().connect(server.port, "Ann")
+            bob = await LineClient().connect(server.port, "Bob")
+            # Nobody answers, so every prompt times out and is played for them.
+            end = await ann.next("end")
+            second = await ann.next("end")
+            return [m for m in ann.messages if m["type"] in ("turn", "acted")], end, second
+        messages, end, second = self.run_server(scenario, seats_per_table=2,
+                                                action_time=0.05, time_bank=0.1)
+        turns = [m["seconds"] for m in messages if m["type"] == "turn"]
+        self.assertAlmostEqual(turns[0], 0.15)
+        self.assertAlmostEqual(turns[-1], 0.05)  # The bank went on the first prompt.
+        self.assertTrue(all(m["action"] in ("check", "fold") for m in messages if m["type"] == "acted"))
+        self.assertEqual(sum(chips for _, chips in end["stacks"]), 2000)
+        self.assertEqual(second["hand"], 1)
+
+    def test_invalid_action_is_reported_and_folded(self):
+        async def scenario(server):
+            clients = [await LineClient().connect(server.port, name) for name in ("Ann", "Bob")]
+            while not any(m["type"] == "turn" for c in clients for m in c.messages):
+                await asyncio.sleep(0.005)
+            actor = next(c for c in clients if any(m["type"] == "turn" for m in c.messages))
+            turn = await actor.next("turn")
+            actor.send({"type": "act", "action": "check"})
+            return turn, await actor.next("error"), await actor.next("acted")
+        turn, error, acted = self.run_server(scenario, seats_per_table=2)
+        self.assertGreater(turn["to_call"], 0)  # Heads-up, the small blind acts first.
+        self.assertIn("not allowed", error["message"])
+        self.assertEqual(acted["action"], "fold")
+
+# ----------------- Test Decision Cache -----------------
+class FakeClock:
+    def __init__(self, step=0.0):
+        self.now = 0.0
+        self.step = step  # Seconds each reading advances the clock.
+
+    def __call__(self):
+        now = self.now
+        self.now += self.step
+        return now
+
+class TestDecisionCache(unittest.TestCase):
+    def test_suit_isomorphic_spots_share_a_key(self):
+        spot = [Card(Rank.ACE, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS)]
+        board = [Card(Rank.TWO, Suit.HEARTS), Card(Rank.SEVEN, Suit.CLUBS), Card(Rank.NINE, Suit.SPADES)]
+        # Swap hearts with diamonds and clubs with spades, and reorder the cards.
+        swap = {Suit.HEARTS: Suit.DIAMONDS, Suit.DIAMONDS: Suit.HEARTS,
+                Suit.CLUBS: Suit.SPADES, Suit.SPADES: Suit.CLUBS}
+        same = [Card(c.rank, swap[c.suit]) for c in reversed(spot)]
+        same_board = [Card(c.rank, swap[c.suit]) for c in reversed(board)]
+        self.assertEqual(situation_key("equity", spot, board, 3), situation_key("equity", same, same_board, 3))
+        offsuit = [Card(Rank.ACE, Suit.HEARTS), Card(Rank.KING, Suit.SPADES)]
+        self.assertNotEqual(canonical_cards(spot, board), canonical_cards(offsuit, board))
+        self.assertNotEqual(situation_key("equity", spot, board, 3), situation_key("equity", spot, board, 4))
+
+    def test_canonical_keys_cover_all_starting_hands(self):
+        keys = {canonical_cards(hand) for hand in combinations(CARDS, 2)}
+        self.assertEqual(len(keys), 169)
+
+    def test_pot_odds_buckets(self):
+        self.assertEqual(pot_odds_bucket(0, 100), 0)
+        self.assertEqual(pot_odds_bucket(50, 50), 5)
+        self.assertEqual(pot_odds_bucket(1000, 0), 9)
+
+    def test_lru_eviction_by_size(self):
+        cache = DecisionCache(max_bytes=300)
+        for key in "abc":
+            cache.put(key, key.upper(), size=100)
+        cache.get("a")  # Now "b" is the least recently used.
+        cache.put("d", "D", size=100)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual([cache.get(k) for k in "acd"], ["A", "C", "D"])
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.size, 300)
+        cache.put("huge", "X", size=1000)
+        self.assertIsNone(cache.get("huge"))
+
+    def test_ttl_and_version(self):
+        clock = FakeClock()
+        cache = DecisionCache(ttl=10, clock=clock, version=("aggression", 1))
+        cache.put("k", 1)
+        clock.now = 9
+        self.assertEqual(cache.get("k"), 1)
+        clock.now = 10
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.expirations, 1)
+        cache.put("k", 2)
+        cache.set_version(("aggression", 1))
+        self.assertEqual(cache.get("k"), 2)
+        cache.set_version(("aggression", 2))
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual((len(cache), cache.size, cache.invalidations), (0, 0, 1))
+
+    def test_metrics(self):
+        cache = DecisionCache()
+        calls = []
+        for _ in range(4):
+            cache.get_or_compute("spot", lambda: calls.append(1) or 0.5)
+        stats = cache.stats()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (3, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.75)
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_concurrent_misses_compute_once(self):
+        cache = DecisionCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "value"
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+                   for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 4)
+
+# ----------------- Test Postflop AI -----------------
+class TestPostflopAI(unittest.TestCase):
+    DEADLINE = 0.01
+    # Allowance for real-time checks, so a loaded machine does not fail them.
+    SLACK = 0.25
+
+    def setUp(self):
+        AI_CACHE.clear()
+        self.sink = BufferedSink()
+        self.game = Game(ui=self.sink, ai_deadline=self.DEADLINE)  # Builds the evaluator tables.
+        self.player = self.game.players[1]
+        self.player.hand = [Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS)]
+        self.game.community_cards = [Card(Rank.ACE, Suit.CLUBS), Card(Rank.SEVEN, Suit.DIAMONDS),
+                                     Card(Rank.TWO, Suit.SPADES)]
+        self.game.current_bet = 20
+        self.key = situation_key("equity", self.player.hand, self.game.community_cards, 3)
+
+    def test_anytime_equity_stops_at_the_deadline(self):
+        # Every reading advances the clock 1/1024 s, so each batch seems to take that long.
+        spot = ([self.player.hand, [], []], self.game.community_cards)
+        full = anytime_equity(*spot, 10 / 1024, rng=random.Random(1), clock=FakeClock(1 / 1024))
+        self.assertEqual(full.iterations, 5 * 16)
+        self.assertGreater(full.players[0].equity, 0.85)
+        # The last batch is cut to the runouts that fit before the deadline.
+        cut = anytime_equity(*spot, 8.5 / 1024, rng=random.Random(1), clock=FakeClock(1 / 1024))
+        self.assertEqual(cut.iterations, 4 * 16 + 8)
+        late = anytime_equity(*spot, -1.0, clock=FakeClock(1 / 1024))
+        self.assertEqual(late.iterations, 0)
+
+    def test_anytime_equity_keeps_to_a_real_deadline(self):
+        deadline = time.perf_counter() + self.DEADLINE
+        result = anytime_equity([self.player.hand, [], []], self.game.community_cards, deadline)
+        self.assertLess(time.perf_counter(), deadline + self.SLACK)
+        self.assertGreaterEqual(result.iterations, 16)
+
+    def test_postflop_decision_reports_samples_within_budget(self):
+        report = make_betting_decision(self.game, self.player, deadline=self.DEADLINE)
+        self.assertGreater(report.samples, 0)
+        self.assertFalse(report.cached)
+        self.assertLess(report.seconds, self.DEADLINE + self.SLACK)
+        self.assertGreater(report.equity, 0.8)
+        self.assertIn(f"{report.samples} samples", self.sink.messages[0])
+        self.assertGreater(self.player.current_bet, 0)  # Top set raises.
+
+    def test_settled_estimate_serves_suit_isomorphic_spot(self):
+        AI_CACHE.put(self.key, (0.97, SETTLED_SAMPLES))
+        player = self.game.players[2]
+        player.hand = [Card(Rank.ACE, Suit.DIAMONDS), Card(Rank.ACE, Suit.SPADES)]
+        # Spades -> diamonds -> hearts -> spades, clubs unchanged, board reordered.
+        self.game.community_cards = [Card(Rank.TWO, Suit.DIAMONDS), Card(Rank.ACE, Suit.CLUBS),
+                                     Card(Rank.SEVEN, Suit.HEARTS)]
+        hits = AI_CACHE.hits
+        report = make_betting_decision(self.game, player, deadline=self.DEADLINE)
+        self.assertTrue(report.cached)
+        self.assertEqual((report.equity, report.samples), (0.97, SETTLED_SAMPLES))
+        self.assertEqual(AI_CACHE.hits, hits + 1)
+
+    def test_thin_estimate_is_refined(self):
+        AI_CACHE.put(self.key, (0.5, 16))
+        report = make_betting_decision(self.game, self.player, deadline=self.DEADLINE)
+        self.assertFalse(report.cached)
+        self.assertGreater(report.samples, 16)
+        self.assertGreater(report.equity, 0.5)  # Pooled with runouts of a ~95% spot.
+        self.assertEqual(AI_CACHE.get(self.key), (report.equity, report.samples))
+
+    def test_without_deadline_board_is_ignored(self):
+        report = make_betting_decision(self.game, self.player)
+        self.assertEqual(report.samples, 0)
+        self.assertEqual(len(AI_CACHE), 0)
+
+    def test_game_ai_uses_its_deadline(self):
+        game = Game(ui=self.sink, rng=random.Random(5), ai_deadline=0.002)
+        game.players[0].is_ai = True
+        for _ in range(5):
+            game.play_round()
+        self.assertTrue(any("samples in" in message or "cached" in message
+                            for message in self.sink.messages))
+
+# ----------------- Test Opponent Ranges -----------------
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestRanges(unittest.TestCase):
+    RIVER = [Card(Rank.TWO, Suit.CLUBS), Card(Rank.FIVE, Suit.DIAMONDS), Card(Rank.NINE, Suit.HEARTS),
+             Card(Rank.QUEEN, Suit.SPADES), Card(Rank.QUEEN, Suit.HEARTS)]
+
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+
+    def test_range_vs_range_matches_brute_force(self):
+        hero, villain = Range(self.rng.random(NUM_COMBOS)), Range(self.rng.random(NUM_COMBOS))
+        strengths = combo_strengths(self.RIVER).tolist()
+        live = [i for i, s in enumerate(strengths) if s >= 0]
+        won = shared = 0.0
+        for i in live:
+            for j in live:
+                if set(COMBOS[i].tolist()) & set(COMBOS[j].tolist()):
+                    continue
+                weight = hero.weights[i] * villain.weights[j]
+                shared += weight
+                won += weight * ((strengths[i] > strengths[j]) + (strengths[i] == strengths[j]) / 2)
+        self.assertAlmostEqual(range_vs_range(hero, villain, self.RIVER), won / shared, places=9)
+
+    def test_uniform_range_matches_exact_equity(self):
+        hole = [Card(Rank.ACE, Suit.SPADES), Card(Rank.KING, Suit.SPADES)]
+        for board in (self.RIVER, self.RIVER[:4]):
+            expected = exact_equity([hole, ()], board).result().players[0].equity
+            self.assertAlmostEqual(range_vs_hand(Range(), hole, board, max_runouts=None), expected,
+                                   places=9)
+
+    def test_narrowing_favours_strong_hands(self):
+        percentiles = hand_percentiles(self.RIVER)
+        raiser = Range()
+        raiser.remove(self.RIVER)
+        raiser.narrow("raise", percentiles, size=1.0)
+        quads = combo_index(Card(Rank.QUEEN, Suit.CLUBS), Card(Rank.QUEEN, Suit.DIAMONDS))
+        air = combo_index(Card(Rank.THREE, Suit.CLUBS), Card(Rank.FOUR, Suit.DIAMONDS))
+        self.assertGreater(raiser.weights[quads], 10 * raiser.weights[air])
+        self.assertEqual(raiser.top(1)[0][0], "Q♣ Q♦")
+        hole = [Card(Rank.KING, Suit.CLUBS), Card(Rank.NINE, Suit.CLUBS)]
+        self.assertLess(range_vs_hand(raiser, hole, self.RIVER), range_vs_hand(Range(), hole, self.RIVER))
+
+    def test_full_range_river_query_takes_milliseconds(self):
+        hero, villain = Range(), Range(self.rng.random(NUM_COMBOS))
+        timings = []
+        for _ in range(5):  # The fastest run, so a loaded machine does not fail it.
+            start = time.perf_counter()
+            range_vs_range(hero, villain, self.RIVER)
+            timings.append(time.perf_counter() - start)
+        self.assertLess(min(timings), 0.05)
+
+    def turn_spot(self, clock):
+        game = Game()
+        for player in game.players[2:]:
+            player.folded = True
+        hero = game.players[1]
+        hero.hand = [Card(Rank.ACE, Suit.SPADES), Card(Rank.KING, Suit.SPADES)]
+        game.community_cards = self.RIVER[:4]
+        RangeTracker(clock=clock).attach(game)
+        return game, hero
+
+    def test_hand_equity_keeps_to_its_deadline(self):
+        # Every reading advances the clock 1/1024 s, so each batch seems to take that long.
+        game, hero = self.turn_spot(FakeClock(1 / 1024))
+        equity, runouts = game.ranges.hand_equity(game, hero, 1000 / 1024)
+        self.assertEqual(runouts, 46)  # Time for every river: the exact equity.
+        self.assertAlmostEqual(equity, range_vs_hand(Range(), hero.hand, game.community_cards, None),
+                               places=9)
+        game, hero = self.turn_spot(FakeClock(1 / 1024))
+        _, runouts = game.ranges.hand_equity(game, hero, 9 / 1024)
+        self.assertTrue(1 < runouts < 46)
+        self.assertIsNone(game.ranges.hand_equity(game, hero, -1.0))
+
+    def test_tracker_follows_the_game_rng(self):
+        logs = []
+        for _ in range(2):
+            sink = BufferedSink()
+            game = Game(ui=sink, rng=random.Random(11))
+            game.players[0].is_ai = True
+            RangeTracker().attach(game)
+            for _ in range(3):
+                game.play_round()
+            logs.append([message.split(" in ")[0] for message in sink.messages])
+        self.assertEqual(logs[0], logs[1])
+
+    def test_tracker_narrows_ranges_and_drives_the_ai(self):
+        sink = BufferedSink()
+        game = Game(ui=sink, rng=random.Random(3))
+        game.players[0].is_ai = True
+        tracker = RangeTracker(rng=random.Random(1)).attach(game)
+        for _ in range(5):
+            game.play_round()
+        self.assertTrue(any("against ranges" in message for message in sink.messages))
+        self.assertTrue(any(np.ptp(r.weights) > 0 for r in tracker.ranges.values()))
+        tracker.detach(game)
+        self.assertIsNone(game.ranges)
+        self.assertNotIn("decide", game.__dict__)
+
+# ----------------- Test Startup Cost -----------------
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+# Cumulative microseconds 'import game' may take; it was ~90 ms with Tk and PIL.
+IMPORT_BUDGET_US = 250000
+UI_MODULES = {"tkinter", "_tkinter", "PIL", "ui", "card_images"}
+
+class TestStartupCost(unittest.TestCase):
+    def import_game(self):
+        # -X importtime reports "self | cumulative | module" per import on stderr.
+        run = subprocess.run([sys.executable, "-X", "importtime", "-c", "import game"],
+                             cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        timings = {}
+        for line in run.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, cumulative, name = line[len("import time:"):].split("|")
+                if cumulative.strip().isdigit():
+                    timings[name.strip()] = int(cumulative)
+        return timings
+
+    def test_import_game_skips_ui_dependencies(self):
+        timings = self.import_game()
+        self.assertIn("game", timings)
+        loaded = {name.split(".")[0] for name in timings}
+        self.assertFalse(loaded & UI_MODULES, f"headless import loaded {sorted(loaded & UI_MODULES)}")
+
+    def test_import_game_within_budget(self):
+        # Best of three runs, so one slow start on a busy machine does not fail the test.
+        best = min(self.import_game()["game"] for _ in range(3))
+        self.assertLess(best, IMPORT_BUDGET_US)
+
+# ----------------- Test Preflop Table -----------------
+class TestPreflopTable(unittest.TestCase):
+    def tearDown(self):
+        preflop.load_table()
+
+    def test_classes_cover_all_starting_hands(self):
+        classes = Counter(preflop.hand_class(a, b) for a, b in combinations(CARDS, 2))
+        self.assertEqual(len(classes), 169)
+        self.assertEqual(sorted(set(classes.values())), [4, 6, 12])
+        for index in range(169):
+            self.assertEqual(preflop.hand_class(*preflop.class_representative(index)), index)
+        self.assertEqual(preflop.hand_class_name(preflop.hand_class(
+            Card(Rank.KING, Suit.CLUBS), Card(Rank.ACE, Suit.CLUBS))), "AKs")
+
+    def test_lookup_orders_hands(self):
+        aces = preflop.preflop_equity(Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS))
+        trash = preflop.preflop_equity(Card(Rank.SEVEN, Suit.SPADES), Card(Rank.TWO, Suit.HEARTS))
+        self.assertAlmostEqual(aces, 0.85, delta=0.01)
+        self.assertLess(trash, 0.4)
+        four_way = preflop.preflop_equity(Card(Rank.ACE, Suit.SPADES), Card(Rank.ACE, Suit.HEARTS), 4)
+        self.assertLess(four_way, aces)
+
+    def test_file_round_trip_and_version_check(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.bin")
+            preflop.write_table(list(range(169)), path, player_counts=(2,))
+            preflop.load_table(path)
+            self.assertEqual(preflop.preflop_equity(Card(Rank.KING, Suit.SPADES),
+                                                    Card(Rank.KING, Suit.HEARTS), 6),
+                             14 / preflop.EQUITY_SCALE)
+            with open(path, "r+b") as handle:
+                handle.seek(4)
+                handle.write(struct.pack("<H", preflop.TABLE_VERSION + 1))
+            with self.assertRaises(ValueError):
+                preflop.load_table(path)
+
+# ----------------- Test Card Image Cache -----------------
+@unittest.skipUnless(Image is not None, "Pillow is not installed")
+class TestCardImageCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for key in list(range(52)) + [CARD_BACK]:
+            Image.new("RGB", (12, 18)).save(os.path.join(self.directory.name, image_filename(key)))
+        self.cache = CardImageCache(self.directory.name, size=(6, 9), photo_factory=lambda image: image)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_redraws_do_not_touch_disk(self):
+        card = Card(Rank.ACE, Suit.SPADES)
+        first = self.cache.get(card)
+        self.assertEqual(first.size, (6, 9))
+        for _ in range(5):
+            self.assertIs(self.cache.get(card), first)
+        self.assertEqual(self.cache.stats(), {"hits": 5, "misses": 1, "disk_loads": 1})
+
+    def test_background_preload_decodes_every_image(self):
+        self.cache.preload(background=True).join()
+        self.assertEqual(self.cache.disk_loads, 53)
+        self.cache.get(None)
+        self.cache.get(Card(Rank.TWO, Suit.HEARTS))
+        self.assertEqual(self.cache.disk_loads, 53)
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_concurrent_decodes_of_one_image_hit_disk_once(self):
+        card = Card(Rank.KING, Suit.CLUBS)
+        opened = threading.Event()
+        release = threading.Event()
+        original_open = Image.open
+        def slow_open(path):
+            opened.set()
+            release.wait(5)
+            return original_open(path)
+        Image.open = slow_open
+        try:
+            loader = threading.Thread(target=self.cache._decode, args=(card.code, (6, 9)))
+            loader.start()
+            opened.wait(5)
+            waiter = threading.Thread(target=self.cache.get, args=(card,))
+            waiter.start()
+            waiter.join(0.05)  # Let the Tk-side lookup reach the same key mid-decode.
+            release.set()
+            loader.join(5)
+            waiter.join(5)
+        finally:
+            Image.open = original_open
+        self.assertEqual(self.cache.disk_loads, 1)
+
+    def test_missing_image_is_cached_as_none(self):
+        cache = CardImageCache(os.path.join(self.directory.name, "missing"), photo_factory=lambda image: image)
+        self.assertIsNone(cache.get(None))
+        self.assertIsNone(cache.get(None))
+        self.assertEqual(cache.disk_loads, 1)
+
+# ----------------- Test Incremental Canvas Rendering -----------------
+class RecordingCanvas:
+    """Stands in for tk.Canvas and records the item operations it receives."""
+    def __init__(self):
+        self.calls = []
+        self.next_id = 0
+
+    def _create(self, name):
+        self.calls.append(name)
+        self.next_id += 1
+        return self.next_id
+
+    def create_image(self, *args, **kwargs):
+        return self._create("create")
+
+    def create_rectangle(self, *args, **kwargs):
+        return self._create("create")
+
+    def create_text(self, *args, **kwargs):
+        return self._create("create")
+
+    def itemconfigure(self, item, **kwargs):
+        self.calls.append("configure")
+
+    def move(self, item, dx, dy):
+        self.calls.append("move")
+
+    def delete(self, *items):
+        self.calls.append("delete")
+
+class TestCardSlots(unittest.TestCase):
+    def setUp(self):
+        self.canvas = RecordingCanvas()
+        self.slots = CardSlots(self.canvas)
+
+    def deal(self, faces):
+        for index, face in enumerate(faces):
+            self.slots.place(index, "image", 10 + 70 * index, 30, face)
+        self.slots.retain(range(len(faces)))
+
+    def test_turn_only_creates_new_card(self):
+        self.deal(["a", "b", "c"])
+        self.canvas.calls.clear()
+        self.deal(["a", "b", "c", "d"])
+        self.assertEqual(self.canvas.calls, ["create"])
+
+    def test_unchanged_redraw_is_free(self):
+        self.deal(["a", "b"])
+        self.canvas.calls.clear()
+        self.deal(["a", "b"])
+        self.assertEqual(self.canvas.calls, [])
+
+    def test_reveal_swaps_image_and_new_round_trims(self):
+        self.deal(["back", "back", "c", "d", "e"])
+        self.canvas.calls.clear()
+        self.deal(["x", "back", "c"])
+        self.assertEqual(sorted(self.canvas.calls), ["configure", "delete", "delete"])
+
+    def test_kind_change_recreates_slot(self):
+        self.slots.place(0, "image", 0, 0, "face")
+        self.slots.place(0, "card", 0, 0, "A♠", size=(120, 180))
+        self.assertEqual(self.canvas.calls, ["create", "delete", "create", "create"])
+
+# ----------------- Test Game Log -----------------
+class TestGameLog(unittest.TestCase):
+    def test_messages_are_batched(self):
+        log = GameLog(max_lines=10)
+        self.assertTrue(log.append("David raises."))
+        self.assertFalse(log.append("Frank calls."))
+        text = log.drain()
+        self.assertEqual(text.count("\n"), 2)
+        self.assertTrue(text.endswith("Frank calls.\n"))
+        self.assertEqual(log.drain(), "")
+        self.assertTrue(log.append("Keith folds."))
+
+    def test_memory_is_bounded_and_history_spills(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.log")
+            log = GameLog(max_lines=5, spill_path=path)
+            for i in range(50):
+                log.append(f"message {i}")
+                if i % 7 == 0:
+                    log.drain()
+            log.drain()
+            log.close()
+            self.assertEqual(log.shown, 50)
+            self.assertEqual(log.take_overflow(), 45)
+            self.assertEqual(log.shown, 5)
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(len(handle.readlines()), 50)
+
+    def test_close_writes_undrained_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.log")
+            log = GameLog(spill_path=path)
+            log.append("Alice wins 120 chips.")
+            log.close()
+            log.close()
+            with open(path, encoding="utf-8") as handle:
+                self.assertTrue(handle.read().endswith("Alice wins 120 chips.\n"))
+
+# ----------------- Test UI Bridge -----------------
+class FakeRoot:
+    """Collects after() callbacks so a test can play the Tk thread."""
+    def __init__(self):
+        self.scheduled = []
+        self.destroyed = False
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def destroy(self):
+        self.destroyed = True
+
+class ScriptedUI(BufferedSink):
+    """Answers every prompt from a script; records the thread each call runs on."""
+    def __init__(self, answers):
+        super().__init__()
+        self.answers = list(answers)
+        self.threads = set()
+
+    def append_log(self, message):
+        self.threads.add(threading.get_ident())
+        super().append_log(message)
+
+    def request_action(self, prompt, options, on_choice):
+        self.threads.add(threading.get_ident())
+        on_choice(self.answers.pop(0))
+
+    def request_amount(self, prompt, min_value, max_value, on_amount):
+        on_amount(self.answers.pop(0))
+
+class TestUIBridge(unittest.TestCase):
+    def pump_until_done(self, root, worker):
+        # Run the pump on this thread, standing in for the Tk event loop.
+        # One extra pass runs whatever the worker queued before it exited.
+        alive = True
+        while alive:
+            alive = worker.is_alive()
+            callbacks, root.scheduled = root.scheduled, []
+            for callback in callbacks:
+                callback()
+
+    def test_prompts_are_answered_on_the_ui_thread(self):
+        root = FakeRoot()
+        ui = ScriptedUI(["raise", 40])
+        bridge = UIBridge(ui, root, poll_ms=0)
+        answers = []
+        def game_thread():
+            bridge.append_log("David raises.")
+            answers.append(bridge.prompt_action("Choose action:", ["call", "raise", "fold"]))
+            answers.append(bridge.prompt_amount("Raise by:", 1, 100))
+        worker = threading.Thread(target=game_thread)
+        bridge.pump()
+        worker.start()
+        worker.join(0.01)
+        self.pump_until_done(root, worker)
+        self.assertEqual(answers, ["raise", 40])
+        self.assertEqual(ui.threads, {threading.get_ident()})
+        self.assertEqual(list(ui.messages), ["David raises."])
+
+    def test_run_game_plays_off_the_ui_thread_and_closes_the_window(self):
+        root = FakeRoot()
+        ui = ScriptedUI(["no"])
+        game = Game()
+        game.players = [p for p in game.players if not p.is_ai]
+        worker = run_game(game, root, ui_factory=lambda _root: ui)
+        self.pump_until_done(root, worker)
+        self.assertFalse(worker.is_alive())
+        self.assertTrue(root.destroyed)
+        self.assertIs(game.ui.ui, ui)
+
+    def test_headless_play_game_fails_fast(self):
+        game = Game()
+        with self.assertRaises(RuntimeError):
+            game.play_game()
+        with self.assertRaises(RuntimeError):
+            game.ui.prompt_action("Choose action:", ["check", "bet", "fold"])
+
 # ----------------- Test AI Decision Logic -----------------
 class TestAIDecision(unittest.TestCase):
     def setUp(self):
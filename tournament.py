@@ -0,0 +1,246 @@
+"""
+This module runs a multi-table tournament on headless Game instances.
+
+Every table is an ordinary Game with its own seeded shuffle and a NullSink.
+The scheduler plays one hand at each table in turn, so all tables advance
+together, and blinds rise by the schedule as rounds are completed. Busted
+players leave their table after each hand; tables are then balanced to
+within one player of each other and broken as soon as the remaining players
+fit on one fewer table, until a single player holds every chip.
+
+The per-hand work is one round-robin step, and balancing only runs after a
+hand in which someone busted, so the cost per hand does not grow with the
+number of tables.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List
+from ai import make_betting_decision
+from events import NullSink
+from game import Game
+from hand_evaluator import lookup_tables
+from player import Player
+from simulation import HandRate
+
+@dataclass
+class BlindLevel:
+    """
+    One level of the blind schedule.
+
+    Attributes:
+        small_blind (int): Small blind for the level.
+        big_blind (int): Big blind for the level.
+    """
+    small_blind: int
+    big_blind: int
+
+DEFAULT_LEVELS = [BlindLevel(small, small * 2) for small in
+                  (5, 10, 15, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000)]
+
+@dataclass
+class Table:
+    """
+    A table in the tournament.
+
+    Attributes:
+        number (int): Table number, from 0.
+        game (Game): The game played at this table.
+        broken (bool): Whether the table has been broken up.
+    """
+    number: int
+    game: Game
+    broken: bool = False
+
+    @property
+    def players(self):
+        return self.game.players
+
+@dataclass
+class TournamentResult(HandRate):
+    """
+    Outcome of a tournament.
+
+    Attributes:
+        finishes (List[str]): Player names from the winner to the first out.
+        hands (int): Hands played across all tables.
+        rounds (int): Scheduler rounds (one hand per active table each).
+        seconds (float): Wall time of the run.
+        tables (int): Tables at the start.
+    """
+    finishes: List[str]
+    hands: int
+    rounds: int
+    seconds: float
+    tables: int = 0
+
+class Tournament:
+    """
+    A freezeout tournament spread over as many tables as the field needs.
+
+    Attributes:
+        tables (List[Table]): Every table, including broken ones.
+        eliminated (List[Player]): Busted players, first out first.
+        level (BlindLevel): The current blind level.
+        hands (int): Hands played so far.
+        rounds (int): Scheduler rounds completed so far.
+        remaining (int): Players still in the tournament.
+    """
+
+    def __init__(self, num_players, seats_per_table=9, starting_chips=1000,
+                 levels=None, rounds_per_level=10, seed=None, strategy=None):
+        """
+        Args:
+            num_players (int): Entrants; at least two.
+            seats_per_table (int): Maximum players at one table (2 to 10).
+            starting_chips (int): Stack every entrant starts with.
+            levels (List[BlindLevel] or None): Blind schedule; the last level
+                stays in force once reached. Defaults to DEFAULT_LEVELS.
+            rounds_per_level (int): Scheduler rounds played at each level.
+            seed (int or None): Seed for every table's shuffle.
+            strategy (Callable or None): Decision callback for every player;
+                defaults to the rule-based AI.
+
+        Raises:
+            ValueError: If there are fewer than two players or the seat count
+                is out of range.
+        """
+        if num_players < 2:
+            raise ValueError("A tournament needs at least two players.")
+        if not 2 <= seats_per_table <= 10:
+            raise ValueError("Tables seat between two and ten players.")
+        self.seats = seats_per_table
+        self.levels = levels or DEFAULT_LEVELS
+        self.rounds_per_level = rounds_per_level
+        self.level = self.levels[0]
+        self.hands = 0
+        self.rounds = 0
+        self.eliminated = []
+        self.remaining = num_players
+        seed = random.getrandbits(64) if seed is None else seed
+        players = [Player(f"Player {i + 1}", [], starting_chips, True,
+                          strategy=strategy or make_betting_decision)
+                   for i in range(num_players)]
+        num_tables = -(-num_players // seats_per_table)
+        self.tables = []
+        for number in range(num_tables):
+            game = Game(ui=NullSink(), rng=random.Random(f"{seed}:{number}"))
+            # Deal players round the tables so they start balanced.
+            game.players = players[number::num_tables]
+            self.tables.append(Table(number, game))
+        self._active = list(self.tables)
+
+    def step(self, table):
+        """
+        Play one hand at a table and remove the players it busted.
+
+        Returns:
+            bool: True if anyone busted in this hand.
+        """
+        game = table.game
+        game.small_blind = self.level.small_blind
+        game.big_blind = self.level.big_blind
+        before = {id(p): p.chips for p in game.players}
+        game.play_round()
+        self.hands += 1
+        busted = [p for p in game.players if p.chips <= 0]
+        # Players busted in the same hand finish in order of their stacks before it.
+        busted.sort(key=lambda p: before[id(p)])
+        for player in busted:
+            game.remove_player(next(i for i, p in enumerate(game.players) if p is player))
+            self.eliminated.append(player)
+        self.remaining -= len(busted)
+        return bool(busted)
+
+    def _seat(self, player, table):
+        table.players.append(player)
+
+    def rebalance(self):
+        """
+        Break tables the field no longer needs and even out the rest.
+
+        A table is broken while the remaining players fit on one fewer table;
+        its players go to the tables with the fewest players. Players then
+        move from the fullest to the emptiest table until no two tables differ
+        by more than one player.
+        """
+        active = self._active
+        while len(active) > 1 and self.remaining <= (len(active) - 1) * self.seats:
+            smallest = min(active, key=lambda table: len(table.players))
+            active.remove(smallest)
+            smallest.broken = True
+            for player in smallest.players:
+                self._seat(player, min(active, key=lambda table: len(table.players)))
+            smallest.players.clear()
+        while len(active) > 1:
+            fullest = max(active, key=lambda table: len(table.players))
+            emptiest = min(active, key=lambda table: len(table.players))
+            if len(fullest.players) - len(emptiest.players) <= 1:
+                break
+            # Move the player who would post the big blind next; it keeps the
+            # button where it is at the table being left.
+            index = (fullest.game.dealer_idx + 3) % len(fullest.players)
+            player = fullest.game.remove_player(index)
+            self._seat(player, emptiest)
+
+    def play_round(self):
+        """Play one hand at every active table, interleaved table by table."""
+        for table in list(self._active):
+            if table.broken or len(table.players) < 2:
+                continue
+            if self.step(table):
+                self.rebalance()
+            if self.remaining < 2:
+                break
+        self.rounds += 1
+        level = min(self.rounds // self.rounds_per_level, len(self.levels) - 1)
+        self.level = self.levels[level]
+
+    def run(self):
+        """
+        Play until one player has every chip.
+
+        Returns:
+            TournamentResult: Finishing order and throughput.
+        """
+        start = time.perf_counter()
+        while self.remaining > 1:
+            self.play_round()
+        winners = [p for table in self._active for p in table.players]
+        finishes = [p.name for p in winners + self.eliminated[::-1]]
+        return TournamentResult(finishes, self.hands, self.rounds,
+                                time.perf_counter() - start, len(self.tables))
+
+def memory_per_table(num_tables, seats_per_table=9):
+    """Return the bytes allocated per table when setting up a tournament."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tournament = Tournament(num_tables * seats_per_table, seats_per_table, seed=0)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / len(tournament.tables)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run multi-table tournaments and report throughput.")
+    parser.add_argument("tables", type=int, nargs="+", help="table counts to run")
+    parser.add_argument("--seats", type=int, default=9)
+    parser.add_argument("--rounds", type=int, default=None,
+                        help="stop after this many rounds instead of playing to a winner")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(f"{'tables':>8}{'hands':>10}{'hands/sec':>12}{'bytes/table':>13}")
+    lookup_tables()  # Keep one-time table construction out of the first run.
+    for count in args.tables:
+        tournament = Tournament(count * args.seats, args.seats, seed=args.seed)
+        start = time.perf_counter()
+        if args.rounds is None:
+            tournament.run()
+        else:
+            for _ in range(args.rounds):
+                tournament.play_round()
+        rate = tournament.hands / (time.perf_counter() - start)
+        print(f"{count:>8}{tournament.hands:>10}{rate:>12.0f}"
+              f"{memory_per_table(count, args.seats):>13.0f}")
@@ -3,22 +3,33 @@ This module implements a basic UI using Tkinter for interacting with the poker g
 It creates a window for displaying game information and capturing player actions.
 """
 
-import os
-from PIL import Image, ImageTk
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+from card_images import CardImageCache
+from card_slots import CardSlots
+from game_log import GameLog
 
 class GameUI:
-    def __init__(self, root):
+    def __init__(self, root, asset_dir=None, preload_images=True, log_lines=200, log_file=None):
         """
         Initialize the game UI by creating a toplevel window.
         
         Args:
             root (tk.Tk): The main Tkinter root window.
+            asset_dir (str or None): Directory of card images; see CardImageCache.
+            preload_images (bool): Decode all card images in a background thread
+                at startup.
+            log_lines (int): Maximum lines kept in the game log panel.
+            log_file (str or None): File that receives the full log history.
         """
         self.root = root
+        self.images = CardImageCache(asset_dir, self.IMAGE_SIZE)
+        if preload_images:
+            self.images.preload(background=True)
         self.top = tk.Toplevel(root)
         self.top.title("Texas Hold'em Poker")
+        # The root window stays hidden, so closing this window ends the app.
+        self.top.protocol("WM_DELETE_WINDOW", root.destroy)
         self.style = ttk.Style(self.top)
         self.style.theme_use("clam")
         
@@ -45,6 +56,7 @@ class GameUI:
         ttk.Label(self.table_frame, text="Community Cards:", font=("Helvetica", 12, "bold")).grid(row=0, column=0, sticky="W")
         self.community_canvas = tk.Canvas(self.table_frame, width=500, height=150, bg="#35654d")
         self.community_canvas.grid(row=1, column=0, padx=5, pady=5)
+        self.community_slots = CardSlots(self.community_canvas)
         
         # AI frame for AI hands.
         self.ai_frame = ttk.Frame(self.main_frame, padding="5", relief="groove")
@@ -52,6 +64,7 @@ class GameUI:
         ttk.Label(self.ai_frame, text="AI Hands:", font=("Helvetica", 12, "bold")).grid(row=0, column=0, sticky="W")
         self.ai_canvas = tk.Canvas(self.ai_frame, width=500, height=150, bg="#2e2e2e")
         self.ai_canvas.grid(row=1, column=0, padx=5, pady=5)
+        self.ai_slots = CardSlots(self.ai_canvas)
         
         # Player frame for human player's cards.
         self.player_frame = ttk.Frame(self.main_frame, padding="5", relief="groove")
@@ -59,11 +72,11 @@ class GameUI:
         ttk.Label(self.player_frame, text="Your Hand:", font=("Helvetica", 12, "bold")).grid(row=0, column=0, sticky="W")
         self.player_canvas = tk.Canvas(self.player_frame, width=500, height=120, bg="#1b1b1b")
         self.player_canvas.grid(row=1, column=0, padx=5, pady=5)
+        self.player_slots = CardSlots(self.player_canvas)
         
         # Action frame for buttons and betting input.
         self.action_frame = ttk.Frame(self.main_frame, padding="5")
         self.action_frame.grid(row=4, column=0, sticky="EW", pady=5)
-        self.action_var = tk.StringVar()
         
         self.input_frame = ttk.Frame(self.main_frame, padding="5")
         self.input_frame.grid(row=5, column=0, sticky="EW", pady=5)
@@ -79,6 +92,8 @@ class GameUI:
         self.log_scrollbar = ttk.Scrollbar(self.log_frame, orient="vertical", command=self.log_text.yview)
         self.log_scrollbar.grid(row=1, column=1, sticky="ns")
         self.log_text.configure(yscrollcommand=self.log_scrollbar.set)
+        self.log = GameLog(log_lines, log_file)
+        self.top.bind("<Destroy>", self._on_destroy)
         # Remove the status_frame that was duplicating info.
         # Adjust grid rows: now total rows=7.
         for i in range(7):
@@ -89,50 +104,34 @@ class GameUI:
     IMAGE_SIZE = (120, 180)  # Use higher-res images (width, height)
 
     def load_card_image(self, card):
-        base_path = "/Users/ahmedikram/GitHub Repos/Texas-Holdem-Poker-Game/assets/cards"
-        filename = f"{card.rank.name.lower()}_of_{card.suit.name.lower()}.png"
-        full_path = os.path.join(base_path, filename)
-        try:
-            image = Image.open(full_path).resize(self.IMAGE_SIZE)  # Use high-res images
-            return ImageTk.PhotoImage(image)
-        except Exception:
-            return None
+        # Served from the image cache; only the first use of a card touches disk.
+        return self.images.get(card)
 
     def load_card_back(self):
         # Attempt to load a generic card back image.
-        base_path = "/Users/ahmedikram/GitHub Repos/Texas-Holdem-Poker-Game/assets/cards"
-        full_path = os.path.join(base_path, "card_back.png")
-        try:
-            image = Image.open(full_path).resize(self.IMAGE_SIZE)  # Use high-res card back
-            return ImageTk.PhotoImage(image)
-        except Exception:
-            return None
+        return self.images.get(None)
 
-    def _display_cards(self, canvas, cards, x_offset=10, y_offset=None):
-        canvas.delete("all")
-        canvas.images = []  # Clear previous images.
+    def _display_cards(self, slots, cards, x_offset=10, y_offset=None):
+        # Only slots whose card changed are touched; earlier cards stay as drawn.
         width, height = self.IMAGE_SIZE
         if y_offset is None:
-            y_offset = (int(canvas["height"]) - height) // 2
+            y_offset = (int(slots.canvas["height"]) - height) // 2
         x = x_offset
-        for card in cards:
+        for index, card in enumerate(cards):
             img = self.load_card_image(card)
             if img:
-                canvas.create_image(x, y_offset, anchor="nw", image=img)
-                canvas.images.append(img)
+                slots.place(index, "image", x, y_offset, img)
             else:
-                # Draw a white rectangle card with black border and show card text.
-                canvas.create_rectangle(x, y_offset, x + width, y_offset + height, fill="white", outline="black")
-                canvas.create_text(x + width/2, y_offset + height/2, text=str(card), font=("Helvetica", 14), fill="black")
+                slots.place(index, "card", x, y_offset, str(card), size=(width, height))
             x += 70
-        canvas.update_idletasks()
+        slots.retain(range(len(cards)))
 
     def display_community_cards(self, cards):
         # Use a fixed y_offset (e.g., 30) for community cards.
-        self._display_cards(self.community_canvas, cards, x_offset=10, y_offset=30)
+        self._display_cards(self.community_slots, cards, x_offset=10, y_offset=30)
 
     def display_player_hand(self, cards):
-        self._display_cards(self.player_canvas, cards)
+        self._display_cards(self.player_slots, cards)
 
     def display_ai_hands(self, ai_cards, reveal_all=False):
         """
@@ -142,37 +141,46 @@ class GameUI:
           - Active AI (folded==False): show card back images.
           - Folded AI (folded==True): reveal actual cards.
         If reveal_all is True, reveal actual cards for all AI.
+        Only slots whose name, card face or position changed are redrawn.
         """
-        self.ai_canvas.delete("all")
-        self.ai_canvas.images = []
+        slots = self.ai_slots
         num_ai = len(ai_cards)
         canvas_width = int(self.ai_canvas["width"])
         spacing = canvas_width // num_ai
+        back_img = self.load_card_back()
+        shown = []
         for idx, (name, cards, folded) in enumerate(ai_cards):
             base_x = idx * spacing + 10
             # Display AI name.
-            self.ai_canvas.create_text(base_x, 10, anchor="nw", text=name, font=("Helvetica", 10, "bold"), fill="white")
+            slots.place((idx, "name"), "text", base_x, 10, name, anchor="nw",
+                        font=("Helvetica", 10, "bold"), fill="white")
+            shown.append((idx, "name"))
             x = base_x
             y = 30
-            for card in cards:
+            for pos, card in enumerate(cards):
                 if reveal_all or folded:
                     # Reveal card face.
                     img = self.load_card_image(card)
-                    if img:
-                        self.ai_canvas.create_image(x, y, anchor="nw", image=img)
-                        self.ai_canvas.images.append(img)
-                    else:
-                        self.ai_canvas.create_text(x+30, y+45, text=str(card), font=("Helvetica", 12), fill="white")
+                    label = str(card)
                 else:
                     # Active AI: show card back.
-                    back_img = self.load_card_back()
-                    if back_img:
-                        self.ai_canvas.create_image(x, y, anchor="nw", image=back_img)
-                        self.ai_canvas.images.append(back_img)
-                    else:
-                        self.ai_canvas.create_text(x+30, y+45, text="Back", font=("Helvetica", 12), fill="white")
+                    img = back_img
+                    label = "Back"
+                if img:
+                    slots.place((idx, pos), "image", x, y, img)
+                else:
+                    slots.place((idx, pos), "text", x+30, y+45, label,
+                                font=("Helvetica", 12), fill="white")
+                shown.append((idx, pos))
                 x += 70
-        self.ai_canvas.update_idletasks()
+        slots.retain(shown)
+
+    def flush(self):
+        """
+        Push pending canvas and label changes to the screen in one pass; the
+        game calls this once per street instead of after every redraw.
+        """
+        self.top.update_idletasks()
 
     def update_info(self, info_text):
         """
@@ -180,56 +188,103 @@ class GameUI:
         for brief instructions. Detailed AI/game events should be appended to the log.
         """
         self.info_label.config(text=info_text, foreground="black")
-        self.info_label.update_idletasks()
+
+    def announce(self, message):
+        """
+        Print a round-level announcement (street, showdown, chip counts) to the console.
+        """
+        print(message)
 
     def append_log(self, message):
         """
         Append a new message with timestamp to the game log.
+        
+        Messages are queued and written to the widget together once Tk is
+        idle, so a whole AI turn or betting round costs one widget update.
         """
-        from datetime import datetime
-        timestamp = datetime.now().strftime("[%H:%M:%S] ")
+        if self.log.append(message):
+            self.top.after_idle(self._flush_log)
+
+    def _on_destroy(self, event):
+        # <Destroy> also fires for every child widget; only the window closing matters.
+        if event.widget is self.top:
+            self.log.close()
+
+    def _flush_log(self):
+        """Insert queued log lines in one edit and trim the oldest lines in bulk."""
+        text = self.log.drain()
+        if not text:
+            return
         self.log_text.config(state="normal")
-        self.log_text.insert("end", timestamp + message + "\n")
+        self.log_text.insert("end", text)
+        excess = self.log.take_overflow()
+        if excess:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
         self.log_text.see("end")
         self.log_text.config(state="disabled")
     
-    def prompt_action(self, prompt, options):
+    def request_action(self, prompt, options, on_choice):
+        """
+        Show one button per option and return immediately.
+
+        on_choice(option) is called once, on the Tk thread, when the player
+        clicks a button; the buttons are removed at that point so a double
+        click cannot answer twice.
+        """
         # Clear previous action widgets.
-        for widget in self.action_frame.winfo_children():
-            widget.destroy()
+        self._clear(self.action_frame)
         # Update the status label with the prompt.
         self.update_info(prompt)
-        self.action_var.set("")
+        def choose(option):
+            self._clear(self.action_frame)
+            on_choice(option)
         col = 0
         for opt in options:
             # Create buttons with more descriptive text.
-            btn = ttk.Button(self.action_frame, text=opt.capitalize(), command=lambda o=opt: self.action_var.set(o))
+            btn = ttk.Button(self.action_frame, text=opt.capitalize(), command=lambda o=opt: choose(o))
             btn.grid(row=0, column=col, padx=10, pady=10)
             self.blink_widget(btn)
             col += 1
-        self.top.wait_variable(self.action_var)
-        return self.action_var.get()
-    
-    def prompt_amount(self, prompt, min_value, max_value):
-        for widget in self.input_frame.winfo_children():
-            widget.destroy()
+
+    def request_amount(self, prompt, min_value, max_value, on_amount):
+        """
+        Show an amount entry and return immediately.
+
+        on_amount(amount) is called once when OK is pressed, with None if the
+        entry is not a whole number between min_value and max_value.
+        """
+        self._clear(self.input_frame)
         prompt_label = ttk.Label(self.input_frame, text=prompt)
         prompt_label.grid(row=0, column=0, padx=5, pady=5)
         entry = ttk.Entry(self.input_frame)
         entry.grid(row=0, column=1, padx=5, pady=5)
-        amount_var = tk.StringVar()
         def submit():
-            amount_var.set(entry.get())
+            text = entry.get()
+            self._clear(self.input_frame)
+            try:
+                amount = int(text)
+            except ValueError:
+                amount = None
+            if amount is not None and not min_value <= amount <= max_value:
+                amount = None
+            on_amount(amount)
         ok_btn = ttk.Button(self.input_frame, text="OK", command=submit)
         ok_btn.grid(row=0, column=2, padx=5, pady=5)
-        self.top.wait_variable(amount_var)
-        try:
-            amount = int(amount_var.get())
-            if min_value <= amount <= max_value:
-                return amount
-        except ValueError:
-            pass
-        return None
+
+    def prompt_action(self, prompt, options):
+        raise RuntimeError("GameUI prompts are asynchronous; play through ui_bridge.run_game(), "
+                           "which answers prompt_action from request_action.")
+
+    def prompt_amount(self, prompt, min_value, max_value):
+        self.prompt_action(prompt, [])
+
+    def _clear(self, frame):
+        for widget in frame.winfo_children():
+            widget.destroy()
+
+    def show_message(self, title, message):
+        """Show a modal information dialog."""
+        messagebox.showinfo(title, message)
 
     def blink_widget(self, widget, count=3):
         def _blink(count):
@@ -276,8 +331,10 @@ class GameUI:
         help_text = (
             "AI Actions Help:\n\n"
             "- 'Calls': The AI matches the current bet.\n"
-            "- 'Raises': The AI increases the bet if its hand is strong (combined rank above threshold).\n"
+            "- 'Raises': The AI increases the bet if its hand is strong (equity well above a fair share).\n"
             "- 'Folds': The AI opts out of the hand if the call is too high relative to its strength.\n\n"
-            "These decisions are based on a simple rule-based evaluation of the AI's hole cards."
+            "These decisions are based on the AI's equity against the players still in the hand: before the flop "
+            "from a preflop table for its hole cards, and after it estimated by sampling the remaining board cards "
+            "and opponents' hands for a fraction of a second."
         )
-        tk.messagebox.showinfo("AI Actions Explanation", help_text)
+        messagebox.showinfo("AI Actions Explanation", help_text)
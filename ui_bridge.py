@@ -0,0 +1,115 @@
+"""
+This module runs a Game on a worker thread while Tkinter owns the main thread.
+
+The game talks to a UIBridge instead of GameUI directly. Every call is queued
+and executed on the Tk thread by a periodic root.after() pump, so the Tk
+event loop never nests and animations keep running while the game waits.
+Prompts block only the worker thread until the player clicks a button.
+"""
+
+import queue
+import threading
+
+POLL_MS = 15
+
+class UIBridge:
+    """
+    Thread-safe stand-in for GameUI used by a game on a worker thread.
+
+    Display and log calls are fire-and-forget; prompts and message boxes
+    wait for the Tk thread to answer.
+    """
+
+    def __init__(self, ui, root, poll_ms=POLL_MS):
+        """
+        Args:
+            ui (GameUI): The real UI, only ever touched on the Tk thread.
+            root (tk.Tk): Root window used to schedule the pump.
+            poll_ms (int): Milliseconds between queue polls.
+        """
+        self.ui = ui
+        self.root = root
+        self.poll_ms = poll_ms
+        self.calls = queue.Queue()
+
+    def _post(self, method, *args, **kwargs):
+        self.calls.put((method, args, kwargs))
+
+    def _ask(self, method, *args):
+        # The Tk side answers by calling the reply callback appended to args.
+        reply = queue.Queue(maxsize=1)
+        self._post(method, *args, reply.put)
+        return reply.get()
+
+    def pump(self):
+        """Run every queued call on the Tk thread, then reschedule."""
+        while True:
+            try:
+                method, args, kwargs = self.calls.get_nowait()
+            except queue.Empty:
+                break
+            method(*args, **kwargs)
+        self.root.after(self.poll_ms, self.pump)
+
+    def append_log(self, message):
+        self._post(self.ui.append_log, message)
+
+    def announce(self, message):
+        self._post(self.ui.announce, message)
+
+    def display_player_hand(self, cards):
+        self._post(self.ui.display_player_hand, list(cards))
+
+    def display_community_cards(self, cards):
+        self._post(self.ui.display_community_cards, list(cards))
+
+    def display_ai_hands(self, ai_cards, reveal_all=False):
+        snapshot = [(name, list(cards), folded) for name, cards, folded in ai_cards]
+        self._post(self.ui.display_ai_hands, snapshot, reveal_all=reveal_all)
+
+    def flush(self):
+        self._post(self.ui.flush)
+
+    def prompt_action(self, prompt, options):
+        return self._ask(self.ui.request_action, prompt, list(options))
+
+    def prompt_amount(self, prompt, min_value, max_value):
+        return self._ask(self.ui.request_amount, prompt, min_value, max_value)
+
+    def show_message(self, title, message):
+        def show(reply):
+            self.ui.show_message(title, message)
+            reply(None)
+        self._ask(show)
+
+def run_game(game, root, ui_factory=None):
+    """
+    Attach a GameUI to a game and play it on a worker thread.
+
+    Call root.mainloop() afterwards; the root window is destroyed once the
+    game loop returns.
+
+    Args:
+        game (Game): The game to play.
+        root (tk.Tk): The main Tkinter root window.
+        ui_factory (Callable or None): Builds the UI from root; defaults to GameUI.
+
+    Returns:
+        threading.Thread: The worker thread running game.play_game().
+    """
+    if ui_factory is None:
+        from ui import GameUI
+        ui_factory = GameUI
+    bridge = UIBridge(ui_factory(root), root)
+    game.ui = bridge
+
+    def play():
+        try:
+            game.play_game()
+        finally:
+            bridge._post(root.destroy)
+
+    worker = threading.Thread(target=play, name="game-loop", daemon=True)
+    bridge.pump()
+    worker.start()
+    return worker